@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+End-to-end load benchmark over SSE and streamable HTTP
+
+Starts the swagger stub backend and, for each transport, `python main.py` against it,
+then drives the server with many concurrent fastmcp.Client sessions calling a weighted
+mix of tools (payments, offers, rewards, travel search) for a fixed duration. Reports
+throughput, p50/p95/p99 latency overall and per tool, and the server's CPU use and
+peak RSS (read from /proc, so Linux only). --save stores the report; --baseline
+compares a run with a stored report and exits non-zero when throughput, latency or
+memory regress by more than --threshold percent.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from fastmcp import Client
+from benchmarks.processes import free_port, wait_for_port, stop
+from benchmarks.replay import summarize
+
+CUSTOMERS = [f"CU{n:08d}" for n in range(1, 51)]
+DESTINATIONS = ("JFK", "LAX", "ORD", "SFO", "MIA", "SEA")
+
+# Weighted tool calls per mix: (tool, weight, arguments(rng))
+MIXES = {
+    "default": [
+        ("list_payments", 30, lambda rng: {"per_page": 20, "customer_id": rng.choice(CUSTOMERS)}),
+        ("list_offers", 25, lambda rng: {"per_page": 20, "page": rng.randint(1, 5)}),
+        ("get_customer_rewards", 20, lambda rng: {"customer_id": rng.choice(CUSTOMERS), "per_page": 20}),
+        ("get_payment_details", 10, lambda rng: {"payment_id": rng.randint(1, 200)}),
+        ("search_travel_packages", 10, lambda rng: {"search": _travel_search(rng)}),
+        ("get_offer_categories", 5, lambda rng: {}),
+    ],
+    "payments": [
+        ("list_payments", 70, lambda rng: {"per_page": 50, "page": rng.randint(1, 5)}),
+        ("get_payment_details", 30, lambda rng: {"payment_id": rng.randint(1, 200)}),
+    ],
+    "offers": [
+        ("list_offers", 60, lambda rng: {"per_page": 50, "page": rng.randint(1, 4)}),
+        ("get_offer", 30, lambda rng: {"offer_id": rng.randint(1, 200)}),
+        ("get_offer_categories", 10, lambda rng: {}),
+    ],
+    "rewards": [
+        ("get_customer_rewards", 50, lambda rng: {"customer_id": rng.choice(CUSTOMERS), "per_page": 50}),
+        ("get_customer_reward_balance", 30, lambda rng: {"customer_id": rng.choice(CUSTOMERS)}),
+        ("get_redemption_history", 20, lambda rng: {"customer_id": rng.choice(CUSTOMERS)}),
+    ],
+    "travel": [
+        ("search_travel_packages", 50, lambda rng: {"search": _travel_search(rng)}),
+        ("get_available_airports", 25, lambda rng: {}),
+        ("get_available_cities", 25, lambda rng: {}),
+    ],
+}
+
+
+def _travel_search(rng):
+    origin, destination = rng.sample(DESTINATIONS, 2)
+    return {"origin": origin, "destination": destination, "departure_date": "2026-03-01", "return_date": "2026-03-08", "passengers": rng.randint(1, 4)}
+
+
+def pick_call(rng, mix):
+    """One (tool, arguments) drawn from a mix by weight"""
+    tool, _, arguments = rng.choices(mix, weights=[weight for _, weight, _ in mix])[0]
+    return tool, arguments(rng)
+
+
+class ProcessSampler:
+    """Samples CPU time and RSS of a process and its children from /proc in a background thread"""
+
+    def __init__(self, pid, interval=0.25):
+        self.pid = pid
+        self.interval = interval
+        self.peak_rss_bytes = 0
+        self._ticks = os.sysconf("SC_CLK_TCK")
+        self._page_size = os.sysconf("SC_PAGE_SIZE")
+        self._stop = threading.Event()
+        self._thread = None
+        self._start_cpu = self._start_wall = None
+        self.cpu_seconds = self.wall_seconds = 0.0
+
+    def _tree(self):
+        pids, parents = [self.pid], {}
+        for entry in os.listdir("/proc"):
+            if entry.isdigit():
+                try:
+                    with open(f"/proc/{entry}/stat") as f:
+                        parents[int(entry)] = int(f.read().rsplit(")", 1)[1].split()[1])
+                except (OSError, IndexError, ValueError):
+                    pass
+        for pid in pids:
+            pids.extend(child for child, parent in parents.items() if parent == pid)
+        return pids
+
+    def sample(self):
+        """(cpu seconds, rss bytes) summed over the process tree"""
+        cpu, rss = 0.0, 0
+        for pid in self._tree():
+            try:
+                with open(f"/proc/{pid}/stat") as f:
+                    fields = f.read().rsplit(")", 1)[1].split()
+                cpu += (int(fields[11]) + int(fields[12])) / self._ticks
+                rss += int(fields[21]) * self._page_size
+            except (OSError, IndexError, ValueError):
+                pass
+        return cpu, rss
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak_rss_bytes = max(self.peak_rss_bytes, self.sample()[1])
+
+    def start(self):
+        self._start_cpu, rss = self.sample()
+        self.peak_rss_bytes = rss
+        self._start_wall = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        cpu, rss = self.sample()
+        self.peak_rss_bytes = max(self.peak_rss_bytes, rss)
+        self.cpu_seconds = cpu - self._start_cpu
+        self.wall_seconds = time.perf_counter() - self._start_wall
+
+    def summary(self):
+        return {
+            "cpu_seconds": round(self.cpu_seconds, 3),
+            "cpu_percent": round(100 * self.cpu_seconds / self.wall_seconds, 1) if self.wall_seconds else None,
+            "peak_rss_mb": round(self.peak_rss_bytes / 2 ** 20, 1),
+        }
+
+
+async def drive_mix(target, clients, duration, mix, seed=0):
+    """Run clients concurrent sessions calling tools from mix until duration elapses"""
+    latencies, errors = defaultdict(list), defaultdict(int)
+    deadline = time.perf_counter() + duration
+
+    async def session(index):
+        rng = random.Random(seed * 1000 + index)
+        async with Client(target) as client:
+            while time.perf_counter() < deadline:
+                tool, arguments = pick_call(rng, mix)
+                started = time.perf_counter()
+                try:
+                    await client.call_tool(tool, arguments)
+                    latencies[tool].append(time.perf_counter() - started)
+                except Exception:
+                    errors[tool] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(session(i) for i in range(clients)))
+    elapsed = time.perf_counter() - started
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "duration_s": round(elapsed, 3),
+        "requests": len(all_latencies),
+        "throughput_rps": round(len(all_latencies) / elapsed, 1) if elapsed else None,
+        "overall": summarize(all_latencies, sum(errors.values())),
+        "tools": {tool: summarize(latencies[tool], errors[tool]) for tool in sorted(set(latencies) | set(errors))},
+    }
+
+
+def run_transport(transport, args, backend_url):
+    port = free_port()
+    env = {
+        **os.environ,
+        "TRANSPORT": transport,
+        "PORT": str(port),
+        "API_BASE_URL": backend_url,
+        "LOG_LEVEL": "warning",
+        "WORKERS": str(args.workers if transport == "http" else 1),
+    }
+    server = subprocess.Popen([sys.executable, "main.py"], cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(port)
+        url = f"http://127.0.0.1:{port}/{'sse' if transport == 'sse' else 'mcp'}"
+        mix = MIXES[args.mix]
+        asyncio.run(drive_mix(url, args.clients, args.warmup, mix, args.seed))
+        sampler = ProcessSampler(server.pid)
+        sampler.start()
+        result = asyncio.run(drive_mix(url, args.clients, args.duration, mix, args.seed + 1))
+        sampler.stop()
+    finally:
+        stop(server)
+    result["server"] = sampler.summary()
+    if result["requests"]:
+        result["server"]["cpu_ms_per_request"] = round(1000 * sampler.cpu_seconds / result["requests"], 3)
+    return {"transport": transport, **result}
+
+
+# (metric path, higher is better)
+COMPARED_METRICS = (
+    (("throughput_rps",), True),
+    (("overall", "p50_ms"), False),
+    (("overall", "p95_ms"), False),
+    (("overall", "p99_ms"), False),
+    (("server", "cpu_ms_per_request"), False),
+    (("server", "peak_rss_mb"), False),
+)
+
+
+def compare(report, baseline, threshold=10.0):
+    """Percentage change of each transport's metrics against a baseline report, flagging regressions"""
+    before = {result["transport"]: result for result in baseline.get("results", [])}
+    rows = []
+    for result in report["results"]:
+        previous = before.get(result["transport"])
+        if previous is None:
+            continue
+        for path, higher_is_better in COMPARED_METRICS:
+            current, old = result, previous
+            for key in path:
+                current, old = (current or {}).get(key), (old or {}).get(key)
+            if current is None or not old:
+                continue
+            change = (current - old) / old * 100
+            rows.append({
+                "transport": result["transport"],
+                "metric": ".".join(path),
+                "baseline": old,
+                "current": current,
+                "change_pct": round(change, 1),
+                "regression": (-change if higher_is_better else change) > threshold,
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the MCP server over SSE and streamable HTTP")
+    parser.add_argument("--transports", default="http,sse", help="Comma separated transports to run")
+    parser.add_argument("--mix", default="default", choices=sorted(MIXES), help="Weighted tool mix")
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent MCP client sessions")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds of measured load per transport")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Seconds of unmeasured load before measuring")
+    parser.add_argument("--workers", type=int, default=1, help="WORKERS for the http transport")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Mean stub backend latency")
+    parser.add_argument("--latency-distribution", default="lognormal", help="Stub backend latency distribution")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of stub backend requests that fail")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", help="Write the report to this JSON file")
+    parser.add_argument("--baseline", help="Compare with a report saved by --save")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Regression threshold in percent")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    backend_port = free_port()
+    backend = subprocess.Popen(
+        [sys.executable, os.path.join("benchmarks", "stub_backend.py"), "--port", str(backend_port),
+         "--latency-ms", str(args.latency_ms), "--latency-distribution", args.latency_distribution,
+         "--error-rate", str(args.error_rate), "--seed", str(args.seed)],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_for_port(backend_port)
+        results = [run_transport(t.strip(), args, f"http://127.0.0.1:{backend_port}") for t in args.transports.split(",")]
+    finally:
+        stop(backend)
+
+    report = {
+        "cpu_count": os.cpu_count(),
+        "mix": args.mix,
+        "clients": args.clients,
+        "duration_s": args.duration,
+        "backend_latency_ms": args.latency_ms,
+        "results": results,
+    }
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["comparison"] = compare(report, json.load(f), args.threshold)
+        regressions = [row for row in report["comparison"] if row["regression"]]
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{args.clients} clients x {args.duration:.0f}s, mix '{args.mix}' ({os.cpu_count()} CPUs)")
+        print(f"{'transport':>9} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7} {'cpu %':>6} {'cpu ms/req':>11} {'rss MB':>7}")
+        for r in results:
+            o, s = r["overall"], r["server"]
+            print(f"{r['transport']:>9} {r['throughput_rps']!s:>8} {o['p50_ms']!s:>8} {o['p95_ms']!s:>8} {o['p99_ms']!s:>8} "
+                  f"{o['errors']:>7} {s['cpu_percent']!s:>6} {s.get('cpu_ms_per_request', '')!s:>11} {s['peak_rss_mb']:>7}")
+        for row in report.get("comparison", []):
+            flag = "  REGRESSION" if row["regression"] else ""
+            print(f"{row['transport']:>9} {row['metric']:<28} {row['baseline']!s:>9} -> {row['current']!s:<9} {row['change_pct']:+.1f}%{flag}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
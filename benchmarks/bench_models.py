@@ -0,0 +1,150 @@
+"""
+Microbenchmarks for validation, dump and JSON encoding of every model in models/
+
+Payloads are synthesized from each model's JSON schema by the stub backend's
+SwaggerStub, so list responses carry a page of 10 realistic items. The write path
+tools run on every call (model_dump(exclude_unset=True) plus enum unwrapping on
+PaymentCreate, OfferCreate and HotelBookingRequest) is benchmarked on its own, as
+is parsing a 100-item PaymentListResponse in each response validation mode, and the
+cost of typed list responses (cached strict TypeAdapters validating the raw JSON
+bytes) next to passing the decoded dicts through.
+
+Run explicitly (the file is not collected by the tests suite):
+
+    python -m pytest benchmarks/bench_models.py --benchmark-autosave
+    python -m pytest benchmarks/bench_models.py --benchmark-compare
+
+With --benchmark-compare a model whose mean time regresses by more than
+MODEL_BENCHMARK_THRESHOLD_PCT (default 15) percent fails the run; see conftest.py.
+"""
+import enum
+import json
+import importlib
+import inspect
+import os
+import pkgutil
+import random
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+import pytest
+from pydantic import BaseModel
+
+pytest.importorskip("pytest_benchmark", reason="the microbenchmarks need pytest-benchmark (see requirements.txt)")
+
+import models
+from models.parsing import ResponseParser, RESPONSE_VALIDATION_MODES, LIST_RESPONSE_ADAPTERS
+from benchmarks.stub_backend import SwaggerStub
+
+HOT_WRITE_MODELS = ("PaymentCreate", "OfferCreate", "HotelBookingRequest")
+
+
+def all_models():
+    """Every pydantic model defined in a models/ module, by name"""
+    found = {}
+    for module_info in sorted(pkgutil.iter_modules(models.__path__), key=lambda m: m.name):
+        module = importlib.import_module(f"models.{module_info.name}")
+        for name, cls in inspect.getmembers(module, inspect.isclass):
+            if issubclass(cls, BaseModel) and cls.__module__ == module.__name__:
+                found[name] = cls
+    return found
+
+
+def model_payload(stub, model, seed=0):
+    """Deterministic dict payload conforming to model's JSON schema"""
+    schema = model.model_json_schema()
+    stub.defs.update(schema.pop("$defs", {}))
+    return stub.synthesize(schema, random.Random(f"{seed}:{model.__name__}"))
+
+
+def unwrap_enums(data):
+    """Enum members replaced by their values, as the write tools do before sending"""
+    return {key: value.value if isinstance(value, enum.Enum) else value for key, value in data.items()}
+
+
+MODELS = all_models()
+_stub = SwaggerStub()
+PAYLOADS = {name: model_payload(_stub, model) for name, model in MODELS.items()}
+PAYLOADS_JSON = {name: MODELS[name].model_validate(payload).model_dump_json().encode() for name, payload in PAYLOADS.items()}
+LARGE_PAGE_ITEMS = 100
+_large_stub = SwaggerStub(items=LARGE_PAGE_ITEMS)
+LARGE_PAGE = _large_stub.synthesize(
+    models.PaymentListResponse.model_json_schema(), random.Random("large_page"), query={"per_page": LARGE_PAGE_ITEMS}
+)
+LIST_RESPONSES_RAW = {
+    model.__name__: json.dumps(_large_stub.synthesize(
+        model.model_json_schema(), random.Random(f"large_page:{model.__name__}"), query={"per_page": LARGE_PAGE_ITEMS}
+    )).encode()
+    for model in LIST_RESPONSE_ADAPTERS
+}
+LIST_RESPONSE_PATHS = {
+    # Raw dicts: what the tools return by default
+    "raw_dict": lambda adapter, raw: json.loads(raw),
+    # Decode, then validate the dicts
+    "validate_python": lambda adapter, raw: adapter.validate_python(json.loads(raw)),
+    # TYPED_LIST_RESPONSES=true in full mode: strict validation straight from the bytes
+    "validate_json_strict": lambda adapter, raw: adapter.validate_json(raw, strict=True),
+}
+
+
+@pytest.mark.parametrize("name", sorted(MODELS))
+def test_validate(benchmark, name):
+    benchmark.group = "validate"
+    model, payload = MODELS[name], PAYLOADS[name]
+    benchmark(model.model_validate, payload)
+
+
+@pytest.mark.parametrize("name", sorted(MODELS))
+def test_validate_json(benchmark, name):
+    benchmark.group = "validate_json"
+    model, payload = MODELS[name], PAYLOADS_JSON[name]
+    benchmark(model.model_validate_json, payload)
+
+
+@pytest.mark.parametrize("name", sorted(MODELS))
+def test_dump(benchmark, name):
+    benchmark.group = "dump"
+    instance = MODELS[name].model_validate(PAYLOADS[name])
+    benchmark(instance.model_dump, exclude_unset=True)
+
+
+@pytest.mark.parametrize("name", sorted(MODELS))
+def test_dump_json(benchmark, name):
+    benchmark.group = "dump_json"
+    instance = MODELS[name].model_validate(PAYLOADS[name])
+    benchmark(instance.model_dump_json)
+
+
+@pytest.mark.parametrize("name", HOT_WRITE_MODELS)
+def test_write_path(benchmark, name):
+    """Tool argument validation, dump and enum unwrapping as on every write tool call"""
+    benchmark.group = "write_path"
+    model, payload = MODELS[name], PAYLOADS[name]
+
+    def write_path():
+        return unwrap_enums(model.model_validate(payload).model_dump(exclude_unset=True))
+
+    result = benchmark(write_path)
+    assert not any(isinstance(value, enum.Enum) for value in result.values())
+
+
+@pytest.mark.parametrize("mode", RESPONSE_VALIDATION_MODES)
+def test_parse_page(benchmark, mode):
+    """A large list response parsed in full, sampled (1 in 10) and trusted mode"""
+    benchmark.group = "parse_page"
+    parser = ResponseParser(mode=mode, sample_rate=10)
+    result = benchmark(parser.parse_page, models.PaymentListResponse, LARGE_PAGE)
+    assert len(result.payments) == LARGE_PAGE_ITEMS
+    assert parser.stats()["failures"] == 0
+
+
+@pytest.mark.parametrize("path", LIST_RESPONSE_PATHS)
+@pytest.mark.parametrize("model", LIST_RESPONSE_ADAPTERS, ids=lambda model: model.__name__)
+def test_list_response(benchmark, model, path):
+    """A 100-item list response body decoded as dicts or validated through the cached adapter"""
+    benchmark.group = f"list_response:{model.__name__}"
+    adapter, raw = LIST_RESPONSE_ADAPTERS[model], LIST_RESPONSES_RAW[model.__name__]
+    result = benchmark(LIST_RESPONSE_PATHS[path], adapter, raw)
+    assert (result["total"] if isinstance(result, dict) else result.total) == LARGE_PAGE_ITEMS
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Serialized size of list and detail tool results with and without fields= projection
+and output_format="columnar"
+
+Calls each tool in-process against the swagger stub backend (no network or server
+process), once with all fields and once with the fields an agent typically needs, and
+reports the bytes of the tool result per call: the text content block and the
+structured content, both of which go over the wire and the text into the model's
+context. The list tools with a columnar format are called again with
+output_format="columnar" and --per-page items, reporting bytes and json.loads time of the
+text against the default row format. --text-words sets the length of
+description-like fields in stub responses.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import timeit
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from fastmcp import Client
+from benchmarks.stub_backend import stub_server
+
+# (tool, arguments, projected fields)
+CALLS = [
+    ("list_offers", {"per_page": 20}, ["id", "title", "discount_percentage"]),
+    ("get_offer", {"offer_id": 7}, ["id", "title", "discount_percentage"]),
+    ("list_payments", {"per_page": 20}, ["id", "amount", "merchant_name", "status"]),
+    ("get_payment_details", {"payment_id": 7}, ["id", "amount", "status"]),
+    ("list_merchants", {"per_page": 20}, ["id", "name", "category"]),
+    ("get_merchant_details", {"merchant_id": 7}, ["id", "name", "category"]),
+    ("get_customer_rewards", {"customer_id": "CU00000001", "per_page": 20}, ["id", "points_earned", "status"]),
+    ("get_reward_details", {"reward_id": 7}, ["id", "points_earned", "status"]),
+    ("list_refunds", {"per_page": 20}, ["id", "refund_amount", "status"]),
+    ("get_refund_details", {"refund_id": 7}, ["id", "refund_amount", "status"]),
+]
+
+# (tool, arguments) of the tools with output_format="columnar"
+COLUMNAR_CALLS = [
+    ("list_payments", {}),
+    ("get_customer_rewards", {"customer_id": "CU00000001"}),
+    ("get_redemption_history", {"customer_id": "CU00000001"}),
+]
+
+
+def result_bytes(result):
+    """Bytes of a tool result's text content and structured content"""
+    text = sum(len(block.text.encode()) for block in result.content if hasattr(block, "text"))
+    structured = len(json.dumps(result.structured_content, separators=(",", ":")).encode()) if result.structured_content else 0
+    return {"text_bytes": text, "structured_bytes": structured}
+
+
+def parse_us(text, number=200):
+    """Microseconds json.loads takes on text"""
+    return round(timeit.timeit(lambda: json.loads(text), number=number) / number * 1e6, 1)
+
+
+def _server(text_words):
+    return stub_server(["offer", "payment", "merchant", "reward", "refund"], name="bench-projection", swagger=True, text_words=text_words)
+
+
+async def measure(text_words=8):
+    rows = []
+    with _server(text_words) as mcp:
+        async with Client(mcp) as client:
+            for tool, arguments, fields in CALLS:
+                full = result_bytes(await client.call_tool(tool, arguments))
+                projected = result_bytes(await client.call_tool(tool, {**arguments, "fields": fields}))
+                rows.append({
+                    "tool": tool,
+                    "fields": fields,
+                    "full_bytes": full["text_bytes"],
+                    "projected_bytes": projected["text_bytes"],
+                    "reduction_pct": round((1 - projected["text_bytes"] / full["text_bytes"]) * 100, 1) if full["text_bytes"] else None,
+                    "full_structured_bytes": full["structured_bytes"],
+                    "projected_structured_bytes": projected["structured_bytes"],
+                })
+    return rows
+
+
+async def measure_columnar(per_page=100, text_words=8):
+    rows = []
+    with _server(text_words) as mcp:
+        async with Client(mcp) as client:
+            for tool, arguments in COLUMNAR_CALLS:
+                arguments = {**arguments, "per_page": per_page}
+                row_text = (await client.call_tool(tool, arguments)).content[0].text
+                columnar_text = (await client.call_tool(tool, {**arguments, "output_format": "columnar"})).content[0].text
+                rows.append({
+                    "tool": tool,
+                    "per_page": per_page,
+                    "rows_bytes": len(row_text.encode()),
+                    "columnar_bytes": len(columnar_text.encode()),
+                    "reduction_pct": round((1 - len(columnar_text) / len(row_text)) * 100, 1),
+                    "rows_parse_us": parse_us(row_text),
+                    "columnar_parse_us": parse_us(columnar_text),
+                })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure tool result bytes with and without fields= projection")
+    parser.add_argument("--text-words", type=int, default=8, help="Words per description-like field in stub responses")
+    parser.add_argument("--per-page", type=int, default=100, help="Page size for the columnar comparison")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    rows = asyncio.run(measure(args.text_words))
+    columnar_rows = asyncio.run(measure_columnar(args.per_page, args.text_words))
+    if args.json:
+        print(json.dumps({"projection": rows, "columnar": columnar_rows}, indent=2))
+        return
+    print(f"{'tool':<24} {'full B':>8} {'projected B':>12} {'reduction':>10}  fields")
+    for row in rows:
+        print(f"{row['tool']:<24} {row['full_bytes']:>8} {row['projected_bytes']:>12} {row['reduction_pct']!s:>9}%  {','.join(row['fields'])}")
+    print()
+    print(f"{'tool':<24} {'rows B':>8} {'columnar B':>11} {'reduction':>10} {'rows parse us':>14} {'columnar parse us':>18}")
+    for row in columnar_rows:
+        print(f"{row['tool']:<24} {row['rows_bytes']:>8} {row['columnar_bytes']:>11} {row['reduction_pct']!s:>9}% "
+              f"{row['rows_parse_us']:>14} {row['columnar_parse_us']:>18}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark for the MCP server module
+
+Times `import main` in fresh interpreters with auth disabled (the default) against
+the same import followed by the RSA key generation and token minting that used to
+happen unconditionally at import time.
+
+With --budget-ms the cold-start time-to-ready is checked against a budget and the
+script exits non-zero when the median exceeds it, for use as a CI regression gate.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from server.startup import profile_startup
+
+SCENARIOS = {
+    "lazy_auth": "import main",
+    "eager_auth": "import main; from server.auth import create_access_token; create_access_token()",
+}
+
+
+def time_scenario(code, runs, env):
+    """Wall-clock seconds for each fresh-interpreter run of code"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def check_budget(budget_ms, runs, env, as_json):
+    """Exit status 1 when the median cold-start time to ready is over budget"""
+    timings = [profile_startup(env=env)["time_to_ready_ms"] for _ in range(runs)]
+    median = statistics.median(timings)
+    result = {"budget_ms": budget_ms, "median_time_to_ready_ms": round(median, 1), "runs_ms": timings, "passed": median <= budget_ms}
+    if as_json:
+        print(json.dumps(result, indent=2))
+    else:
+        status = "PASS" if result["passed"] else "FAIL"
+        print(f"{status}: median cold start {median:.1f}ms (budget {budget_ms:.1f}ms)")
+    return 0 if result["passed"] else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MCP server startup with lazy vs eager auth setup")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreter runs per scenario")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail if median cold-start time to ready exceeds this budget")
+    args = parser.parse_args()
+
+    env = {**os.environ, "AUTH_ENABLED": "false"}
+    if args.budget_ms is not None:
+        sys.exit(check_budget(args.budget_ms, args.runs, env, args.json))
+    results = {}
+    for name, code in SCENARIOS.items():
+        timings = time_scenario(code, args.runs, env)
+        results[name] = {
+            "median_ms": round(statistics.median(timings) * 1000, 1),
+            "min_ms": round(min(timings) * 1000, 1),
+            "max_ms": round(max(timings) * 1000, 1),
+        }
+    results["saving_ms"] = round(results["eager_auth"]["median_ms"] - results["lazy_auth"]["median_ms"], 1)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'scenario':<12} {'median':>10} {'min':>10} {'max':>10}")
+    for name in SCENARIOS:
+        r = results[name]
+        print(f"{name:<12} {r['median_ms']:>8.1f}ms {r['min_ms']:>8.1f}ms {r['max_ms']:>8.1f}ms")
+    print(f"Median startup saving from lazy auth: {results['saving_ms']:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Multi-worker load benchmark for the streamable-HTTP serving mode
+
+Starts the local stub backend, then for each worker count runs `python main.py`
+with TRANSPORT=http and WORKERS=N and drives it with concurrent MCP client sessions
+for a fixed duration. Reports throughput, latency percentiles and scaling
+efficiency relative to a single worker (throughput_N / (N * throughput_1)).
+Near-linear scaling needs at least as many free cores as workers.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from fastmcp import Client
+from benchmarks.processes import free_port, wait_for_port, stop
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+async def drive(url, clients, duration, tool, arguments):
+    """Run clients concurrent sessions calling tool until duration elapses"""
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + duration
+
+    async def session():
+        nonlocal errors
+        async with Client(url) as client:
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    await client.call_tool(tool, arguments)
+                    latencies.append(time.perf_counter() - started)
+                except Exception:
+                    errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(session() for _ in range(clients)))
+    return latencies, errors, time.perf_counter() - started
+
+
+def run_scenario(workers, args, backend_url):
+    port = free_port()
+    env = {
+        **os.environ,
+        "TRANSPORT": "http",
+        "PORT": str(port),
+        "WORKERS": str(workers),
+        "API_BASE_URL": backend_url,
+        "LOG_LEVEL": "warning",
+        # Single-worker runs use the same stateless sessions as the worker pool
+        "FASTMCP_STATELESS_HTTP": "true",
+    }
+    server = subprocess.Popen([sys.executable, "main.py"], cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(port)
+        url = f"http://127.0.0.1:{port}/mcp"
+        # Warm every worker before measuring
+        asyncio.run(drive(url, args.clients, 1.0, args.tool, {"per_page": args.per_page}))
+        latencies, errors, elapsed = asyncio.run(drive(url, args.clients, args.duration, args.tool, {"per_page": args.per_page}))
+    finally:
+        stop(server)
+    latencies.sort()
+    return {
+        "workers": workers,
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2) if latencies else None,
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2) if latencies else None,
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2) if latencies else None,
+        "mean_ms": round(statistics.mean(latencies) * 1000, 2) if latencies else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark multi-worker streamable-HTTP serving against a local stub backend")
+    parser.add_argument("--workers", default="1,2,4", help="Comma separated worker counts to compare")
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent MCP client sessions")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load per worker count")
+    parser.add_argument("--tool", default="list_payments", help="Tool called by every client")
+    parser.add_argument("--per-page", type=int, default=20, help="per_page argument passed to the tool")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Artificial stub backend latency")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    backend_port = free_port()
+    backend = subprocess.Popen(
+        [sys.executable, os.path.join("benchmarks", "stub_backend.py"), "--port", str(backend_port), "--latency-ms", str(args.latency_ms)],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_for_port(backend_port)
+        results = [run_scenario(int(n), args, f"http://127.0.0.1:{backend_port}") for n in args.workers.split(",")]
+    finally:
+        stop(backend)
+
+    single = next((r for r in results if r["workers"] == 1), None)
+    for result in results:
+        if single and single["throughput_rps"]:
+            result["scaling_efficiency"] = round(result["throughput_rps"] / (result["workers"] * single["throughput_rps"]), 2)
+
+    report = {"cpu_count": os.cpu_count(), "clients": args.clients, "duration_s": args.duration, "tool": args.tool, "results": results}
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{args.clients} clients x {args.duration:.0f}s calling {args.tool} ({os.cpu_count()} CPUs)")
+    print(f"{'workers':>8} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7} {'scaling':>8}")
+    for r in results:
+        print(f"{r['workers']:>8} {r['throughput_rps']:>9} {r['p50_ms']:>9} {r['p95_ms']:>9} {r['p99_ms']:>9} {r['errors']:>7} {r.get('scaling_efficiency', ''):>8}")
+
+
+if __name__ == "__main__":
+    main()
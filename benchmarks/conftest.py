@@ -0,0 +1,15 @@
+import os
+
+import pytest
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """Fail --benchmark-compare runs on a mean regression over MODEL_BENCHMARK_THRESHOLD_PCT (default 15%)"""
+    if not config.pluginmanager.hasplugin("benchmark"):
+        return
+    if config.getoption("benchmark_compare", None) and not config.getoption("benchmark_compare_fail", None):
+        from pytest_benchmark.utils import parse_compare_fail
+
+        threshold = os.getenv("MODEL_BENCHMARK_THRESHOLD_PCT", "15")
+        config.option.benchmark_compare_fail = [parse_compare_fail(f"mean:{threshold}%")]
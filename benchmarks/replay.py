@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded traffic mix against the MCP server
+
+Reads a recording written with RECORDING_ENABLED=true (server/recording.py), starts a
+stand-in backend that answers every upstream request from the recorded responses
+(with the recorded upstream latency, scaled by --latency-scale), runs `python main.py`
+against it and re-issues the recorded tool calls with their original spacing divided
+by --speed (--speed 0 sends them as fast as the sessions allow). Reports per-tool
+latency percentiles next to the latencies seen while recording; --save writes the
+report and --baseline compares it with one saved from another version.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from fastmcp import Client
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from benchmarks.bench_workers import percentile
+from benchmarks.processes import free_port, wait_for_port, stop
+
+
+def load_recording(path):
+    """Recorded tool calls (in start order) and upstream exchanges"""
+    calls, upstream = [], []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                (calls if entry["type"] == "call" else upstream).append(entry)
+    calls.sort(key=lambda call: call["offset_ms"])
+    return calls, upstream
+
+
+def _query_value(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def exchange_key(method, endpoint, params):
+    """Matches a recorded request to a replayed one: query values compare as sent on the wire"""
+    pairs = []
+    for name, value in (params.items() if isinstance(params, dict) else params):
+        for item in (value if isinstance(value, list) else [value]):
+            pairs.append((name, _query_value(item)))
+    return (method, endpoint, tuple(sorted(pairs)))
+
+
+def create_replay_app(upstream, latency_scale=1.0):
+    """Stand-in backend answering from recorded exchanges, cycling through repeats of a request
+
+    Responses served from the recording server's cache (no upstream latency of their own)
+    are used only for requests that never reached the backend during recording.
+    """
+    exchanges = defaultdict(list)
+    for entry in upstream:
+        exchanges[exchange_key(entry["method"], entry["endpoint"], entry.get("params") or {})].append(entry)
+    answers = {}
+    for key, entries in exchanges.items():
+        fetched = [e for e in entries if e.get("cache") != "hit"] or entries
+        answers[key] = itertools.cycle(fetched)
+    served = {"matched": 0, "unmatched": 0}
+
+    async def answer(request):
+        key = exchange_key(request.method, request.url.path, list(request.query_params.multi_items()))
+        if key not in answers:
+            served["unmatched"] += 1
+            return JSONResponse({"error": f"No recorded response for {request.method} {request.url.path}"}, status_code=404)
+        served["matched"] += 1
+        entry = next(answers[key])
+        if entry.get("cache") != "hit" and latency_scale > 0:
+            await asyncio.sleep(entry["duration_ms"] / 1000 * latency_scale)
+        if entry.get("status_code") and entry["status_code"] >= 400:
+            message = (entry.get("error") or "").removeprefix("API Error: ")
+            return JSONResponse({"error": message}, status_code=entry["status_code"])
+        return JSONResponse(entry.get("response"))
+
+    app = Starlette(routes=[Route("/{path:path}", answer, methods=["GET", "POST", "PUT", "DELETE"])])
+    app.state.served = served
+    return app
+
+
+def summarize(latencies, errors):
+    latencies = sorted(latencies)
+    def ms(value):
+        return round(value * 1000, 2) if value is not None else None
+    return {
+        "calls": len(latencies) + errors,
+        "errors": errors,
+        "p50_ms": ms(percentile(latencies, 0.50)),
+        "p95_ms": ms(percentile(latencies, 0.95)),
+        "p99_ms": ms(percentile(latencies, 0.99)),
+        "mean_ms": ms(statistics.mean(latencies)) if latencies else None,
+    }
+
+
+async def replay(target, calls, speed=1.0, sessions=4):
+    """Issue the recorded calls against target (URL or FastMCP server) on their recorded schedule"""
+    latencies, errors, lag = defaultdict(list), defaultdict(int), []
+    clients = [Client(target) for _ in range(max(1, sessions))]
+    for client in clients:
+        await client.__aenter__()
+    try:
+        started = time.perf_counter()
+        first_offset = calls[0]["offset_ms"] if calls else 0
+
+        async def issue(index, call):
+            if speed > 0:
+                due = (call["offset_ms"] - first_offset) / 1000 / speed
+                await asyncio.sleep(max(0.0, due - (time.perf_counter() - started)))
+                lag.append(max(0.0, time.perf_counter() - started - due))
+            sent = time.perf_counter()
+            try:
+                await clients[index % len(clients)].call_tool(call["tool"], call["arguments"])
+                latencies[call["tool"]].append(time.perf_counter() - sent)
+            except Exception:
+                errors[call["tool"]] += 1
+
+        if speed > 0:
+            await asyncio.gather(*(issue(index, call) for index, call in enumerate(calls)))
+        else:
+            queue = iter(enumerate(calls))
+
+            async def worker():
+                for index, call in queue:
+                    await issue(index, call)
+            await asyncio.gather(*(worker() for _ in clients))
+        elapsed = time.perf_counter() - started
+    finally:
+        for client in clients:
+            await client.__aexit__(None, None, None)
+
+    recorded = defaultdict(list)
+    for call in calls:
+        recorded[call["tool"]].append(call["duration_ms"] / 1000)
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "speed": speed,
+        "sessions": len(clients),
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(len(all_latencies) / elapsed, 1) if elapsed else None,
+        "schedule_lag_p95_ms": round(percentile(sorted(lag), 0.95) * 1000, 2) if lag else None,
+        "overall": summarize(all_latencies, sum(errors.values())),
+        "tools": {
+            tool: {**summarize(latencies[tool], errors[tool]), "recorded_p50_ms": summarize(recorded[tool], 0)["p50_ms"]}
+            for tool in sorted(recorded)
+        },
+    }
+
+
+def compare(report, baseline):
+    """Per-tool p50/p95 change against a report saved from another version"""
+    rows = []
+    for tool, current in report["tools"].items():
+        before = baseline.get("tools", {}).get(tool)
+        if not before:
+            continue
+        row = {"tool": tool}
+        for metric in ("p50_ms", "p95_ms"):
+            if current[metric] is not None and before.get(metric):
+                row[f"{metric}_change_pct"] = round((current[metric] - before[metric]) / before[metric] * 100, 1)
+        rows.append(row)
+    return rows
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Replay recorded MCP traffic against a stand-in backend")
+    parser.add_argument("recording", help="NDJSON recording written with RECORDING_ENABLED=true")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed multiplier (0: as fast as possible)")
+    parser.add_argument("--sessions", type=int, default=4, help="Concurrent MCP client sessions")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="Multiplier for the recorded upstream latency")
+    parser.add_argument("--serve-backend", action="store_true", help="Only run the stand-in backend on --port")
+    parser.add_argument("--port", type=int, default=5001)
+    parser.add_argument("--transport", default="http", choices=["http", "sse"])
+    parser.add_argument("--save", help="Write the report to this JSON file")
+    parser.add_argument("--baseline", help="Compare with a report saved by --save")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    calls, upstream = load_recording(args.recording)
+    if args.serve_backend:
+        uvicorn.run(create_replay_app(upstream, args.latency_scale), host="127.0.0.1", port=args.port, log_level="warning")
+        return
+
+    backend_port, port = free_port(), free_port()
+    backend = subprocess.Popen(
+        [sys.executable, os.path.join("benchmarks", "replay.py"), args.recording, "--serve-backend",
+         "--port", str(backend_port), "--latency-scale", str(args.latency_scale)],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    env = {
+        **os.environ,
+        "TRANSPORT": args.transport,
+        "PORT": str(port),
+        "API_BASE_URL": f"http://127.0.0.1:{backend_port}",
+        "LOG_LEVEL": "warning",
+        "RECORDING_ENABLED": "false",
+    }
+    server = subprocess.Popen([sys.executable, "main.py"], cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(backend_port)
+        wait_for_port(port)
+        url = f"http://127.0.0.1:{port}/{'sse' if args.transport == 'sse' else 'mcp'}"
+        report = asyncio.run(replay(url, calls, args.speed, args.sessions))
+    finally:
+        stop(server)
+        stop(backend)
+
+    report["recording"] = os.path.abspath(args.recording)
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["comparison"] = compare(report, json.load(f))
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    overall = report["overall"]
+    print(f"Replayed {overall['calls']} calls at {args.speed}x in {report['duration_s']}s "
+          f"({report['throughput_rps']} rps, {overall['errors']} errors, schedule lag p95 {report['schedule_lag_p95_ms']} ms)")
+    print(f"{'tool':<32} {'calls':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'recorded p50':>13}")
+    for tool, row in report["tools"].items():
+        print(f"{tool:<32} {row['calls']:>6} {row['p50_ms']!s:>9} {row['p95_ms']!s:>9} {row['p99_ms']!s:>9} {row['recorded_p50_ms']!s:>13}")
+    for row in report.get("comparison", []):
+        print(f"{row['tool']:<32} p50 {row.get('p50_ms_change_pct', '-')}%  p95 {row.get('p95_ms_change_pct', '-')}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,520 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the payments API used by the load benchmarks
+
+Serves /api/health and paginated /api/payments from generated data with a fixed
+artificial latency, so MCP server throughput can be measured without the real backend.
+With swagger=True (the default from the command line) every path in swagger.json is
+served: responses are synthesized from the swagger response schema, or from the
+matching model in models/ where swagger has none, with configurable collection size,
+latency distribution and injected error rate.
+"""
+import argparse
+import asyncio
+import contextlib
+import functools
+import json
+import math
+import os
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SWAGGER_PATH = os.path.join(ROOT, "swagger.json")
+sys.path.insert(0, ROOT)
+
+STATUSES = ("COMPLETED", "COMPLETED", "COMPLETED", "PENDING", "FAILED", "REFUNDED")
+MERCHANTS = (("Amazon", "ONLINE_SHOPPING"), ("Whole Foods", "GROCERIES"), ("Shell", "GAS_STATIONS"), ("Delta", "TRAVEL"))
+WORDS = (
+    "premium", "travel", "cashback", "dining", "weekend", "bonus", "points", "member", "exclusive", "seasonal",
+    "hotel", "flight", "grocery", "fuel", "online", "partner", "limited", "annual", "reward", "offer"
+)
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+PAGINATION_FIELDS = ("total", "pages", "current_page", "per_page")
+
+
+def generate_payments(count):
+    started = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    payments = []
+    for i in range(count, 0, -1):
+        merchant, category = MERCHANTS[i % len(MERCHANTS)]
+        timestamp = (started + timedelta(hours=i)).isoformat()
+        payments.append({
+            "id": i,
+            "credit_card_id": 1 + i % 5,
+            "customer_id": f"CUST{1 + i % 20:04d}",
+            "amount": round(5 + (i * 37 % 5000) / 10, 2),
+            "merchant_name": merchant,
+            "merchant_category": category,
+            "description": f"Purchase {i}",
+            "transaction_date": timestamp,
+            "status": STATUSES[i % len(STATUSES)],
+            "reference_number": f"REF{i:08d}",
+            "created_at": timestamp,
+        })
+    return payments
+
+
+def _obj(**properties):
+    return {"type": "object", "properties": properties}
+
+
+def _arr(items):
+    return {"type": "array", "items": items}
+
+
+_STR, _INT, _NUM, _BOOL = {"type": "string"}, {"type": "integer"}, {"type": "number"}, {"type": "boolean"}
+_DATE, _DATETIME = {"type": "string", "format": "date"}, {"type": "string", "format": "date-time"}
+_HOTEL = _obj(hotel_id=_STR, name=_STR, city=_STR, address=_STR, rating=_NUM, price_per_night=_NUM, currency=_STR,
+              available_rooms=_INT, amenities=_arr(_STR), discount_percentage=_NUM)
+_FLIGHT = _obj(flight_id=_STR, airline=_STR, flight_number=_STR, origin=_STR, destination=_STR,
+               departure_time=_DATETIME, arrival_time=_DATETIME, price=_NUM, currency=_STR, seats_available=_INT)
+_PRODUCT = _obj(product_id=_STR, name=_STR, brand=_STR, category=_STR, price=_NUM, discounted_price=_NUM,
+                rating=_NUM, in_stock=_BOOL, description=_STR)
+_BOOKING = _obj(booking_reference=_STR, customer_id=_INT, status={"$ref": "#/components/schemas/BookingStatus"},
+                total_amount=_NUM, currency=_STR, points_earned=_INT, created_at=_DATETIME)
+_ORDER = _obj(order_id=_STR, customer_id=_INT, status={"$ref": "#/components/schemas/BookingStatus"},
+              items=_arr(_obj(product_id=_STR, name=_STR, quantity=_INT, price=_NUM)), total_amount=_NUM,
+              payment_method=_STR, created_at=_DATETIME)
+# RedemptionHistory.redemptions is List[dict]; one redemption as the API records it
+_REDEMPTION = _obj(id=_INT, reward_id=_INT, customer_id=_INT, points_redeemed=_INT, dollar_value=_NUM,
+                   redemption_type={"type": "string", "enum": ["STATEMENT_CREDIT", "CASH_BACK", "GIFT_CARD", "TRAVEL"]},
+                   status={"$ref": "#/components/schemas/RewardStatus"}, description=_STR, redeemed_at=_DATETIME)
+_MESSAGE = "models:SuccessResponse"
+
+# Response schemas for operations swagger.json documents without one: "models:<Name>" uses the
+# JSON schema of that model, "page:<key>:<Name>" a paginated list of it, "list:<key>:<Name>" a plain list
+FALLBACK_RESPONSES = {
+    "PUT /api/bookings/{booking_id}/modify": "models:BookingStatusResponse",
+    "GET /api/bookings/{booking_id}/status": "models:BookingStatusResponse",
+    "GET /api/customers/{customer_id}": "models:Customer",
+    "PUT /api/customers/{customer_id}": "models:Customer",
+    "DELETE /api/customers/{customer_id}": _MESSAGE,
+    "GET /api/customers/{customer_id}/credit-cards": "models:CreditCardListResponse",
+    "POST /api/customers/{customer_id}/credit-cards": "models:CreditCard",
+    "PUT /api/customers/{customer_id}/credit-cards/{card_id}": "models:CreditCard",
+    "DELETE /api/customers/{customer_id}/credit-cards/{card_id}": _MESSAGE,
+    "GET /api/merchants": "models:MerchantListResponse",
+    "POST /api/merchants": "models:Merchant",
+    "GET /api/merchants/{merchant_id}": "models:Merchant",
+    "PUT /api/merchants/{merchant_id}": "models:Merchant",
+    "DELETE /api/merchants/{merchant_id}": _MESSAGE,
+    "GET /api/merchants/{merchant_id}/analytics": "models:MerchantAnalytics",
+    "GET /api/merchants/{merchant_id}/history": "page:payments:Payment",
+    "GET /api/merchants/{merchant_id}/offers": "models:OfferListResponse",
+    "GET /api/payments/analytics/spending": "models:SpendingAnalytics",
+    "GET /api/payments/customer/{customer_id}": "models:PaymentListResponse",
+    "GET /api/payments/{payment_id}": "models:Payment",
+    "POST /api/payments/{payment_id}/refund": "models:Refund",
+    "GET /api/refunds": "models:RefundListResponse",
+    "POST /api/refunds/points/cancel": _MESSAGE,
+    "POST /api/refunds/request": "models:Refund",
+    "GET /api/refunds/{refund_id}": "models:Refund",
+    "POST /api/refunds/{refund_id}/approve": "models:Refund",
+    "POST /api/refunds/{refund_id}/deny": "models:Refund",
+    "POST /api/rewards": "models:Reward",
+    "GET /api/rewards/customer/{customer_id}": "models:RewardListResponse",
+    "GET /api/rewards/customer/{customer_id}/balance": "models:CustomerBalance",
+    "GET /api/rewards/customer/{customer_id}/history": _obj(redemptions=_arr(_REDEMPTION), total=_INT, pages=_INT),
+    "POST /api/rewards/customer/{customer_id}/redeem": "models:CustomerBalance",
+    "POST /api/rewards/expire-check": _MESSAGE,
+    "GET /api/rewards/{reward_id}": "models:Reward",
+    "POST /api/rewards/{reward_id}/redeem": "models:Reward",
+    "GET /api/tokens/card/{card_id}/tokens": "list:tokens:CardToken",
+    "POST /api/tokens/create": "models:CardToken",
+    "GET /api/tokens/customer/{customer_id}": "list:tokens:CardToken",
+    "GET /api/tokens/{token_id}": "models:CardToken",
+    "POST /api/tokens/{token_id}/deactivate": "models:CardToken",
+    "POST /api/tokens/{token_id}/validate": "models:TokenValidationResponse",
+    "POST /offers/hotel/book-hotel": _BOOKING,
+    "GET /offers/hotel/booking/{booking_reference}": _BOOKING,
+    "GET /offers/hotel/cities": _obj(cities=_arr(_STR)),
+    "POST /offers/hotel/search-hotels": _obj(hotels=_arr(_HOTEL), total=_INT),
+    "POST /offers/search/travel-package": _obj(packages=_arr(_obj(package_id=_STR, flight=_FLIGHT, hotel=_HOTEL, total_price=_NUM, savings=_NUM)), total=_INT),
+    "POST /offers/shopping/add-to-cart": _obj(cart_id=_STR, customer_id=_INT, items=_arr(_obj(product_id=_STR, quantity=_INT, price=_NUM)), subtotal=_NUM),
+    "GET /offers/shopping/brands": _obj(brands=_arr(_STR)),
+    "GET /offers/shopping/categories": _obj(categories=_arr(_STR)),
+    "POST /offers/shopping/create-order": _ORDER,
+    "GET /offers/shopping/order/{order_id}": _ORDER,
+    "GET /offers/shopping/product/{product_id}": _PRODUCT,
+    "POST /offers/shopping/search": _obj(products=_arr(_PRODUCT), total=_INT, pages=_INT, current_page=_INT, per_page=_INT),
+    "GET /offers/travel/airports": _obj(airports=_arr(_obj(code=_STR, name=_STR, city=_STR, country=_STR))),
+    "POST /offers/travel/book-flight": _BOOKING,
+    "GET /offers/travel/booking/{booking_reference}": _BOOKING,
+    "POST /offers/travel/search-flights": _obj(flights=_arr(_FLIGHT), total=_INT),
+    "GET /simulator/status": _obj(services=_arr({"$ref": "#/$defs/IntegrationStatus"}), timestamp=_DATETIME),
+}
+
+
+class SwaggerStub:
+    """Synthesizes schema-conformant responses for every operation in swagger.json
+
+    Data is deterministic per (path, item id, seed): fetching /api/offers/7 twice gives the
+    same offer. Paginated responses honour page/per_page over a collection of `items`
+    entries, path parameters and query filters are echoed into matching fields, and
+    POST/PUT responses echo the request body fields the schema knows.
+    """
+
+    def __init__(self, swagger_path=SWAGGER_PATH, items=200, text_words=8, seed=0):
+        with open(swagger_path) as f:
+            self.swagger = json.load(f)
+        self.items = items
+        self.text_words = text_words
+        self.seed = seed
+        self.defs = dict(self.swagger.get("components", {}).get("schemas", {}))
+        self.operations = {}
+        for path, spec in self.swagger["paths"].items():
+            for method, operation in spec.items():
+                if method in ("get", "post", "put", "delete", "patch"):
+                    self.operations[(method.upper(), path)] = self._response_schema(method.upper(), path, operation)
+
+    def _model_schema(self, name):
+        import models
+
+        schema = getattr(models, name).model_json_schema()
+        self.defs.update(schema.pop("$defs", {}))
+        return schema
+
+    def _response_schema(self, method, path, operation):
+        for status, response in sorted(operation.get("responses", {}).items()):
+            if status.startswith("2") and response.get("content"):
+                return int(status), response["content"]["application/json"]["schema"]
+        status = next((int(s) for s in sorted(operation.get("responses", {})) if s.startswith("2")), 200)
+        fallback = FALLBACK_RESPONSES.get(f"{method} {path}", _MESSAGE)
+        if isinstance(fallback, dict):
+            return status, fallback
+        kind, _, rest = fallback.partition(":")
+        if kind == "models":
+            return status, self._model_schema(rest)
+        key, _, name = rest.partition(":")
+        fields = {key: _arr(self._model_schema(name)), "total": _INT}
+        if kind == "page":
+            fields.update(pages=_INT, current_page=_INT, per_page=_INT)
+        return status, _obj(**fields)
+
+    def definition(self, ref):
+        """Schema a $ref points to: a swagger component, or a model in models/ by name"""
+        name = ref.rsplit("/", 1)[-1]
+        if name not in self.defs:
+            self.defs[name] = self._model_schema(name)
+        return self.defs[name]
+
+    def resolve(self, schema):
+        while "$ref" in schema:
+            schema = self.definition(schema["$ref"])
+        for combinator in ("anyOf", "oneOf", "allOf"):
+            if combinator in schema:
+                options = [s for s in schema[combinator] if s.get("type") != "null"]
+                schema = {**{k: v for k, v in schema.items() if k != combinator}, **self.resolve(options[0])}
+        return schema
+
+    def inline(self, schema):
+        """schema with every $ref replaced by its definition, for validating responses"""
+        if isinstance(schema, dict):
+            if "$ref" in schema:
+                return self.inline(self.definition(schema["$ref"]))
+            return {k: self.inline(v) for k, v in schema.items()}
+        if isinstance(schema, list):
+            return [self.inline(v) for v in schema]
+        return schema
+
+    def response(self, method, path, path_params, query, body):
+        status, schema = self.operations[(method, path)]
+        item_id = next(iter(path_params.values()), 1) if path_params else 1
+        context = {**query, **(body if isinstance(body, dict) else {}), **path_params}
+        rng = random.Random(f"{self.seed}:{path}:{item_id}")
+        return status, self.synthesize(schema, rng, context=context, query=query, item_id=item_id)
+
+    def synthesize(self, schema, rng, name="", context=None, query=None, item_id=1):
+        schema = self.resolve(schema)
+        context = context or {}
+        if "enum" in schema:
+            return context[name] if context.get(name) in schema["enum"] else rng.choice(schema["enum"])
+        kind = schema.get("type", "object" if "properties" in schema else "string")
+        if name and name in context and kind not in ("object", "array"):
+            value = self._coerce(context[name], kind)
+            if value is not None:
+                return value
+        if kind == "object":
+            return self._object(schema, rng, context, query, item_id)
+        if kind == "array":
+            return [self.synthesize(schema.get("items", _STR), rng, name, {}) for _ in range(rng.randint(1, 4))]
+        if kind == "integer":
+            return self._integer(schema, rng, name, item_id)
+        if kind == "number":
+            return self._number(schema, rng, name)
+        if kind == "boolean":
+            return rng.random() < (0.8 if name.startswith("is_") else 0.5)
+        return self._string(schema, rng, name, item_id)
+
+    def _object(self, schema, rng, context, query, item_id):
+        properties = schema.get("properties")
+        if properties is None:
+            return {word: rng.randint(1, 500) for word in rng.sample(WORDS, 3)}
+        page_key = next((key for key, value in properties.items()
+                         if self.resolve(value).get("type") == "array" and "items" in self.resolve(value)
+                         and self.resolve(self.resolve(value)["items"]).get("type", "object") == "object"), None)
+        result = {}
+        if page_key is not None and ("total" in properties or "pages" in properties):
+            result.update(self._page(properties, page_key, query or {}))
+        for key, value in properties.items():
+            if key not in result:
+                result[key] = self.synthesize(value, rng, key, context, item_id=item_id)
+        if "id" in properties and isinstance(result.get("id"), int):
+            result["id"] = int(item_id) if str(item_id).isdigit() else result["id"]
+        return result
+
+    def _page(self, properties, key, query):
+        per_page = min(100, max(1, int(query.get("per_page", 10))))
+        page = max(1, int(query.get("page", 1)))
+        first = (page - 1) * per_page
+        count = max(0, min(per_page, self.items - first))
+        item_schema = self.resolve(properties[key])["items"]
+        filters = {k: v for k, v in query.items() if k not in ("page", "per_page")}
+        items = [
+            self.synthesize(item_schema, random.Random(f"{self.seed}:{key}:{first + i + 1}"), context=filters, item_id=first + i + 1)
+            for i in range(count)
+        ]
+        values = {"total": self.items, "pages": max(1, math.ceil(self.items / per_page)), "current_page": page, "per_page": per_page}
+        return {key: items, **{field: values[field] for field in PAGINATION_FIELDS if field in properties}}
+
+    @staticmethod
+    def _coerce(value, kind):
+        """A context value as the schema type, or None if it cannot be one (e.g. customer_id CU00000001 as integer)"""
+        try:
+            if kind == "integer":
+                return int(value)
+            if kind == "number":
+                return float(value)
+            if kind == "boolean":
+                return value if isinstance(value, bool) else str(value).lower() == "true"
+        except (TypeError, ValueError):
+            return None
+        return str(value) if kind == "string" else value
+
+    def _integer(self, schema, rng, name, item_id):
+        low, high = schema.get("minimum"), schema.get("maximum")
+        if low is None and high is None:
+            if name == "id" or name.endswith("_id"):
+                low, high = 1, max(1, self.items)
+            elif "month" in name:
+                low, high = 1, 12
+            elif "year" in name:
+                low, high = 2026, 2031
+            elif "point" in name:
+                low, high = 0, 5000
+        low = int(low if low is not None else 0)
+        return rng.randint(low, int(high if high is not None else max(low, 1000)))
+
+    def _number(self, schema, rng, name):
+        if "percent" in name:
+            low, high = 5, 50
+        elif "rating" in name:
+            low, high = 1, 5
+        else:
+            low, high = 1, 2000
+        low = schema.get("minimum", low)
+        return round(rng.uniform(low, max(low, schema.get("maximum", high))), 2)
+
+    def _string(self, schema, rng, name, item_id):
+        fmt = schema.get("format")
+        n = rng.randint(1, max(1, self.items))
+        when = datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=rng.randint(0, 365 * 24 * 60))
+        if fmt == "date-time":
+            return when.isoformat().replace("+00:00", "Z")
+        if fmt == "date":
+            return when.date().isoformat()
+        if fmt == "email" or "email" in name:
+            return f"user{n}@example.com"
+        if "customer_id" in name:
+            return f"CU{n:08d}"
+        if name == "id" or name.endswith("_id") or "reference" in name:
+            return f"{(name.split('_')[0] or 'id')[:3].upper()}{n:08d}"
+        if "card_number" in name:
+            return f"****-****-****-{rng.randint(1000, 9999)}"
+        if "phone" in name:
+            return f"+1-555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}"
+        if "website" in name or "url" in name:
+            return f"https://www.example.com/{rng.choice(WORDS)}"
+        if "currency" in name:
+            return "USD"
+        if "example" in schema and isinstance(schema["example"], str) and rng.random() < 0.5:
+            return schema["example"]
+        if any(word in name for word in ("description", "terms", "reason", "notes", "details", "message")):
+            words = [rng.choice(WORDS) for _ in range(self.text_words)]
+        else:
+            words = [rng.choice(WORDS) for _ in range(2)]
+        text = " ".join(words).capitalize()
+        return text[:schema["maxLength"]] if "maxLength" in schema else text
+
+
+def sample_latency(rng, mean_ms, distribution):
+    """Seconds of artificial latency with the given mean"""
+    if mean_ms <= 0:
+        return 0.0
+    if distribution == "uniform":
+        return rng.uniform(0, 2 * mean_ms) / 1000
+    if distribution == "exponential":
+        return rng.expovariate(1 / mean_ms) / 1000
+    if distribution == "lognormal":
+        sigma = 0.6
+        return rng.lognormvariate(math.log(mean_ms) - sigma ** 2 / 2, sigma) / 1000
+    return mean_ms / 1000
+
+
+def create_stub_app(
+    latency_ms=5.0,
+    payment_count=500,
+    swagger=False,
+    items=200,
+    text_words=8,
+    latency_distribution="fixed",
+    error_rate=0.0,
+    error_statuses=(500, 503),
+    overrides=None,
+    seed=0
+):
+    """Stub backend app; with swagger=True every swagger.json path is served
+
+    overrides maps a swagger path template to its own latency_ms, latency_distribution
+    and error_rate, e.g. {"/offers/search/travel-package": {"latency_ms": 400}}.
+    """
+    if latency_distribution not in LATENCY_DISTRIBUTIONS:
+        raise ValueError(f"latency_distribution must be one of {', '.join(LATENCY_DISTRIBUTIONS)}")
+    payments = generate_payments(payment_count)
+    overrides = overrides or {}
+    rng = random.Random(seed)
+    stats = {"requests": 0, "errors_injected": 0}
+
+    async def delay(template=None):
+        stats["requests"] += 1
+        override = overrides.get(template, {})
+        seconds = sample_latency(rng, override.get("latency_ms", latency_ms), override.get("latency_distribution", latency_distribution))
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+        if rng.random() < override.get("error_rate", error_rate):
+            stats["errors_injected"] += 1
+            status = rng.choice(error_statuses)
+            return JSONResponse({"error": f"Injected failure (HTTP {status})"}, status_code=status)
+        return None
+
+    async def health(request):
+        failure = await delay("/api/health")
+        if failure is not None:
+            return failure
+        return JSONResponse({"status": "healthy", "timestamp": datetime.now(timezone.utc).isoformat()})
+
+    async def list_payments(request):
+        failure = await delay("/api/payments")
+        if failure is not None:
+            return failure
+        page = max(1, int(request.query_params.get("page", 1)))
+        per_page = max(1, int(request.query_params.get("per_page", 10)))
+        selected = payments
+        if "customer_id" in request.query_params:
+            selected = [p for p in selected if p["customer_id"] == request.query_params["customer_id"]]
+        if "status" in request.query_params:
+            selected = [p for p in selected if p["status"] == request.query_params["status"]]
+        start = (page - 1) * per_page
+        return JSONResponse({
+            "payments": selected[start:start + per_page],
+            "total": len(selected),
+            "pages": max(1, math.ceil(len(selected) / per_page)),
+            "current_page": page,
+            "per_page": per_page,
+        })
+
+    routes = [Route("/api/health", health), Route("/api/payments", list_payments)]
+    stub = None
+    if swagger:
+        stub = SwaggerStub(items=items, text_words=text_words, seed=seed)
+        templates = sorted({path for _, path in stub.operations}, key=lambda path: (path.count("{"), path))
+        for template in templates:
+            methods = [method for method, path in stub.operations if path == template]
+            routes.append(Route(template, _operation_endpoint(stub, template, delay), methods=methods))
+
+    app = Starlette(routes=routes)
+    app.state.stats = stats
+    app.state.swagger_stub = stub
+    return app
+
+
+def _operation_endpoint(stub, template, delay):
+    async def endpoint(request):
+        failure = await delay(template)
+        if failure is not None:
+            return failure
+        body = None
+        if request.method in ("POST", "PUT", "PATCH"):
+            try:
+                body = await request.json()
+            except ValueError:
+                body = None
+        path_params = {k: int(v) if v.isdigit() else v for k, v in request.path_params.items()}
+        status, payload = stub.response(request.method, template, path_params, dict(request.query_params), body)
+        return JSONResponse(payload, status_code=status)
+    return endpoint
+
+
+@contextlib.contextmanager
+def stub_api_client(app):
+    """Route the shared APIClient to an ASGI app in this process; cached responses are dropped on exit"""
+    import httpx
+    from unittest.mock import patch
+    from models import api_client
+
+    transport = httpx.ASGITransport(app=app)
+    try:
+        with patch("models.base_client.httpx.AsyncClient", new=functools.partial(httpx.AsyncClient, transport=transport)):
+            yield app
+    finally:
+        # Keep stub data out of the shared response cache
+        if api_client.cache is not None:
+            api_client.cache.clear()
+
+
+@contextlib.contextmanager
+def stub_server(groups, name="stub-server", app=None, **stub_options):
+    """FastMCP server with the given tool groups whose upstream requests go to app, by default a
+    create_stub_app(latency_ms=0, **stub_options) backend"""
+    from fastmcp import FastMCP
+    from tools import register_all_tools
+
+    mcp = FastMCP(name=name)
+    register_all_tools(mcp, groups=groups)
+    with stub_api_client(app if app is not None else create_stub_app(**{"latency_ms": 0, **stub_options})):
+        yield mcp
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run a local stub of the payments API")
+    parser.add_argument("--port", type=int, default=5001)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Mean artificial latency added to every response")
+    parser.add_argument("--latency-distribution", default="fixed", choices=LATENCY_DISTRIBUTIONS)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500/503")
+    parser.add_argument("--payments", type=int, default=500, help="Number of generated payments")
+    parser.add_argument("--items", type=int, default=200, help="Collection size behind every other paginated endpoint")
+    parser.add_argument("--text-words", type=int, default=8, help="Words in generated descriptions and terms")
+    parser.add_argument("--overrides", help="JSON file of per-path latency_ms/latency_distribution/error_rate")
+    parser.add_argument("--payments-only", action="store_true", help="Serve only /api/health and /api/payments")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    overrides = None
+    if args.overrides:
+        with open(args.overrides) as f:
+            overrides = json.load(f)
+    app = create_stub_app(
+        args.latency_ms, args.payments, swagger=not args.payments_only, items=args.items, text_words=args.text_words,
+        latency_distribution=args.latency_distribution, error_rate=args.error_rate, overrides=overrides, seed=args.seed
+    )
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
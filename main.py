@@ -1,21 +1,17 @@
 from fastmcp import FastMCP
 from tools import register_all_tools
-from fastmcp.server.auth import JWTVerifier
-from fastmcp.server.auth.providers.jwt import RSAKeyPair
+from server import auth as server_auth
+from server.serving import worker_count, check_transport, run_workers
 import random
 import os
+import sys
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
-key_pair = RSAKeyPair.generate()
-access_token = key_pair.create_token(audience="ChasePaymentsRewardsOffersMCPServer")
-
-auth = JWTVerifier(
-    public_key=key_pair.public_key,
-    audience="ChasePaymentsRewardsOffersMCPServer",
-)
+# JWT verification is only set up when AUTH_ENABLED=true; keys are loaded or generated on first use
+auth = server_auth.build_auth()
 
 # Initialize FastMCP server
 mcp = FastMCP(name="ChasePaymentsRewardsOffersMCPServer",
@@ -26,23 +22,48 @@ mcp = FastMCP(name="ChasePaymentsRewardsOffersMCPServer",
               Disputes
               Live Check with Merchants
               """,
-              auth=None
+              auth=auth
               )
 
-# Register all tools from the tools package
-register_all_tools(mcp)
+# Register the tool groups selected by TOOL_GROUPS_ENABLED (default: all)
+tool_groups = register_all_tools(mcp)
+
+def __getattr__(name):
+    # key_pair/access_token used to be created at import time; keep them available lazily
+    if name == "key_pair":
+        return server_auth.get_key_pair()
+    if name == "access_token":
+        return server_auth.create_access_token()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == "__main__":
+    if "--profile-startup" in sys.argv:
+        # Report import, registration and time-to-ready costs of a cold start instead of serving
+        from server.startup import profile_startup, format_report
+        print(format_report(profile_startup()))
+        sys.exit(0)
+
     # Run the MCP server
     print("Starting Credit Card Payment System MCP Server...")
     print("Available tools have been registered and are ready for use.")
+    print(f"Active tool groups: {', '.join(tool_groups.loaded) or 'none'}")
+    if tool_groups.available:
+        on_demand = "on demand via load_tool_groups" if os.getenv("TOOL_GROUPS_ON_DEMAND", "false").lower() == "true" else "disabled"
+        print(f"Other tool groups ({on_demand}): {', '.join(tool_groups.available)}")
 
     # Read port and transport from environment variables with defaults
     port = int(os.getenv("PORT", 8001))
     transport = os.getenv("TRANSPORT", "sse")
     print(f"Starting server with transport '{transport}' on port {port}")
 
-    mcp.run(transport=transport, port=port)
+    workers = worker_count()
+    check_transport(transport, workers)
+    if workers > 1:
+        # Process pool behind one port; send SIGHUP to the supervisor to reload workers
+        print(f"Starting {workers} workers with stateless streamable HTTP")
+        run_workers(port=port, workers=workers)
+    else:
+        mcp.run(transport=transport, port=port)
 
     # In a real implementation, you might want to run this differently
     # For now, this shows the server is configured and ready
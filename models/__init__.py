@@ -1,6 +1,10 @@
 # Enums
 from .enums import *
 from .base_client import api_client, APIClient
+from .cache import CacheBackend, MemoryCacheBackend, SQLiteCacheBackend, PersistentCacheBackend, create_cache_backend
+from .parsing import (
+    ResponseParser, response_parser, RESPONSE_VALIDATION_MODES, LIST_RESPONSE_ADAPTERS, typed_list_responses_enabled
+)
 
 # Entity Models - cleaned up to match swagger.json exactly
 from .customer import Customer, CustomerCreate, CustomerUpdate, CustomerListResponse
@@ -22,7 +26,7 @@ from .reward import (
 )
 from .refund import (
     Refund, RefundRequest, PointsRefundRequest, RefundApproval, RefundDenial,
-    RefundListResponse
+    RefundDecision, RefundListResponse
 )
 # Minimal booking models - only 2 API endpoints exist
 from .booking import BookingModification, BookingStatusResponse
@@ -50,6 +54,8 @@ __all__ = [
 
     # Client
     "api_client", "APIClient",
+    "CacheBackend", "MemoryCacheBackend", "SQLiteCacheBackend", "PersistentCacheBackend", "create_cache_backend",
+    "ResponseParser", "response_parser", "RESPONSE_VALIDATION_MODES", "LIST_RESPONSE_ADAPTERS", "typed_list_responses_enabled",
 
     # Customer models
     "Customer", "CustomerCreate", "CustomerUpdate", "CustomerListResponse",
@@ -74,7 +80,7 @@ __all__ = [
 
     # Refund models
     "Refund", "RefundRequest", "PointsRefundRequest", "RefundApproval", "RefundDenial",
-    "RefundListResponse",
+    "RefundDecision", "RefundListResponse",
 
     # Minimal booking models - only 2 endpoints exist
     "BookingModification", "BookingStatusResponse",
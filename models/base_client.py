@@ -1,8 +1,14 @@
+import asyncio
 import os
+import time
 import httpx
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, Union, List, Callable
 import json
 from dotenv import load_dotenv
+from .cache import (
+    CacheBackend, CACHEABLE_GET_ENDPOINTS, CATALOG_GET_ENDPOINTS, DEFAULT_REFERENCE_TTL_SECONDS,
+    DEFAULT_CATALOG_TTL_SECONDS, cache_key, collection_prefix, create_cache_backend
+)
 
 # Load environment variables from .env file
 load_dotenv()
@@ -10,9 +16,26 @@ load_dotenv()
 class APIClient:
     """Base API client for making HTTP requests to the bus payments API"""
 
-    def __init__(self):
+    def __init__(self, cache: Optional[CacheBackend] = None):
         self.base_url = os.getenv("API_BASE_URL", "http://192.168.86.189:5001")
         self.timeout = 30.0
+        # Reference data is cached for cache_ttl seconds and catalog listings for catalog_ttl (RESPONSE_CACHE_BACKEND)
+        self.cache = cache if cache is not None else create_cache_backend()
+        self.cache_ttl = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", str(DEFAULT_REFERENCE_TTL_SECONDS)))
+        self.catalog_ttl = float(os.getenv("RESPONSE_CACHE_CATALOG_TTL_SECONDS", str(DEFAULT_CATALOG_TTL_SECONDS)))
+        # Called with a dict describing each finished upstream request (method, endpoint, params, status, timing, response;
+        # raw_response instead of response for get_raw)
+        self.request_hooks: List[Callable[[Dict[str, Any]], None]] = []
+        # Called before each request for extra headers to send, e.g. trace context propagation
+        self.header_hooks: List[Callable[[], Dict[str, str]]] = []
+
+    def ttl_for(self, endpoint: str) -> Optional[float]:
+        """Seconds a GET response for endpoint may be cached, or None if it is not cacheable"""
+        if endpoint in CACHEABLE_GET_ENDPOINTS:
+            return self.cache_ttl
+        if endpoint in CATALOG_GET_ENDPOINTS and self.catalog_ttl > 0:
+            return self.catalog_ttl
+        return None
 
     async def _make_request(
         self,
@@ -20,59 +43,146 @@ class APIClient:
         endpoint: str,
         params: Optional[Dict[str, Any]] = None,
         json_data: Optional[Dict[str, Any]] = None,
-        headers: Optional[Dict[str, str]] = None
-    ) -> Dict[str, Any]:
-        """Make an HTTP request to the API"""
+        headers: Optional[Dict[str, str]] = None,
+        cache_status: Optional[str] = None,
+        raw: bool = False
+    ) -> Union[Dict[str, Any], bytes]:
+        """Make an HTTP request to the API; with raw=True the undecoded response body is returned"""
         url = f"{self.base_url}{endpoint}"
 
         default_headers = {"Content-Type": "application/json"}
+        for header_hook in self.header_hooks:
+            default_headers.update(header_hook())
         if headers:
             default_headers.update(headers)
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.request(
-                method=method,
-                url=url,
-                params=params,
-                json=json_data,
-                headers=default_headers
-            )
-
-            # Check if response is successful
-            if response.status_code >= 400:
-                error_detail = f"HTTP {response.status_code}"
+        record = {
+            "method": method, "endpoint": endpoint, "status_code": None, "error": None,
+            "start_ns": time.time_ns(), "pool_wait": None, "retries": 0, "cache": cache_status,
+            "params": params, "response_bytes": None, "response": None, "raw_response": None
+        }
+        started = time.perf_counter()
+
+        async def trace(event_name, info):
+            # Time until the request headers start going out: client setup plus connection acquisition
+            if record["pool_wait"] is None and event_name.endswith("send_request_headers.started"):
+                record["pool_wait"] = time.perf_counter() - started
+
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                response = await client.request(
+                    method=method,
+                    url=url,
+                    params=params,
+                    json=json_data,
+                    headers=default_headers,
+                    extensions={"trace": trace}
+                )
+                record["status_code"] = response.status_code
+                record["response_bytes"] = len(response.content)
+
+                # Check if response is successful
+                if response.status_code >= 400:
+                    error_detail = f"HTTP {response.status_code}"
+                    try:
+                        error_data = response.json()
+                        if "error" in error_data:
+                            error_detail = error_data["error"]
+                        elif "message" in error_data:
+                            error_detail = error_data["message"]
+                    except:
+                        error_detail = response.text or error_detail
+
+                    raise Exception(f"API Error: {error_detail}")
+
+                if raw:
+                    record["raw_response"] = response.content
+                    return response.content
+
+                # Return JSON response
                 try:
-                    error_data = response.json()
-                    if "error" in error_data:
-                        error_detail = error_data["error"]
-                    elif "message" in error_data:
-                        error_detail = error_data["message"]
+                    record["response"] = response.json()
                 except:
-                    error_detail = response.text or error_detail
+                    record["response"] = {"message": "Success", "status_code": response.status_code}
+                return record["response"]
+        except Exception as e:
+            record["error"] = str(e)
+            raise
+        finally:
+            record["duration"] = time.perf_counter() - started
+            self._notify(record)
 
-                raise Exception(f"API Error: {error_detail}")
-
-            # Return JSON response
+    def _notify(self, record: Dict[str, Any]):
+        """Pass a finished request's record to every request hook"""
+        for hook in self.request_hooks:
             try:
-                return response.json()
-            except:
-                return {"message": "Success", "status_code": response.status_code}
+                hook(record)
+            except Exception:
+                # Observability hooks must never fail the request
+                pass
 
     async def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Make a GET request"""
-        return await self._make_request("GET", endpoint, params=params)
+        """Make a GET request, answered from the response cache for reference and catalog data"""
+        return await self._get(endpoint, params, raw=False)
+
+    async def get_raw(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> bytes:
+        """Make a GET request and return the undecoded JSON body, for validating straight from bytes"""
+        return await self._get(endpoint, params, raw=True)
+
+    async def _get(self, endpoint: str, params: Optional[Dict[str, Any]], raw: bool) -> Union[Dict[str, Any], bytes]:
+        ttl = self.ttl_for(endpoint) if self.cache is not None else None
+        if ttl is None:
+            return await self._make_request("GET", endpoint, params=params, raw=raw)
+        self.cache.ensure_started()
+        key = cache_key(endpoint, params)
+        start_ns, started = time.time_ns(), time.perf_counter()
+        cached = await self._cache_call(self.cache.get, key)
+        if cached is not None:
+            response = cached.encode() if raw else json.loads(cached)
+            self._notify({
+                "method": "GET", "endpoint": endpoint, "status_code": None, "error": None, "start_ns": start_ns,
+                "pool_wait": None, "retries": 0, "cache": "hit", "params": params, "response_bytes": len(cached),
+                "response": None if raw else response, "raw_response": response if raw else None,
+                "duration": time.perf_counter() - started
+            })
+            return response
+        response = await self._make_request("GET", endpoint, params=params, cache_status="miss", raw=raw)
+        await self._cache_call(self.cache.set, key, response.decode() if raw else json.dumps(response), ttl)
+        return response
+
+    async def _cache_call(self, method: Callable[..., Any], *args) -> Any:
+        """Call a cache backend method, in a worker thread for backends that block on disk I/O"""
+        if self.cache.blocking:
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
+
+    async def _invalidate(self, endpoint: str):
+        """Drop cached responses of the collection a write went to"""
+        if self.cache is not None:
+            await self._cache_call(self.cache.invalidate_prefix, collection_prefix(endpoint))
+
+    def cache_stats(self) -> Dict[str, Any]:
+        if self.cache is None:
+            return {"backend": None}
+        return {**self.cache.stats(), "ttl_seconds": self.cache_ttl, "catalog_ttl_seconds": self.catalog_ttl}
 
     async def post(self, endpoint: str, data: Optional[Dict[str, Any]] = None, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Make a POST request"""
-        return await self._make_request("POST", endpoint, params=params, json_data=data)
+        response = await self._make_request("POST", endpoint, params=params, json_data=data)
+        await self._invalidate(endpoint)
+        return response
 
     async def put(self, endpoint: str, data: Optional[Dict[str, Any]] = None, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Make a PUT request"""
-        return await self._make_request("PUT", endpoint, params=params, json_data=data)
+        response = await self._make_request("PUT", endpoint, params=params, json_data=data)
+        await self._invalidate(endpoint)
+        return response
 
     async def delete(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Make a DELETE request"""
-        return await self._make_request("DELETE", endpoint, params=params)
+        response = await self._make_request("DELETE", endpoint, params=params)
+        await self._invalidate(endpoint)
+        return response
 
 # Global API client instance
 api_client = APIClient()
@@ -0,0 +1,334 @@
+import abc
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+
+DEFAULT_CACHE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".cache", "responses.sqlite3"))
+DEFAULT_REFERENCE_TTL_SECONDS = 3600.0
+DEFAULT_CATALOG_TTL_SECONDS = 0.0
+DEFAULT_COMPACT_SECONDS = 300.0
+
+# Reference data that changes rarely and is identical for every caller
+CACHEABLE_GET_ENDPOINTS = (
+    "/api/offers/categories",
+    "/api/merchants/categories",
+    "/offers/hotel/cities",
+    "/offers/travel/airports",
+    "/offers/shopping/categories",
+    "/offers/shopping/brands",
+)
+
+# Catalog listings, cached only when RESPONSE_CACHE_CATALOG_TTL_SECONDS > 0; writes to the
+# same collection invalidate them
+CATALOG_GET_ENDPOINTS = (
+    "/api/offers",
+    "/api/merchants",
+)
+
+
+def collection_prefix(endpoint: str) -> str:
+    """Collection an endpoint belongs to, e.g. /api/offers for /api/offers/12/activate"""
+    return "/".join(endpoint.split("/")[:3])
+
+
+def is_catalog_key(key: str) -> bool:
+    """Whether a cache key is for a catalog listing, which writes in any worker invalidate"""
+    return key.split("?", 1)[0] in CATALOG_GET_ENDPOINTS
+
+
+def cache_key(endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Stable key for a GET request: the endpoint plus its query parameters in sorted order"""
+    if not params:
+        return endpoint
+    query = {k: (v.value if hasattr(v, 'value') else v) for k, v in params.items() if v is not None}
+    return f"{endpoint}?{json.dumps(query, sort_keys=True, separators=(',', ':'), default=str)}"
+
+
+class CacheBackend(abc.ABC):
+    """Storage for cached responses: JSON text per key with an absolute expiry time
+
+    Backends that set blocking do disk I/O under a lock, so APIClient calls them through
+    asyncio.to_thread rather than on the event loop.
+    """
+
+    name = "base"
+    blocking = False
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Cached value for key, or None if it is missing or expired"""
+
+    @abc.abstractmethod
+    def set(self, key: str, value: str, ttl: float) -> None:
+        """Store value under key for ttl seconds"""
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> None:
+        """Drop the entry for key if there is one"""
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """Drop every entry"""
+
+    @abc.abstractmethod
+    def invalidate_prefix(self, prefix: str) -> int:
+        """Drop every entry whose key starts with prefix; returns the number dropped"""
+
+    def ensure_started(self) -> None:
+        """Start any background maintenance; called from within the event loop"""
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        """Number of unexpired entries"""
+
+    def _count(self, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, "entries": len(self), "hits": self.hits, "misses": self.misses}
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process LRU cache; each worker keeps its own copy"""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 1024):
+        super().__init__()
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= time.time():
+            del self._entries[key]
+            entry = None
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return self._count(entry[1] if entry else None)
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        self._entries[key] = (time.time() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def invalidate_prefix(self, prefix: str) -> int:
+        keys = [key for key in self._entries if key.startswith(prefix)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Cache in a SQLite database in WAL mode, shared by every process that opens the same file
+
+    WAL lets worker processes read concurrently while one writes, so a response fetched
+    by any worker is a hit for all of them, and entries outlive worker restarts.
+    """
+
+    name = "sqlite"
+    blocking = True
+
+    def __init__(self, path: Optional[str] = None):
+        super().__init__()
+        self.path = path or os.getenv("RESPONSE_CACHE_PATH", DEFAULT_CACHE_PATH)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # Reentrant so PersistentCacheBackend can hold it around its memory copy and the disk call
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM responses WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return self._count(row[0] if row else None)
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, value, stored_at, expires_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now + ttl)
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+
+    def invalidate_prefix(self, prefix: str) -> int:
+        with self._lock:
+            cursor = self._db.execute("DELETE FROM responses WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+        return cursor.rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses WHERE expires_at > ?", (time.time(),)).fetchone()[0]
+
+    def close(self) -> None:
+        self._db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "path": self.path}
+
+
+class PersistentCacheBackend(SQLiteCacheBackend):
+    """In-memory cache backed by a SQLite file, warm from the first request after a restart
+
+    Unexpired entries are loaded from disk into memory when the backend is created and
+    served from memory with their remaining TTL; misses fall through to disk (where other
+    workers may have stored the entry) and writes go to both. Catalog listings are kept
+    on disk only: a write in one worker invalidates them there, which an in-memory copy
+    in another worker would not see. A background task deletes expired rows and
+    checkpoints the WAL every compact_interval seconds.
+    """
+
+    name = "persistent"
+
+    def __init__(self, path: Optional[str] = None, compact_interval: Optional[float] = None, max_entries: int = 4096):
+        super().__init__(path)
+        if compact_interval is None:
+            compact_interval = float(os.getenv("RESPONSE_CACHE_COMPACT_SECONDS", str(DEFAULT_COMPACT_SECONDS)))
+        self.compact_interval = compact_interval
+        self.memory = MemoryCacheBackend(max_entries=max_entries)
+        self._task: Optional[asyncio.Task] = None
+        self.last_compaction: Optional[Dict[str, Any]] = None
+        started = time.perf_counter()
+        self.loaded_entries = self.load()
+        self.load_ms = round((time.perf_counter() - started) * 1000, 3)
+
+    def load(self) -> int:
+        """Copy every unexpired disk entry except catalog listings into memory"""
+        now = time.time()
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key, value, expires_at FROM responses WHERE expires_at > ? ORDER BY stored_at", (now,)
+            ).fetchall()
+        rows = [row for row in rows if not is_catalog_key(row[0])]
+        for key, value, expires_at in rows:
+            self.memory.set(key, value, expires_at - now)
+        return len(rows)
+
+    def get(self, key: str) -> Optional[str]:
+        catalog = is_catalog_key(key)
+        # The memory copy is touched under the lock too, since calls arrive from worker threads
+        with self._lock:
+            if not catalog:
+                value = self.memory.get(key)
+                if value is not None:
+                    return self._count(value)
+            row = self._db.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+            if row is not None and not catalog:
+                self.memory.set(key, row[0], row[1] - time.time())
+        return self._count(row[0] if row else None)
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        with self._lock:
+            super().set(key, value, ttl)
+            if not is_catalog_key(key):
+                self.memory.set(key, value, ttl)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            super().delete(key)
+            self.memory.delete(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            super().clear()
+            self.memory.clear()
+
+    def invalidate_prefix(self, prefix: str) -> int:
+        with self._lock:
+            self.memory.invalidate_prefix(prefix)
+            return super().invalidate_prefix(prefix)
+
+    def compact(self) -> Dict[str, Any]:
+        """Delete expired rows and fold the WAL back into the database file"""
+        started = time.perf_counter()
+        with self._lock:
+            removed = self._db.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),)).rowcount
+            self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.last_compaction = {
+            "at": time.time(),
+            "removed": removed,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
+        return self.last_compaction
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.compact_interval)
+            try:
+                await asyncio.to_thread(self.compact)
+            except sqlite3.Error:
+                # Another worker holds the write lock; try again next interval
+                pass
+
+    def ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self.compact_interval > 0 and (self._task is None or self._task.done() or self._task.get_loop() is not loop):
+            self._task = loop.create_task(self._run())
+
+    def __len__(self) -> int:
+        return len(self.memory)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **super().stats(),
+            "disk_entries": super().__len__(),
+            "loaded_entries": self.loaded_entries,
+            "load_ms": self.load_ms,
+            "compact_interval_seconds": self.compact_interval,
+            "last_compaction": self.last_compaction,
+        }
+
+
+CACHE_BACKENDS = {"memory": MemoryCacheBackend, "sqlite": SQLiteCacheBackend, "persistent": PersistentCacheBackend}
+
+
+def create_cache_backend(name: Optional[str] = None) -> Optional[CacheBackend]:
+    """Backend named by RESPONSE_CACHE_BACKEND (memory, sqlite, persistent or none), default memory"""
+    if name is None:
+        name = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+    name = name.strip().lower()
+    if name in ("", "none", "off"):
+        return None
+    if name not in CACHE_BACKENDS:
+        raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND '{name}'. Available: {', '.join(CACHE_BACKENDS)}, none")
+    return CACHE_BACKENDS[name]()
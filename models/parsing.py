@@ -0,0 +1,189 @@
+import itertools
+import json
+import os
+from typing import Optional, List, Dict, Any, Type, TypeVar, Callable
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from .offer import OfferListResponse
+from .payment import PaymentListResponse
+from .merchant import MerchantListResponse
+from .reward import RewardListResponse
+from .refund import RefundListResponse
+
+RESPONSE_VALIDATION_MODES = ("full", "sampled", "trusted")
+DEFAULT_SAMPLE_RATE = 10
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Validators for the list responses tools can return typed, built once at import
+LIST_RESPONSE_ADAPTERS: Dict[Type[BaseModel], TypeAdapter] = {
+    model: TypeAdapter(model)
+    for model in (OfferListResponse, PaymentListResponse, MerchantListResponse, RewardListResponse, RefundListResponse)
+}
+
+
+def typed_list_responses_enabled() -> bool:
+    return os.getenv("TYPED_LIST_RESPONSES", "false").lower() == "true"
+
+
+def list_response_adapter(model: Type[ModelT]) -> TypeAdapter:
+    """Cached TypeAdapter for a list response model"""
+    adapter = LIST_RESPONSE_ADAPTERS.get(model)
+    if adapter is None:
+        adapter = LIST_RESPONSE_ADAPTERS[model] = TypeAdapter(model)
+    return adapter
+
+
+def list_field(model: Type[BaseModel]) -> Optional[str]:
+    """Name of the field holding the items of a list response model, e.g. payments"""
+    for name, field in model.model_fields.items():
+        args = getattr(field.annotation, "__args__", ())
+        if getattr(field.annotation, "__origin__", None) is list and args and isinstance(args[0], type) and issubclass(args[0], BaseModel):
+            return name
+    return None
+
+
+def trusted_constructor(model: Type[ModelT]) -> Callable[[Dict[str, Any]], ModelT]:
+    """Builds model instances from trusted data without validation
+
+    Same result as model_construct for data holding the model's fields (unknown keys
+    are dropped), at a fraction of its cost: model_construct resolves defaults field by
+    field in Python and ends up slower than validating flat models in pydantic-core.
+    """
+    template = {name: None if field.is_required() or field.default_factory else field.default for name, field in model.model_fields.items()}
+    factories = {name: field.default_factory for name, field in model.model_fields.items() if field.default_factory}
+    create, assign = object.__new__, object.__setattr__
+
+    def construct(data: Dict[str, Any]) -> ModelT:
+        values = template.copy()
+        values.update(data)
+        fields_set = set(data)
+        if len(values) > len(template):
+            values = {name: values[name] for name in template}
+            fields_set &= template.keys()
+        for name, factory in factories.items():
+            if name not in fields_set:
+                values[name] = factory()
+        instance = create(model)
+        assign(instance, "__dict__", values)
+        assign(instance, "__pydantic_fields_set__", fields_set)
+        assign(instance, "__pydantic_extra__", None)
+        assign(instance, "__pydantic_private__", None)
+        return instance
+
+    return construct
+
+
+class ResponseParser:
+    """Builds models from upstream response data with a configurable validation cost
+
+    Modes (RESPONSE_VALIDATION_MODE):
+    - full: every item goes through model_validate; a failure is counted and raised
+    - sampled: 1 in RESPONSE_VALIDATION_SAMPLE_RATE items per model is validated, the rest
+      are constructed without validation; a failing sample is counted and the item constructed
+    - trusted: every item is constructed without validation (see trusted_constructor)
+
+    Constructed items keep upstream values as sent (ISO strings for datetimes, plain
+    strings for enums; dump them with warnings=False), so sampled and trusted are for
+    responses from a backend whose contract is already checked. The failure counters
+    show when that stops being true.
+    """
+
+    def __init__(self, mode: Optional[str] = None, sample_rate: Optional[int] = None):
+        mode = (mode or os.getenv("RESPONSE_VALIDATION_MODE", "full")).lower()
+        if mode not in RESPONSE_VALIDATION_MODES:
+            raise ValueError(f"Unknown response validation mode {mode!r}; use one of {', '.join(RESPONSE_VALIDATION_MODES)}")
+        if sample_rate is None:
+            sample_rate = int(os.getenv("RESPONSE_VALIDATION_SAMPLE_RATE", str(DEFAULT_SAMPLE_RATE)))
+        self.mode = mode
+        self.sample_rate = max(1, sample_rate)
+        self._seen: Dict[str, Any] = {}
+        self._constructors: Dict[Type[BaseModel], Callable] = {}
+        self.counters: Dict[str, Dict[str, int]] = {}
+        self.last_failure: Optional[Dict[str, Any]] = None
+
+    def _count(self, model: Type[BaseModel], key: str, n: int = 1):
+        counters = self.counters.setdefault(model.__name__, {"validated": 0, "constructed": 0, "failures": 0})
+        counters[key] += n
+
+    def _failed(self, model: Type[BaseModel], exc: ValidationError):
+        self._count(model, "failures")
+        self.last_failure = {"model": model.__name__, "mode": self.mode, "errors": exc.error_count(), "first_error": exc.errors()[0]["msg"]}
+
+    def _should_validate(self, model: Type[BaseModel]) -> bool:
+        if self.mode == "full":
+            return True
+        if self.mode == "trusted":
+            return False
+        seen = self._seen.get(model.__name__)
+        if seen is None:
+            seen = self._seen.setdefault(model.__name__, itertools.count())
+        return next(seen) % self.sample_rate == 0
+
+    def construct(self, model: Type[ModelT], data: Dict[str, Any]) -> ModelT:
+        constructor = self._constructors.get(model)
+        if constructor is None:
+            constructor = self._constructors[model] = trusted_constructor(model)
+        return constructor(data)
+
+    def parse(self, model: Type[ModelT], data: Dict[str, Any]) -> ModelT:
+        """One item as model, validated or constructed according to the mode"""
+        if not self._should_validate(model):
+            self._count(model, "constructed")
+            return self.construct(model, data)
+        try:
+            item = model.model_validate(data)
+        except ValidationError as exc:
+            self._failed(model, exc)
+            if self.mode == "full":
+                raise
+            self._count(model, "constructed")
+            return self.construct(model, data)
+        self._count(model, "validated")
+        return item
+
+    def parse_list(self, model: Type[ModelT], items: List[Dict[str, Any]]) -> List[ModelT]:
+        return [self.parse(model, item) for item in items]
+
+    def parse_page(self, list_model: Type[ModelT], data: Dict[str, Any]) -> ModelT:
+        """A paginated list response: items parsed per the mode, pagination fields always validated"""
+        key = list_field(list_model)
+        if key is None:
+            return self.parse(list_model, data)
+        item_model = list_model.model_fields[key].annotation.__args__[0]
+        items = self.parse_list(item_model, data.get(key) or [])
+        page = list_model.model_validate({**data, key: []})
+        page.__dict__[key] = items
+        return page
+
+    def parse_list_response(self, list_model: Type[ModelT], raw: bytes) -> ModelT:
+        """A list response straight from the upstream JSON bytes
+
+        In full mode the bytes go through the model's cached adapter in strict mode, so no
+        intermediate dict is built and loose upstream types (numbers as strings, unknown
+        enum values) fail instead of being coerced. Sampled and trusted modes decode the
+        JSON once and parse the items as parse_page does.
+        """
+        if self.mode != "full":
+            return self.parse_page(list_model, json.loads(raw))
+        key = list_field(list_model)
+        item_model = list_model.model_fields[key].annotation.__args__[0] if key else list_model
+        try:
+            page = list_response_adapter(list_model).validate_json(raw, strict=True)
+        except ValidationError as exc:
+            self._failed(item_model, exc)
+            raise
+        self._count(item_model, "validated", len(getattr(page, key)) if key else 1)
+        return page
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "sample_rate": self.sample_rate if self.mode == "sampled" else None,
+            "models": {name: dict(counts) for name, counts in sorted(self.counters.items())},
+            "failures": sum(counts["failures"] for counts in self.counters.values()),
+            "last_failure": self.last_failure,
+        }
+
+
+# Global response parser instance
+response_parser = ResponseParser()
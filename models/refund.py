@@ -26,6 +26,13 @@ class RefundDenial(BaseModel):
     """Deny a refund request"""
     denial_reason: Optional[str] = Field(None, description="Reason for denial")
 
+class RefundDecision(BaseModel):
+    """Approve or deny a single refund from the review queue"""
+    refund_id: int = Field(..., description="Refund ID to decide on")
+    approved: bool = Field(..., description="True to approve the refund, False to deny it")
+    admin_notes: Optional[str] = Field(None, description="Admin notes sent with an approval")
+    denial_reason: Optional[str] = Field(None, description="Reason sent with a denial")
+
 class Refund(BaseModel):
     """Refund entity model"""
     id: int = Field(..., description="Refund ID")
@@ -0,0 +1 @@
+# Server-side infrastructure for the MCP process: auth, startup, serving and observability.
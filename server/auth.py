@@ -0,0 +1,84 @@
+import os
+from typing import Optional, Any
+
+# Audience the server's JWTs are minted for and verified against
+DEFAULT_AUDIENCE = "ChasePaymentsRewardsOffersMCPServer"
+
+_key_pair = None
+
+
+def auth_enabled() -> bool:
+    """Whether bearer-token auth is switched on for the MCP server"""
+    return os.getenv("AUTH_ENABLED", "false").lower() == "true"
+
+
+def auth_audience() -> str:
+    return os.getenv("AUTH_AUDIENCE", DEFAULT_AUDIENCE)
+
+
+def _read(path: str) -> str:
+    with open(path, "r") as f:
+        return f.read()
+
+
+def _public_pem_from_private(private_pem: str) -> str:
+    from cryptography.hazmat.primitives import serialization
+    private_key = serialization.load_pem_private_key(private_pem.encode("utf-8"), password=None)
+    return private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode("utf-8")
+
+
+def get_key_pair():
+    """RSA key pair used to mint tokens, created on first use
+
+    Loaded from AUTH_PRIVATE_KEY_PATH (and AUTH_PUBLIC_KEY_PATH, or derived from the
+    private key) when set, otherwise generated once per process.
+    """
+    global _key_pair
+    if _key_pair is None:
+        from pydantic import SecretStr
+        from fastmcp.server.auth.providers.jwt import RSAKeyPair
+
+        private_path = os.getenv("AUTH_PRIVATE_KEY_PATH")
+        if private_path:
+            private_pem = _read(private_path)
+            public_path = os.getenv("AUTH_PUBLIC_KEY_PATH")
+            public_pem = _read(public_path) if public_path else _public_pem_from_private(private_pem)
+            _key_pair = RSAKeyPair(private_key=SecretStr(private_pem), public_key=public_pem)
+        else:
+            _key_pair = RSAKeyPair.generate()
+    return _key_pair
+
+
+def build_auth() -> Optional[Any]:
+    """JWT verifier for the FastMCP server, or None when auth is disabled
+
+    Verification only needs a public key, so AUTH_PUBLIC_KEY_PATH alone is enough;
+    no key pair is loaded or generated unless one is actually required.
+    """
+    if not auth_enabled():
+        return None
+    from fastmcp.server.auth import JWTVerifier
+
+    public_path = os.getenv("AUTH_PUBLIC_KEY_PATH")
+    public_key = _read(public_path) if public_path else get_key_pair().public_key
+    return JWTVerifier(
+        public_key=public_key,
+        audience=auth_audience(),
+        issuer=os.getenv("AUTH_ISSUER") or None,
+    )
+
+
+def create_access_token(**kwargs) -> str:
+    """Mint a token for this server's audience with the lazily created key pair"""
+    if os.getenv("AUTH_ISSUER"):
+        kwargs.setdefault("issuer", os.getenv("AUTH_ISSUER"))
+    return get_key_pair().create_token(audience=auth_audience(), **kwargs)
+
+
+def reset():
+    """Forget the cached key pair (used by tests)"""
+    global _key_pair
+    _key_pair = None
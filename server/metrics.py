@@ -0,0 +1,208 @@
+import bisect
+import json
+import os
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Sequence, Tuple
+from fastmcp.server.middleware import Middleware
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SWAGGER_PATH = os.path.join(ROOT, "swagger.json")
+# Latency bucket upper bounds in seconds (Prometheus default buckets)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F-]{16,}|[A-Z]+\d[A-Z0-9]*)$")
+
+
+def metrics_enabled() -> bool:
+    return os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+
+@lru_cache(maxsize=1)
+def _swagger_templates() -> List[Tuple[re.Pattern, str]]:
+    """Swagger path templates as regexes, literal paths before parameterised ones"""
+    try:
+        with open(SWAGGER_PATH) as f:
+            paths = list(json.load(f).get("paths", {}))
+    except (OSError, ValueError):
+        paths = []
+    paths.sort(key=lambda path: path.count("{"))
+    return [(re.compile("^" + re.sub(r"\{[^/]+\}", "[^/]+", path) + "$"), path) for path in paths]
+
+
+@lru_cache(maxsize=1024)
+def path_template(endpoint: str) -> str:
+    """/api/customers/CUST0001/credit-cards -> /api/customers/{customer_id}/credit-cards"""
+    for pattern, template in _swagger_templates():
+        if pattern.match(endpoint):
+            return template
+    return "/".join("{id}" if UNMATCHED_SEGMENT.match(segment) else segment for segment in endpoint.split("/"))
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram in the Prometheus layout"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by linear interpolation inside its bucket, as histogram_quantile does"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if cumulative + bucket_count >= rank and bucket_count:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                if index == len(self.buckets):
+                    return lower
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.buckets[-1]
+
+    def summary(self) -> Dict[str, Any]:
+        def ms(value):
+            return round(value * 1000, 2) if value is not None else None
+        return {
+            "count": self.count,
+            "mean_ms": ms(self.sum / self.count) if self.count else None,
+            "p50_ms": ms(self.quantile(0.5)),
+            "p95_ms": ms(self.quantile(0.95)),
+            "p99_ms": ms(self.quantile(0.99)),
+        }
+
+
+class _Series:
+    __slots__ = ("calls", "errors", "latency")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency = Histogram()
+
+    def record(self, seconds: float, error: bool):
+        self.calls += 1
+        self.errors += int(error)
+        self.latency.observe(seconds)
+
+    def summary(self) -> Dict[str, Any]:
+        return {"calls": self.calls, "errors": self.errors, "latency": self.latency.summary()}
+
+
+class MetricsRegistry:
+    """Call counts, error counts and latency histograms per tool and per upstream path template
+
+    Metrics are kept per process; with several workers each reports its own share.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.tools: Dict[str, _Series] = {}
+        self.upstream: Dict[Tuple[str, str], _Series] = {}
+        self.started_at = time.time()
+
+    def record_tool(self, name: str, seconds: float, error: bool = False):
+        with self._lock:
+            self.tools.setdefault(name, _Series()).record(seconds, error)
+
+    def record_upstream(self, record: Dict[str, Any]):
+        """Request hook for APIClient: one observation per upstream HTTP request"""
+        if record.get("cache") == "hit":
+            return
+        key = (record["method"], path_template(record["endpoint"]))
+        with self._lock:
+            self.upstream.setdefault(key, _Series()).record(record["duration"], record.get("error") is not None)
+
+    def reset(self):
+        with self._lock:
+            self.tools.clear()
+            self.upstream.clear()
+            self.started_at = time.time()
+
+    def snapshot(self, tool_name: Optional[str] = None) -> Dict[str, Any]:
+        with self._lock:
+            tools = {name: series.summary() for name, series in sorted(self.tools.items()) if tool_name in (None, name)}
+            upstream = [
+                {"method": method, "path": path, **series.summary()}
+                for (method, path), series in sorted(self.upstream.items())
+            ]
+        return {"uptime_seconds": round(time.time() - self.started_at, 1), "tools": tools, "upstream": upstream}
+
+    def render_prometheus(self) -> str:
+        """All series in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            families = (
+                ("mcp_tool", "MCP tool invocations", [({"tool": name}, s) for name, s in sorted(self.tools.items())]),
+                ("mcp_upstream_request", "Upstream API requests", [({"method": m, "path": p}, s) for (m, p), s in sorted(self.upstream.items())]),
+            )
+            for prefix, help_text, series_list in families:
+                lines += [f"# HELP {prefix}_calls_total {help_text}", f"# TYPE {prefix}_calls_total counter"]
+                lines += [f"{prefix}_calls_total{_labels(labels)} {s.calls}" for labels, s in series_list]
+                lines += [f"# HELP {prefix}_errors_total {help_text} that raised", f"# TYPE {prefix}_errors_total counter"]
+                lines += [f"{prefix}_errors_total{_labels(labels)} {s.errors}" for labels, s in series_list]
+                lines += [f"# HELP {prefix}_duration_seconds {help_text} latency", f"# TYPE {prefix}_duration_seconds histogram"]
+                for labels, s in series_list:
+                    cumulative = 0
+                    for bound, count in zip(s.latency.buckets + (float("inf"),), s.latency.counts):
+                        cumulative += count
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        lines.append(f"{prefix}_duration_seconds_bucket{_labels({**labels, 'le': le})} {cumulative}")
+                    lines.append(f"{prefix}_duration_seconds_sum{_labels(labels)} {s.latency.sum}")
+                    lines.append(f"{prefix}_duration_seconds_count{_labels(labels)} {s.latency.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    def escape(value):
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in labels.items()) + "}"
+
+
+# Global metrics registry instance
+metrics = MetricsRegistry()
+
+
+class ToolMetricsMiddleware(Middleware):
+    """Records the latency and outcome of every tools/call"""
+
+    def __init__(self, registry: MetricsRegistry = metrics):
+        self.registry = registry
+
+    async def on_call_tool(self, context, call_next):
+        started = time.perf_counter()
+        try:
+            result = await call_next(context)
+        except Exception:
+            self.registry.record_tool(context.message.name, time.perf_counter() - started, error=True)
+            raise
+        self.registry.record_tool(context.message.name, time.perf_counter() - started, error=bool(getattr(result, "isError", False)))
+        return result
+
+
+def install_metrics(mcp, client=None) -> bool:
+    """Add tool metrics middleware, the upstream request hook and the Prometheus route to a server"""
+    if not metrics_enabled():
+        return False
+    if client is None:
+        from models import api_client as client
+    if metrics.record_upstream not in client.request_hooks:
+        client.request_hooks.append(metrics.record_upstream)
+    mcp.add_middleware(ToolMetricsMiddleware())
+
+    @mcp.custom_route(os.getenv("METRICS_PATH", "/metrics"), methods=["GET"], include_in_schema=False)
+    async def prometheus_metrics(request):
+        from starlette.responses import PlainTextResponse
+        return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+    return True
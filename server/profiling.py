@@ -0,0 +1,182 @@
+import cProfile
+import io
+import os
+import pstats
+import random
+import re
+import threading
+import time
+from typing import Optional, List, Dict, Any, Iterable
+from fastmcp.server.middleware import Middleware
+
+DEFAULT_PROFILE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".cache", "profiles"))
+SORT_KEYS = ("cumulative", "tottime", "ncalls")
+PROFILE_NAME = re.compile(r"^(\d+)_([A-Za-z0-9_]+)_(\d+)ms\.prof$")
+
+
+def profiling_enabled() -> bool:
+    return os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+
+
+class ToolProfiler:
+    """Captures cProfile profiles of selected tool invocations into a rotating directory
+
+    A call is profiled when its tool is listed in tool_names ("*" for every tool) or,
+    otherwise, with probability sample_rate. The profile covers everything the tool
+    does on the event loop thread, including upstream response JSON decoding and
+    pydantic validation; concurrent calls running meanwhile also show up in it.
+    Only one invocation is profiled at a time.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        tool_names: Optional[Iterable[str]] = None,
+        sample_rate: Optional[float] = None,
+        max_files: Optional[int] = None
+    ):
+        if tool_names is None:
+            tool_names = [n.strip() for n in os.getenv("PROFILE_TOOLS", "").split(",") if n.strip()]
+        if sample_rate is None:
+            sample_rate = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+        if max_files is None:
+            max_files = int(os.getenv("PROFILE_MAX_FILES", "50"))
+        self.directory = directory or os.getenv("PROFILE_DIR", DEFAULT_PROFILE_DIR)
+        self.tool_names = set(tool_names)
+        self.sample_rate = sample_rate
+        self.max_files = max_files
+        self._active = threading.Lock()
+        self.captured = 0
+        self.skipped_busy = 0
+
+    def configure(self, tool_names: Optional[Iterable[str]] = None, sample_rate: Optional[float] = None):
+        if tool_names is not None:
+            self.tool_names = set(tool_names)
+        if sample_rate is not None:
+            self.sample_rate = min(1.0, max(0.0, sample_rate))
+
+    def should_profile(self, tool_name: str) -> bool:
+        if "*" in self.tool_names or tool_name in self.tool_names:
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def profile(self, tool_name: str, call):
+        """Await call() under cProfile if this invocation is selected and no other profile is running"""
+        if not self.should_profile(tool_name):
+            return await call()
+        if not self._active.acquire(blocking=False):
+            self.skipped_busy += 1
+            return await call()
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        try:
+            profiler.enable()
+            try:
+                return await call()
+            finally:
+                profiler.disable()
+                self._save(profiler, tool_name, time.perf_counter() - started)
+        finally:
+            self._active.release()
+
+    def _save(self, profiler: cProfile.Profile, tool_name: str, seconds: float):
+        os.makedirs(self.directory, exist_ok=True)
+        name = f"{time.time_ns()}_{re.sub(r'[^A-Za-z0-9_]', '_', tool_name)}_{int(seconds * 1000)}ms.prof"
+        profiler.dump_stats(os.path.join(self.directory, name))
+        self.captured += 1
+        self._rotate()
+
+    def _rotate(self):
+        for name in self.list_profiles()[self.max_files:]:
+            try:
+                os.remove(os.path.join(self.directory, name["profile_id"]))
+            except OSError:
+                pass
+
+    def list_profiles(self, tool_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Stored profiles, newest first"""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        profiles = []
+        for name in names:
+            match = PROFILE_NAME.match(name)
+            if match and tool_name in (None, match.group(2)):
+                profiles.append({
+                    "profile_id": name,
+                    "tool": match.group(2),
+                    "captured_at": int(match.group(1)) / 1e9,
+                    "duration_ms": int(match.group(3)),
+                    "size_bytes": os.path.getsize(os.path.join(self.directory, name)),
+                })
+        return sorted(profiles, key=lambda p: -p["captured_at"])
+
+    def report(self, profile_id: str, sort_by: str = "cumulative", limit: int = 30) -> Dict[str, Any]:
+        """pstats summary of one stored profile"""
+        if not PROFILE_NAME.match(profile_id):
+            raise ValueError(f"Invalid profile_id '{profile_id}'")
+        if sort_by not in SORT_KEYS:
+            raise ValueError(f"sort_by must be one of {', '.join(SORT_KEYS)}")
+        path = os.path.join(self.directory, profile_id)
+        if not os.path.exists(path):
+            raise ValueError(f"Profile '{profile_id}' not found")
+        output = io.StringIO()
+        stats = pstats.Stats(path, stream=output)
+        stats.sort_stats(sort_by).print_stats(limit)
+        functions = []
+        for (filename, line, function), (calls, primitive, tottime, cumtime, _) in stats.stats.items():
+            functions.append({
+                "function": f"{os.path.basename(filename)}:{line}({function})",
+                "ncalls": calls,
+                "tottime_ms": round(tottime * 1000, 3),
+                "cumtime_ms": round(cumtime * 1000, 3),
+            })
+        key = {"cumulative": "cumtime_ms", "tottime": "tottime_ms", "ncalls": "ncalls"}[sort_by]
+        functions.sort(key=lambda f: -f[key])
+        return {
+            "profile_id": profile_id,
+            "total_calls": stats.total_calls,
+            "total_time_ms": round(stats.total_tt * 1000, 3),
+            "top_functions": functions[:limit],
+            "report": output.getvalue(),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": True,
+            "directory": self.directory,
+            "tools": sorted(self.tool_names),
+            "sample_rate": self.sample_rate,
+            "max_files": self.max_files,
+            "captured": self.captured,
+            "skipped_busy": self.skipped_busy,
+            "stored": len(self.list_profiles()),
+        }
+
+
+class ProfilingMiddleware(Middleware):
+    """Runs selected tools/call invocations under the tool profiler"""
+
+    def __init__(self, profiler: ToolProfiler):
+        self.profiler = profiler
+
+    async def on_call_tool(self, context, call_next):
+        return await self.profiler.profile(context.message.name, lambda: call_next(context))
+
+
+# Profiler installed by install_profiling, if profiling is enabled
+profiler: Optional[ToolProfiler] = None
+
+
+def install_profiling(mcp, tool_profiler: Optional[ToolProfiler] = None) -> Optional[ToolProfiler]:
+    """Add the profiling middleware to a server when PROFILING_ENABLED=true (or a profiler is given)"""
+    global profiler
+    if tool_profiler is None and not profiling_enabled():
+        return None
+    if tool_profiler is not None:
+        profiler = tool_profiler
+    elif profiler is None:
+        profiler = ToolProfiler()
+    mcp.add_middleware(ProfilingMiddleware(profiler))
+    return profiler
@@ -0,0 +1,226 @@
+import contextvars
+import hashlib
+import hmac
+import json
+import os
+import re
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any
+from fastmcp.server.middleware import Middleware
+from .slow_log import SENSITIVE_ARGUMENT
+
+DEFAULT_RECORDING_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".cache", "recordings", "traffic.ndjson"))
+
+# Collections whose records are people or their instruments: the records' "id" is itself personal
+IDENTIFYING_COLLECTION = re.compile(r"^(customer|credit_card|card|account|guest|traveler|passenger)s?$", re.IGNORECASE)
+DEFAULT_MAX_KNOWN_IDENTIFIERS = 10000
+
+_call_seq: contextvars.ContextVar = contextvars.ContextVar("recording_call_seq", default=None)
+
+
+def recording_enabled() -> bool:
+    return os.getenv("RECORDING_ENABLED", "false").lower() == "true"
+
+
+class Pseudonymizer:
+    """Replaces personal values with stable stand-ins of the same shape
+
+    A value under a sensitive key (card numbers, names, emails, customer IDs...) maps to
+    the same pseudonym everywhere in a recording: in tool arguments, query parameters,
+    upstream URL path segments and response bodies. That keeps a redacted recording
+    replayable, since the replayed tool calls produce the recorded upstream requests.
+    The key is random unless given, so pseudonyms cannot be reversed or recomputed.
+    Pseudonyms are derived from the keyed digest on every call, so no raw value is kept;
+    the value's type picks the form, so 123 and "123" get an int and a digit string.
+
+    Identifiers also turn up under neutral keys, e.g. a customer ID as the "id" of the
+    customer it names. The "id" of records in customer, card and similar collections is
+    pseudonymized, and so is any non-numeric string seen before under a sensitive key or
+    path parameter, wherever it reappears. Those are remembered by keyed digest (the last
+    max_known of them), not by value.
+    """
+
+    def __init__(self, key: Optional[str] = None, max_known: int = DEFAULT_MAX_KNOWN_IDENTIFIERS):
+        self._key = (key or secrets.token_hex(16)).encode()
+        self.max_known = max_known
+        self._known: "OrderedDict[str, None]" = OrderedDict()
+
+    def _remember(self, value: Any):
+        # Numeric IDs are left out: a card ID of 7 must not redact payment 7 or page 7
+        if isinstance(value, str) and not value.isdigit():
+            digest = self._digest(value)
+            self._known[digest] = None
+            self._known.move_to_end(digest)
+            while len(self._known) > self.max_known:
+                self._known.popitem(last=False)
+
+    def is_known(self, value: Any) -> bool:
+        """Whether value is a non-numeric string seen before as a sensitive value"""
+        return isinstance(value, str) and bool(self._known) and self._digest(value) in self._known
+
+    def _digest(self, value: Any) -> str:
+        return hmac.new(self._key, str(value).encode(), hashlib.sha256).hexdigest()
+
+    def pseudonym(self, value: Any) -> Any:
+        if isinstance(value, bool) or value is None:
+            return value
+        digest = self._digest(value)
+        if isinstance(value, int):
+            return 100000 + int(digest[:12], 16) % 900000
+        if isinstance(value, float):
+            return round(int(digest[:8], 16) % 100000 / 100, 2)
+        if isinstance(value, str) and value.isdigit():
+            return "".join(str(int(c, 16) % 10) for c in digest)[:len(value)]
+        if isinstance(value, str) and "@" in value:
+            return f"user-{digest[:10]}@example.com"
+        if isinstance(value, str):
+            prefix = value[:len(value) - len(value.lstrip("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"))]
+            return f"{prefix[:4]}{digest[:8]}"
+        return self.redact(value)
+
+    def redact(self, value: Any, key: str = "", parent: str = "") -> Any:
+        """Copy of value with sensitive values pseudonymized; parent is the key the enclosing object is under"""
+        sensitive = bool(key) and (SENSITIVE_ARGUMENT.search(key) or (key == "id" and IDENTIFYING_COLLECTION.match(parent)))
+        if isinstance(value, dict):
+            return {k: self.redact(v, k, key) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self.redact(v, key, parent) for v in value]
+        if hasattr(value, "value"):
+            value = value.value
+        if sensitive:
+            self._remember(value)
+            return self.pseudonym(value)
+        return self.pseudonym(value) if self.is_known(value) else value
+
+    def endpoint(self, endpoint: str) -> str:
+        """Path with the segments filling sensitive swagger path parameters, or holding a known
+        identifier in any path parameter, replaced"""
+        from .metrics import path_template
+
+        segments = endpoint.split("/")
+        for index, name in enumerate(path_template(endpoint).split("/")):
+            if not name.startswith("{") or index >= len(segments):
+                continue
+            segment = segments[index]
+            if SENSITIVE_ARGUMENT.search(name):
+                self._remember(segment)
+            elif not self.is_known(segment):
+                continue
+            segments[index] = str(self.pseudonym(int(segment) if segment.isdigit() else segment))
+        return "/".join(segments)
+
+
+class TrafficRecorder:
+    """Appends tool calls and the upstream requests they make to an NDJSON recording
+
+    Lines are {"type": "call", ...} per tools/call (tool, redacted arguments, start offset
+    and duration) and {"type": "upstream", ...} per upstream request (method, endpoint,
+    params, status, duration and the redacted response body), linked by the call's seq.
+    benchmarks/replay.py serves the upstream lines as a stand-in backend and replays the
+    calls against a server.
+    """
+
+    def __init__(self, path: Optional[str] = None, pseudonymizer: Optional[Pseudonymizer] = None):
+        self.path = path or os.getenv("RECORDING_FILE", DEFAULT_RECORDING_FILE)
+        self.pseudonymizer = pseudonymizer or Pseudonymizer(os.getenv("RECORDING_REDACTION_KEY"))
+        self.started = time.perf_counter()
+        self._seq = 0
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.upstream = 0
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+    def _write(self, entry: Dict[str, Any]):
+        line = json.dumps(entry, default=str) + "\n"
+        with self._lock:
+            with open(self.path, "a") as f:
+                f.write(line)
+
+    def start_call(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+        return {
+            "type": "call",
+            "seq": seq,
+            "offset_ms": round((time.perf_counter() - self.started) * 1000, 3),
+            "tool": tool_name,
+            "arguments": self.pseudonymizer.redact(arguments),
+        }
+
+    def finish_call(self, call: Dict[str, Any], seconds: float, error: bool):
+        self._write({**call, "duration_ms": round(seconds * 1000, 3), "error": error})
+        self.calls += 1
+
+    def record_request(self, record: Dict[str, Any]):
+        """Request hook for APIClient: append the upstream request and its response
+
+        Requests made outside a tool call (e.g. a background replica sync) are not recorded:
+        replay could not attribute them to a call, and they would grow the recording unbounded.
+        """
+        seq = _call_seq.get()
+        if seq is None:
+            return
+        redact = self.pseudonymizer.redact
+        params = redact(record.get("params") or {})
+        response = record.get("response")
+        if response is None and record.get("raw_response") is not None:
+            response = json.loads(record["raw_response"])
+        self._write({
+            "type": "upstream",
+            "seq": seq,
+            "method": record["method"],
+            "endpoint": self.pseudonymizer.endpoint(record["endpoint"]),
+            "params": {k: v for k, v in params.items() if v is not None},
+            "status_code": record.get("status_code"),
+            "error": record.get("error"),
+            "cache": record.get("cache"),
+            "duration_ms": round(record["duration"] * 1000, 3),
+            "response": redact(response),
+        })
+        self.upstream += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {"path": self.path, "calls": self.calls, "upstream": self.upstream}
+
+
+class RecordingMiddleware(Middleware):
+    """Records every tools/call with the recorder"""
+
+    def __init__(self, recorder: TrafficRecorder):
+        self.recorder = recorder
+
+    async def on_call_tool(self, context, call_next):
+        call = self.recorder.start_call(context.message.name, context.message.arguments or {})
+        token = _call_seq.set(call["seq"])
+        started = time.perf_counter()
+        error = True
+        try:
+            result = await call_next(context)
+            error = bool(getattr(result, "isError", False))
+            return result
+        finally:
+            _call_seq.reset(token)
+            self.recorder.finish_call(call, time.perf_counter() - started, error)
+
+
+# Recorder installed by install_recording, if recording is enabled
+recorder: Optional[TrafficRecorder] = None
+
+
+def install_recording(mcp, client=None, traffic_recorder: Optional[TrafficRecorder] = None) -> Optional[TrafficRecorder]:
+    """Record tool calls and upstream traffic when RECORDING_ENABLED=true (or a recorder is given)"""
+    global recorder
+    if traffic_recorder is None and not recording_enabled():
+        return None
+    if client is None:
+        from models import api_client as client
+    if recorder is None or traffic_recorder is not None:
+        recorder = traffic_recorder or TrafficRecorder()
+    client.request_hooks[:] = [hook for hook in client.request_hooks if not isinstance(getattr(hook, "__self__", None), TrafficRecorder)]
+    client.request_hooks.append(recorder.record_request)
+    mcp.add_middleware(RecordingMiddleware(recorder))
+    return recorder
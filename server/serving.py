@@ -0,0 +1,64 @@
+import os
+from typing import Optional
+
+# Transports whose sessions can be served by any worker; SSE sessions are pinned to one process
+MULTI_WORKER_TRANSPORTS = ("http", "streamable-http")
+DEFAULT_HTTP_PATH = "/mcp"
+
+
+def worker_count() -> int:
+    """Worker processes from WORKERS ("auto" for one per CPU), default 1"""
+    value = os.getenv("WORKERS", "1").strip().lower()
+    if value == "auto":
+        return os.cpu_count() or 1
+    count = int(value)
+    if count < 1:
+        raise ValueError("WORKERS must be a positive integer or 'auto'")
+    return count
+
+
+def check_transport(transport: str, workers: int) -> None:
+    """Reject settings whose state would differ between worker processes"""
+    from tools.groups import on_demand_enabled
+
+    if workers > 1 and transport not in MULTI_WORKER_TRANSPORTS:
+        raise ValueError(
+            f"WORKERS={workers} requires a stateless transport ({', '.join(MULTI_WORKER_TRANSPORTS)}), "
+            f"not '{transport}': SSE sessions cannot be shared between worker processes"
+        )
+    if workers > 1 and on_demand_enabled():
+        raise ValueError(
+            f"WORKERS={workers} cannot be combined with TOOL_GROUPS_ON_DEMAND=true: load_tool_groups only "
+            "registers tools in the worker that handles the call; select groups with TOOL_GROUPS_ENABLED instead"
+        )
+
+
+def create_app():
+    """ASGI app for one worker process: the MCP server over stateless streamable HTTP
+
+    Stateless sessions keep no per-client state in the worker, so consecutive requests
+    from one client can be handled by any worker bound to the shared port.
+    """
+    from main import mcp
+
+    return mcp.http_app(path=os.getenv("MCP_HTTP_PATH", DEFAULT_HTTP_PATH), transport="http", stateless_http=True)
+
+
+def run_workers(port: int, host: Optional[str] = None, workers: Optional[int] = None) -> None:
+    """Serve create_app from a pool of worker processes sharing one listening socket
+
+    The uvicorn supervisor restarts crashed workers, restarts all workers one at a time
+    on SIGHUP (graceful reload) and waits up to GRACEFUL_SHUTDOWN_SECONDS for
+    in-flight requests when stopping.
+    """
+    import uvicorn
+
+    uvicorn.run(
+        "server.serving:create_app",
+        factory=True,
+        host=host or os.getenv("HOST", "127.0.0.1"),
+        port=port,
+        workers=workers or worker_count(),
+        timeout_graceful_shutdown=int(os.getenv("GRACEFUL_SHUTDOWN_SECONDS", "30")),
+        log_level=os.getenv("LOG_LEVEL", "info").lower(),
+    )
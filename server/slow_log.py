@@ -0,0 +1,210 @@
+import contextvars
+import hashlib
+import hmac
+import json
+import os
+import re
+import secrets
+import threading
+import time
+from typing import Optional, List, Dict, Any
+from fastmcp.server.middleware import Middleware
+
+DEFAULT_SLOW_LOG_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".cache", "slow_calls.ndjson"))
+DEFAULT_SLOW_LOG_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_THRESHOLD_MS = 1000.0
+# Argument names whose values identify a person, card or account
+SENSITIVE_ARGUMENT = re.compile(
+    r"card|cvv|cvc|expir|email|phone|name|address|street|zip|postal|ssn|birth|dob|passport|"
+    r"password|token|secret|account|customer_id|guest|traveler|passenger|notes|description",
+    re.IGNORECASE
+)
+# String values that are safe to keep: enum members, dates, small codes
+SAFE_VALUE = re.compile(r"^([A-Z][A-Z0-9_]{0,31}|\d{4}-\d{2}-\d{2}(T[\d:.]+Z?)?)$")
+
+_upstream_calls: contextvars.ContextVar = contextvars.ContextVar("slow_log_upstream_calls", default=None)
+
+
+def slow_log_enabled() -> bool:
+    return os.getenv("SLOW_LOG_ENABLED", "false").lower() == "true"
+
+
+def parse_thresholds(value: str) -> Dict[str, float]:
+    """'list_payments=500,search_travel_packages=3000' -> {tool: milliseconds}"""
+    thresholds = {}
+    for item in value.split(","):
+        if item.strip():
+            tool, _, ms = item.partition("=")
+            thresholds[tool.strip()] = float(ms)
+    return thresholds
+
+
+def redact(value: Any, key: str = "") -> Any:
+    """Argument values with anything that could identify a customer replaced by a type and size"""
+    if key and SENSITIVE_ARGUMENT.search(key):
+        return "<redacted>"
+    if isinstance(value, dict):
+        return {k: redact(v, k) for k, v in value.items()}
+    if isinstance(value, list):
+        return f"<list:{len(value)}>"
+    if isinstance(value, str):
+        return value if SAFE_VALUE.match(value) else f"<str:{len(value)}>"
+    return value
+
+
+class SlowCallLog:
+    """Writes one NDJSON entry per tool call slower than its threshold to a rotating file
+
+    Each entry has the tool name, its duration, the redacted arguments, two argument
+    fingerprints and the upstream requests made during the call with their timing,
+    response size and cache outcome. "shape" hashes the argument names and types, so
+    calls of the same kind group together; "fingerprint" is an HMAC of the full argument
+    values, so repeats of an identical call match without the values being recoverable.
+    Fingerprints are only comparable between processes sharing SLOW_LOG_FINGERPRINT_KEY.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        threshold_ms: Optional[float] = None,
+        tool_thresholds: Optional[Dict[str, float]] = None,
+        max_bytes: Optional[int] = None,
+        fingerprint_key: Optional[str] = None
+    ):
+        if threshold_ms is None:
+            threshold_ms = float(os.getenv("SLOW_LOG_THRESHOLD_MS", str(DEFAULT_THRESHOLD_MS)))
+        if tool_thresholds is None:
+            tool_thresholds = parse_thresholds(os.getenv("SLOW_LOG_TOOL_THRESHOLDS", ""))
+        if max_bytes is None:
+            max_bytes = int(os.getenv("SLOW_LOG_MAX_BYTES", str(DEFAULT_SLOW_LOG_MAX_BYTES)))
+        fingerprint_key = fingerprint_key or os.getenv("SLOW_LOG_FINGERPRINT_KEY") or secrets.token_hex(16)
+        self.path = path or os.getenv("SLOW_LOG_FILE", DEFAULT_SLOW_LOG_FILE)
+        self.threshold_ms = threshold_ms
+        self.tool_thresholds = tool_thresholds
+        self.max_bytes = max_bytes
+        self._key = fingerprint_key.encode()
+        self._lock = threading.Lock()
+        self.logged = 0
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+    def threshold_for(self, tool_name: str) -> float:
+        return self.tool_thresholds.get(tool_name, self.threshold_ms)
+
+    def fingerprints(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, str]:
+        shape = json.dumps([tool_name, sorted((k, type(v).__name__) for k, v in arguments.items())])
+        values = json.dumps([tool_name, arguments], sort_keys=True, separators=(",", ":"), default=str)
+        return {
+            "shape": hashlib.sha256(shape.encode()).hexdigest()[:16],
+            "fingerprint": hmac.new(self._key, values.encode(), hashlib.sha256).hexdigest()[:16],
+        }
+
+    def record_request(self, record: Dict[str, Any]):
+        """Request hook for APIClient: remember upstream requests made by the running tool call"""
+        calls = _upstream_calls.get()
+        if calls is not None:
+            calls.append(record)
+
+    def entry(self, tool_name: str, arguments: Dict[str, Any], seconds: float, calls: List[Dict[str, Any]],
+              result_bytes: Optional[int], error: Optional[str]) -> Dict[str, Any]:
+        from .metrics import path_template
+        from .tracing import Tracer
+
+        upstream = [{
+            "method": call["method"],
+            "path": path_template(call["endpoint"]),
+            "status_code": call.get("status_code"),
+            "duration_ms": round(call["duration"] * 1000, 3),
+            "pool_wait_ms": round(call["pool_wait"] * 1000, 3) if call.get("pool_wait") is not None else None,
+            "response_bytes": call.get("response_bytes"),
+            "cache": call.get("cache"),
+            "error": call.get("error") is not None,
+        } for call in calls]
+        span = Tracer.current_span()
+        return {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "tool": tool_name,
+            "duration_ms": round(seconds * 1000, 3),
+            "threshold_ms": self.threshold_for(tool_name),
+            **self.fingerprints(tool_name, arguments),
+            "arguments": redact(arguments),
+            "result_bytes": result_bytes,
+            "error": error,
+            "upstream_ms": round(sum(call["duration_ms"] for call in upstream), 3),
+            "upstream": upstream,
+            "trace_id": span.trace_id if span is not None else None,
+        }
+
+    def write(self, entry: Dict[str, Any]):
+        line = json.dumps(entry, default=str) + "\n"
+        with self._lock:
+            try:
+                if os.path.getsize(self.path) + len(line) > self.max_bytes:
+                    os.replace(self.path, f"{self.path}.1")
+            except OSError:
+                pass
+            with open(self.path, "a") as f:
+                f.write(line)
+            self.logged += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "threshold_ms": self.threshold_ms,
+            "tool_thresholds": self.tool_thresholds,
+            "logged": self.logged,
+        }
+
+
+def _result_bytes(result) -> Optional[int]:
+    content = getattr(result, "content", None)
+    if content is None:
+        return None
+    return sum(len(getattr(block, "text", "") or "") for block in content)
+
+
+class SlowCallMiddleware(Middleware):
+    """Collects the upstream requests of every tools/call and logs the call if it was slow"""
+
+    def __init__(self, log: SlowCallLog):
+        self.log = log
+
+    async def on_call_tool(self, context, call_next):
+        calls: List[Dict[str, Any]] = []
+        token = _upstream_calls.set(calls)
+        started = time.perf_counter()
+        result, error = None, None
+        try:
+            result = await call_next(context)
+            return result
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            seconds = time.perf_counter() - started
+            _upstream_calls.reset(token)
+            name = context.message.name
+            if seconds * 1000 >= self.log.threshold_for(name):
+                try:
+                    self.log.write(self.log.entry(name, context.message.arguments or {}, seconds, calls, _result_bytes(result), error))
+                except Exception:
+                    # The slow log must never fail the call it describes
+                    pass
+
+
+# Slow call log installed by install_slow_log, if enabled
+slow_log: Optional[SlowCallLog] = None
+
+
+def install_slow_log(mcp, client=None, log: Optional[SlowCallLog] = None) -> Optional[SlowCallLog]:
+    """Log slow tool calls on a server when SLOW_LOG_ENABLED=true (or a log is given)"""
+    global slow_log
+    if log is None and not slow_log_enabled():
+        return None
+    if client is None:
+        from models import api_client as client
+    if slow_log is None or log is not None:
+        slow_log = log or SlowCallLog()
+    client.request_hooks[:] = [hook for hook in client.request_hooks if not isinstance(getattr(hook, "__self__", None), SlowCallLog)]
+    client.request_hooks.append(slow_log.record_request)
+    mcp.add_middleware(SlowCallMiddleware(slow_log))
+    return slow_log
@@ -0,0 +1,108 @@
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from typing import List, Dict, Any, Optional
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+READY_MARKER = "STARTUP_READY "
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+# Code run in the profiled child process: import the server, then report readiness
+CHILD_CODE = "import main; from server.startup import emit_ready_report; emit_ready_report(main.mcp)"
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """Parse `python -X importtime` output into one record per imported module"""
+    modules = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            modules.append({
+                "module": module,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+                "depth": len(indent) // 2,
+            })
+    return modules
+
+
+def summarize_imports(modules: List[Dict[str, Any]], top: int = 15) -> Dict[str, Any]:
+    """Slowest modules and self time per top-level package"""
+    by_package: Dict[str, int] = {}
+    for record in modules:
+        package = record["module"].split(".")[0]
+        by_package[package] = by_package.get(package, 0) + record["self_us"]
+    return {
+        "module_count": len(modules),
+        "total_ms": round(sum(r["self_us"] for r in modules) / 1000, 1),
+        "slowest_modules": [
+            {"module": r["module"], "cumulative_ms": round(r["cumulative_us"] / 1000, 1), "self_ms": round(r["self_us"] / 1000, 1)}
+            for r in sorted(modules, key=lambda r: -r["cumulative_us"])[:top]
+        ],
+        "packages_ms": {
+            package: round(us / 1000, 1)
+            for package, us in sorted(by_package.items(), key=lambda item: -item[1])[:top]
+        },
+    }
+
+
+def emit_ready_report(mcp) -> None:
+    """Print registration timings and the ready timestamp for the profiling parent"""
+    import asyncio
+    import tools as tools_package
+    from tools import registration_timings
+
+    tools = asyncio.run(mcp.get_tools())
+    report = {
+        "ready_at": time.time(),
+        "tool_count": len(tools),
+        "tool_groups": tools_package.tool_group_loader.loaded if tools_package.tool_group_loader else [],
+        "registration_ms": {group: round(seconds * 1000, 2) for group, seconds in registration_timings.items()},
+    }
+    print(READY_MARKER + json.dumps(report), flush=True)
+
+
+def profile_startup(top: int = 15, env: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Cold-start the server module in a child interpreter and profile it
+
+    Reports per-module import time (from -X importtime), the cost of each
+    register_*_tools call and total time from spawning the child to tools being ready.
+    """
+    spawned_at = time.time()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD_CODE],
+        cwd=ROOT, env=env or os.environ.copy(), capture_output=True, text=True, check=True
+    )
+    ready_line = next(line for line in result.stdout.splitlines() if line.startswith(READY_MARKER))
+    ready = json.loads(ready_line[len(READY_MARKER):])
+    registration = ready["registration_ms"]
+    return {
+        "time_to_ready_ms": round((ready["ready_at"] - spawned_at) * 1000, 1),
+        "tool_count": ready["tool_count"],
+        "registration_total_ms": round(sum(registration.values()), 1),
+        "registration_ms": registration,
+        "imports": summarize_imports(parse_importtime(result.stderr), top=top),
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [
+        f"Time to ready:        {report['time_to_ready_ms']:.1f}ms ({report['tool_count']} tools)",
+        f"Imports:              {report['imports']['total_ms']:.1f}ms across {report['imports']['module_count']} modules",
+        f"Tool registration:    {report['registration_total_ms']:.1f}ms",
+        "",
+        "Registration by tool group:",
+    ]
+    for group, ms in sorted(report["registration_ms"].items(), key=lambda item: -item[1]):
+        lines.append(f"  {group:<24} {ms:>8.1f}ms")
+    lines += ["", "Import self time by package:"]
+    for package, ms in report["imports"]["packages_ms"].items():
+        lines.append(f"  {package:<24} {ms:>8.1f}ms")
+    lines += ["", "Slowest imports (cumulative):"]
+    for record in report["imports"]["slowest_modules"]:
+        lines.append(f"  {record['module']:<48} {record['cumulative_ms']:>8.1f}ms")
+    return "\n".join(lines)
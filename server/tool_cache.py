@@ -0,0 +1,168 @@
+import hashlib
+import inspect
+import json
+import os
+import sys
+from typing import Optional, Dict, Any
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MANIFEST_FORMAT = 1
+# Tool signatures are built from these packages, so any change in them invalidates the cache
+SOURCE_DIRS = ("models", "tools", "services")
+DEFAULT_MANIFEST_PATH = os.path.join(ROOT, ".cache", "tool_manifest.json")
+_MISSING = object()
+
+
+def schema_cache_enabled() -> bool:
+    return os.getenv("TOOL_SCHEMA_CACHE_ENABLED", "true").lower() == "true"
+
+
+def source_hash() -> str:
+    """Hash of the tool/model sources and the library versions that shape tool schemas"""
+    import fastmcp
+    import pydantic
+
+    digest = hashlib.sha256()
+    digest.update(f"{MANIFEST_FORMAT}|{fastmcp.__version__}|{pydantic.VERSION}|{sys.version_info[:2]}".encode("utf-8"))
+    for directory in SOURCE_DIRS:
+        base = os.path.join(ROOT, directory)
+        for dirpath, dirnames, filenames in os.walk(base):
+            dirnames[:] = sorted(d for d in dirnames if d != "__pycache__")
+            for filename in sorted(filenames):
+                if filename.endswith(".py"):
+                    path = os.path.join(dirpath, filename)
+                    digest.update(os.path.relpath(path, ROOT).encode("utf-8"))
+                    with open(path, "rb") as f:
+                        digest.update(f.read())
+    return digest.hexdigest()
+
+
+class ToolManifest:
+    """Versioned on-disk record of every tool's name, description, schemas, tags and meta
+
+    Entries are only trusted when the stored source hash matches the current one.
+    """
+
+    def __init__(self, path: Optional[str] = None, current_hash: Optional[str] = None):
+        self.path = path or os.getenv("TOOL_SCHEMA_CACHE_PATH", DEFAULT_MANIFEST_PATH)
+        self.source_hash = current_hash or source_hash()
+        self.tools: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.fallbacks = 0
+        self.dirty = False
+        self.loaded = self._load()
+
+    def _load(self) -> bool:
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get("format") != MANIFEST_FORMAT or data.get("source_hash") != self.source_hash:
+            return False
+        self.tools = data.get("tools", {})
+        return True
+
+    def lookup(self, name: str) -> Optional[Dict[str, Any]]:
+        entry = self.tools.get(name)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def record(self, tool) -> None:
+        self.tools[tool.name] = {
+            "description": tool.description,
+            "parameters": tool.parameters,
+            "output_schema": tool.output_schema,
+            "tags": sorted(tool.tags),
+            "meta": tool.meta,
+        }
+        self.dirty = True
+
+    def save(self) -> bool:
+        """Write the manifest atomically; a read-only checkout just skips caching"""
+        if not self.dirty:
+            return False
+        data = {"format": MANIFEST_FORMAT, "source_hash": self.source_hash, "tools": self.tools}
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(temporary, "w") as f:
+                json.dump(data, f, sort_keys=True)
+            os.replace(temporary, self.path)
+        except OSError:
+            return False
+        self.dirty = False
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {"path": self.path, "loaded": self.loaded, "hits": self.hits, "misses": self.misses, "fallbacks": self.fallbacks}
+
+
+class CachingToolRegistrar:
+    """Stand-in for a FastMCP instance inside register_*_tools
+
+    @registrar.tool(...) builds the FunctionTool from cached schemas when the manifest
+    has the tool, skipping signature parsing and JSON schema generation; otherwise it
+    defers to FastMCP.tool and records the generated schemas. Argument validation
+    still uses the function signature, built lazily on the tool's first call.
+
+    Building the tool directly relies on FunctionTool's constructor and FastMCP's
+    private _tool_serializer (fastmcp 2.12); when either is not what this code expects
+    the tool is registered through FastMCP.tool instead and counted in fallbacks.
+    """
+
+    def __init__(self, mcp, manifest: ToolManifest):
+        self.mcp = mcp
+        self.manifest = manifest
+
+    def __getattr__(self, name):
+        return getattr(self.mcp, name)
+
+    def tool(self, name_or_fn=None, **kwargs):
+        if callable(name_or_fn):
+            return self._register(name_or_fn, **kwargs)
+        if isinstance(name_or_fn, str):
+            kwargs["name"] = name_or_fn
+        return lambda fn: self._register(fn, **kwargs)
+
+    def _generate(self, fn, **kwargs):
+        tool = self.mcp.tool(fn, **kwargs)
+        self.manifest.record(tool)
+        return tool
+
+    def _register(self, fn, **kwargs):
+        from fastmcp.tools.tool import FunctionTool
+
+        name = kwargs.get("name") or fn.__name__
+        entry = self.manifest.lookup(name)
+        # Tools with custom schema handling always go through FastMCP's own parsing
+        if entry is None or kwargs.get("exclude_args") or "output_schema" in kwargs:
+            return self._generate(fn, **kwargs)
+
+        serializer = getattr(self.mcp, "_tool_serializer", _MISSING)
+        enabled = kwargs.get("enabled")
+        try:
+            if serializer is _MISSING:
+                raise AttributeError("FastMCP has no _tool_serializer")
+            tool = FunctionTool(
+                fn=fn,
+                name=name,
+                title=kwargs.get("title"),
+                description=kwargs.get("description") or inspect.getdoc(fn),
+                parameters=entry["parameters"],
+                output_schema=entry["output_schema"],
+                annotations=kwargs.get("annotations"),
+                tags=kwargs.get("tags") or set(),
+                serializer=serializer,
+                meta=kwargs.get("meta"),
+                enabled=enabled if enabled is not None else True,
+            )
+        except (AttributeError, TypeError, ValueError):
+            self.manifest.fallbacks += 1
+            return self._generate(fn, **kwargs)
+        self.mcp.add_tool(tool)
+        return tool
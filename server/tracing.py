@@ -0,0 +1,249 @@
+import contextvars
+import json
+import os
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Any
+from fastmcp.server.middleware import Middleware
+
+DEFAULT_TRACE_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".cache", "traces.ndjson"))
+DEFAULT_TRACE_FILE_MAX_BYTES = 10 * 1024 * 1024
+STATUS_UNSET, STATUS_OK, STATUS_ERROR = 0, 1, 2
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+
+def tracing_enabled() -> bool:
+    return os.getenv("TRACING_ENABLED", "false").lower() == "true"
+
+
+class Span:
+    """One timed operation, identified like an OpenTelemetry span (W3C trace and span IDs)"""
+
+    __slots__ = ("trace_id", "span_id", "parent_span_id", "name", "start_ns", "end_ns", "attributes", "status", "status_message", "child_intervals")
+
+    def __init__(self, name: str, parent: Optional["Span"] = None, attributes: Optional[Dict[str, Any]] = None, start_ns: Optional[int] = None):
+        self.trace_id = parent.trace_id if parent else f"{random.getrandbits(128):032x}"
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_span_id = parent.span_id if parent else None
+        self.name = name
+        self.start_ns = start_ns if start_ns is not None else time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = dict(attributes or {})
+        self.status = STATUS_UNSET
+        self.status_message: Optional[str] = None
+        self.child_intervals: List[tuple] = []
+
+    def child_ns(self) -> int:
+        """Nanoseconds within this span covered by at least one finished child; concurrent children count once"""
+        covered, reached = 0, self.start_ns
+        for start, end in sorted(self.child_intervals):
+            start, end = max(start, reached), min(end, self.end_ns if self.end_ns is not None else end)
+            if end > start:
+                covered += end - start
+                reached = end
+        return covered
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def set_error(self, message: str):
+        self.status = STATUS_ERROR
+        self.status_message = message
+
+    @property
+    def traceparent(self) -> str:
+        """W3C trace context header value, so upstream services can join the trace"""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """The span in OTLP/JSON field layout"""
+        status = {"code": self.status}
+        if self.status_message:
+            status["message"] = self.status_message
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 3 if self.name.startswith("HTTP") else 2,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in self.attributes.items() if value is not None],
+            "status": status,
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class ConsoleSpanExporter:
+    """Writes one OTLP/JSON span per line to a stream (stderr by default)"""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stderr
+
+    def export(self, span: Span):
+        self.stream.write(json.dumps(span.to_otlp()) + "\n")
+        self.stream.flush()
+
+
+class FileSpanExporter:
+    """Appends one OTLP/JSON span per line to a file, rotating it to <path>.1 past max_bytes"""
+
+    def __init__(self, path: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.path = path or os.getenv("TRACING_FILE", DEFAULT_TRACE_FILE)
+        self.max_bytes = max_bytes if max_bytes is not None else int(os.getenv("TRACING_FILE_MAX_BYTES", str(DEFAULT_TRACE_FILE_MAX_BYTES)))
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+    def export(self, span: Span):
+        line = json.dumps(span.to_otlp()) + "\n"
+        with self._lock:
+            try:
+                if os.path.getsize(self.path) + len(line) > self.max_bytes:
+                    os.replace(self.path, f"{self.path}.1")
+            except OSError:
+                pass
+            with open(self.path, "a") as f:
+                f.write(line)
+
+
+class InMemorySpanExporter:
+    """Keeps finished spans in a list, for tests and the benchmarks"""
+
+    def __init__(self):
+        self.spans: List[Span] = []
+
+    def export(self, span: Span):
+        self.spans.append(span)
+
+
+EXPORTERS = {"console": ConsoleSpanExporter, "file": FileSpanExporter, "memory": InMemorySpanExporter}
+
+
+class Tracer:
+    """Creates spans for tool calls and their upstream requests and hands finished spans to an exporter
+
+    A trace starts at each tools/call (sampled at sample_rate); upstream requests made
+    while the tool runs become its child spans. Nothing is recorded outside a trace.
+    """
+
+    def __init__(self, exporter=None, sample_rate: Optional[float] = None):
+        if exporter is None:
+            exporter = EXPORTERS[os.getenv("TRACING_EXPORTER", "file").lower()]()
+        if sample_rate is None:
+            sample_rate = float(os.getenv("TRACING_SAMPLE_RATE", "1.0"))
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    @staticmethod
+    def current_span() -> Optional[Span]:
+        return _current_span.get()
+
+    @contextmanager
+    def start_span(self, name: str, attributes: Optional[Dict[str, Any]] = None):
+        """Run a block inside a new span (a root span only if sampled); yields None when not traced"""
+        parent = _current_span.get()
+        if parent is None and random.random() >= self.sample_rate:
+            yield None
+            return
+        span = Span(name, parent, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except Exception as e:
+            span.set_error(str(e))
+            raise
+        finally:
+            _current_span.reset(token)
+            self._finish(span, parent)
+
+    def _finish(self, span: Span, parent: Optional[Span], end_ns: Optional[int] = None):
+        span.end_ns = end_ns if end_ns is not None else time.time_ns()
+        if parent is not None:
+            parent.child_intervals.append((span.start_ns, span.end_ns))
+        if span.name.startswith("tools/call"):
+            # Time the tool spent outside its upstream requests (validation, local work, serialization)
+            upstream_ns = span.child_ns()
+            span.set_attribute("mcp.tool.upstream_ms", round(upstream_ns / 1e6, 3))
+            span.set_attribute("mcp.tool.local_ms", round((span.end_ns - span.start_ns - upstream_ns) / 1e6, 3))
+        try:
+            self.exporter.export(span)
+        except Exception:
+            # Exporting must never fail the traced call
+            pass
+
+    def record_request(self, record: Dict[str, Any]):
+        """Request hook for APIClient: a child span for a finished upstream request or cache hit"""
+        parent = _current_span.get()
+        if parent is None:
+            return
+        from .metrics import path_template
+
+        template = path_template(record["endpoint"])
+        span = Span(f"HTTP {record['method']} {template}", parent, {
+            "http.request.method": record["method"],
+            "url.path": record["endpoint"],
+            "url.template": template,
+            "http.response.status_code": record.get("status_code"),
+            "http.client.pool_wait_ms": round(record["pool_wait"] * 1000, 3) if record.get("pool_wait") is not None else None,
+            "cache.hit": record.get("cache") == "hit" if record.get("cache") else None,
+        }, start_ns=record["start_ns"])
+        if record.get("error"):
+            span.set_error(record["error"])
+        self._finish(span, parent, end_ns=record["start_ns"] + int(record["duration"] * 1e9))
+
+    def traceparent_header(self) -> Dict[str, str]:
+        """Header hook for APIClient: propagate the current trace to the backend"""
+        span = _current_span.get()
+        return {"traceparent": span.traceparent} if span is not None else {}
+
+
+class TracingMiddleware(Middleware):
+    """Wraps every tools/call in a root span"""
+
+    def __init__(self, tracer: Tracer):
+        self.tracer = tracer
+
+    async def on_call_tool(self, context, call_next):
+        name = context.message.name
+        with self.tracer.start_span(f"tools/call {name}", {"mcp.method.name": "tools/call", "mcp.tool.name": name}) as span:
+            result = await call_next(context)
+            if span is not None and getattr(result, "isError", False):
+                span.set_error("tool returned an error result")
+            return result
+
+
+# Tracer installed by install_tracing, if tracing is enabled
+tracer: Optional[Tracer] = None
+
+
+def install_tracing(mcp, client=None, exporter=None) -> Optional[Tracer]:
+    """Trace tool calls on a server and the upstream requests of client (default: api_client)"""
+    global tracer
+    if exporter is None and not tracing_enabled():
+        return None
+    if client is None:
+        from models import api_client as client
+    if tracer is None or exporter is not None:
+        tracer = Tracer(exporter)
+    # Replace hooks left by a previous tracer so each request is traced once
+    client.request_hooks[:] = [hook for hook in client.request_hooks if not isinstance(getattr(hook, "__self__", None), Tracer)]
+    client.header_hooks[:] = [hook for hook in client.header_hooks if not isinstance(getattr(hook, "__self__", None), Tracer)]
+    client.request_hooks.append(tracer.record_request)
+    client.header_hooks.append(tracer.traceparent_header)
+    mcp.add_middleware(TracingMiddleware(tracer))
+    return tracer
@@ -0,0 +1,2 @@
+# In-process engines that back the composite MCP tools.
+# Each service talks to the bus payments API through models.api_client.
@@ -0,0 +1,221 @@
+import asyncio
+import hashlib
+import json
+import math
+import os
+import time
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any
+from .offer_index import OfferIndex, offer_index, enum_value
+from .pagination import fetch_all_pages
+
+
+def offer_fingerprint(offer: Dict[str, Any]) -> str:
+    """Stable content hash of an offer as returned by the API"""
+    encoded = json.dumps(offer, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class OfferCatalogReplica:
+    """Local replica of the /api/offers catalog kept current by periodic page scans
+
+    Every scan reads all catalog pages and compares a content hash per offer, so only
+    added or changed offers are pushed into the offer index and removed offers are
+    dropped from it. Merchant offer listings (/api/merchants/{id}/offers) are a subset
+    of the catalog and are answered from the same replica by filtering on merchant_id.
+    Until the first scan completes list_offers returns None and callers go upstream.
+    """
+
+    def __init__(
+        self,
+        index: OfferIndex = offer_index,
+        enabled: Optional[bool] = None,
+        sync_interval: Optional[float] = None,
+        max_lag: Optional[float] = None
+    ):
+        if enabled is None:
+            enabled = os.getenv("OFFER_REPLICA_ENABLED", "false").lower() == "true"
+        if sync_interval is None:
+            sync_interval = float(os.getenv("OFFER_REPLICA_SYNC_SECONDS", "60"))
+        if max_lag is None:
+            max_lag = float(os.getenv("OFFER_REPLICA_MAX_LAG_SECONDS", str(sync_interval * 3)))
+        self.index = index
+        self.enabled = enabled
+        self.sync_interval = sync_interval
+        self.max_lag = max_lag
+        self._offers: Dict[Any, Dict[str, Any]] = {}
+        self._hashes: Dict[Any, str] = {}
+        self._sync_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._first_sync: Optional[asyncio.Task] = None
+        self._first_sync_started: Optional[float] = None
+        self.last_sync_at: Optional[float] = None
+        self.last_sync_duration: Optional[float] = None
+        self.last_changes = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        self.sync_count = 0
+        self.error_count = 0
+        self.last_error: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self._offers)
+
+    def apply_scan(self, offers: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Diff a full catalog scan against the replica and re-index only what changed"""
+        changes = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        scanned: Dict[Any, Dict[str, Any]] = {}
+        for offer in offers:
+            offer_id = offer.get("id")
+            fingerprint = offer_fingerprint(offer)
+            previous = self._hashes.get(offer_id)
+            if previous == fingerprint:
+                changes["unchanged"] += 1
+                scanned[offer_id] = self._offers[offer_id]
+                continue
+            changes["updated" if previous else "added"] += 1
+            self._hashes[offer_id] = fingerprint
+            self.index.upsert(offer)
+            scanned[offer_id] = offer
+
+        for offer_id in set(self._offers) - set(scanned):
+            changes["removed"] += 1
+            self._hashes.pop(offer_id, None)
+            self.index.remove(offer_id)
+
+        # Keep the scan order so local pages line up with upstream pages
+        self._offers = scanned
+        self.index.built_at = time.time()
+        return changes
+
+    async def sync(self) -> Dict[str, int]:
+        """Scan the catalog once and apply the differences"""
+        async with self._sync_lock:
+            started = time.perf_counter()
+            try:
+                offers = await fetch_all_pages("/api/offers", "offers")
+            except Exception as e:
+                self.error_count += 1
+                self.last_error = str(e)
+                raise
+            self.last_changes = self.apply_scan(offers)
+            self.last_sync_duration = time.perf_counter() - started
+            self.last_sync_at = time.time()
+            self.sync_count += 1
+            self.last_error = None
+            return self.last_changes
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await self.sync()
+            except Exception:
+                # Recorded in error_count/last_error; keep serving the last good scan
+                pass
+
+    def _warm_up(self):
+        """Start the first scan in the background, retrying a failed one after sync_interval"""
+        if self._first_sync is not None:
+            if not self._first_sync.done():
+                return
+            if time.time() - self._first_sync_started < self.sync_interval:
+                return
+        self._first_sync_started = time.time()
+        self._first_sync = asyncio.create_task(self.ensure_started())
+        # Failures are recorded in error_count/last_error by sync()
+        self._first_sync.add_done_callback(lambda task: task.cancelled() or task.exception())
+
+    async def ensure_started(self):
+        """Run the first scan if needed and start the background sync loop"""
+        if self.last_sync_at is None:
+            first_sync = self._first_sync
+            if first_sync is not None and not first_sync.done() and first_sync is not asyncio.current_task():
+                await asyncio.shield(first_sync)
+            else:
+                await self.sync()
+        if self.sync_interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._first_sync is not None and not self._first_sync.done():
+            self._first_sync.cancel()
+        self._first_sync = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def lag_seconds(self) -> Optional[float]:
+        if self.last_sync_at is None:
+            return None
+        return time.time() - self.last_sync_at
+
+    def is_fresh(self) -> bool:
+        lag = self.lag_seconds()
+        return lag is not None and lag <= self.max_lag
+
+    def query(
+        self,
+        category: Optional[Any] = None,
+        merchant_id: Optional[int] = None,
+        is_active: Optional[bool] = None
+    ) -> List[Dict[str, Any]]:
+        """Filter the replica the way /api/offers filters the catalog"""
+        category_value = enum_value(category)
+        return [
+            offer for offer in self._offers.values()
+            if (category_value is None or enum_value(offer.get("category")) == category_value)
+            and (merchant_id is None or offer.get("merchant_id") == merchant_id)
+            and (is_active is None or offer.get("is_active") == is_active)
+        ]
+
+    async def list_offers(
+        self,
+        page: int = 1,
+        per_page: int = 10,
+        category: Optional[Any] = None,
+        merchant_id: Optional[int] = None,
+        is_active: Optional[bool] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Serve a list_offers page from the replica, or None when it is warming up or too stale"""
+        if not self.enabled:
+            return None
+        if self.last_sync_at is None:
+            self._warm_up()
+            return None
+        if not self.is_fresh():
+            return None
+        offers = self.query(category=category, merchant_id=merchant_id, is_active=is_active)
+        per_page = max(1, per_page)
+        start = (max(1, page) - 1) * per_page
+        return {
+            "offers": offers[start:start + per_page],
+            "total": len(offers),
+            "pages": max(1, math.ceil(len(offers) / per_page)),
+            "current_page": page,
+            "per_page": per_page,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        lag = self.lag_seconds()
+        return {
+            "enabled": self.enabled,
+            "offers": len(self._offers),
+            "sync_interval_seconds": self.sync_interval,
+            "max_lag_seconds": self.max_lag,
+            "last_sync_at": datetime.fromtimestamp(self.last_sync_at, timezone.utc).isoformat() if self.last_sync_at else None,
+            "lag_seconds": round(lag, 3) if lag is not None else None,
+            "fresh": self.is_fresh(),
+            "last_sync_duration_ms": round(self.last_sync_duration * 1000, 2) if self.last_sync_duration is not None else None,
+            "last_changes": self.last_changes,
+            "sync_count": self.sync_count,
+            "error_count": self.error_count,
+            "last_error": self.last_error,
+            "background_sync_running": self._task is not None and not self._task.done(),
+        }
+
+
+# Global offer catalog replica instance
+offer_catalog = OfferCatalogReplica()
@@ -0,0 +1,370 @@
+import asyncio
+import os
+import time
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any, Iterable
+from models import MerchantCategory, OfferCategory
+from .pagination import fetch_all_pages
+
+# Offer categories that apply to purchases in a merchant category when the offer
+# is not tied to a specific merchant or merchant category
+MERCHANT_TO_OFFER_CATEGORY = {
+    MerchantCategory.RESTAURANT: OfferCategory.DINING,
+    MerchantCategory.RETAIL_STORE: OfferCategory.SHOPPING,
+    MerchantCategory.GAS_STATION: OfferCategory.FUEL,
+    MerchantCategory.AIRLINE: OfferCategory.TRAVEL,
+    MerchantCategory.HOTEL: OfferCategory.TRAVEL,
+    MerchantCategory.E_COMMERCE: OfferCategory.SHOPPING,
+    MerchantCategory.GROCERY_STORE: OfferCategory.GROCERY,
+    MerchantCategory.PHARMACY: OfferCategory.HEALTH_WELLNESS,
+    MerchantCategory.ENTERTAINMENT_VENUE: OfferCategory.ENTERTAINMENT,
+    MerchantCategory.HEALTHCARE_PROVIDER: OfferCategory.HEALTH_WELLNESS,
+    MerchantCategory.TELECOM_PROVIDER: OfferCategory.TELECOMMUNICATIONS,
+    MerchantCategory.UTILITY_COMPANY: OfferCategory.UTILITIES,
+    MerchantCategory.INSURANCE_COMPANY: OfferCategory.INSURANCE,
+    MerchantCategory.EDUCATIONAL_INSTITUTION: OfferCategory.EDUCATION,
+    MerchantCategory.AUTOMOTIVE_SERVICE: OfferCategory.AUTOMOTIVE,
+    MerchantCategory.HOME_IMPROVEMENT: OfferCategory.HOME_GARDEN,
+    MerchantCategory.FASHION_RETAILER: OfferCategory.FASHION,
+    MerchantCategory.ELECTRONICS_STORE: OfferCategory.ELECTRONICS,
+    MerchantCategory.SUBSCRIPTION_SERVICE: OfferCategory.SUBSCRIPTION,
+    MerchantCategory.FINANCIAL_SERVICE: OfferCategory.FINANCE,
+    MerchantCategory.FITNESS_CENTER: OfferCategory.SPORTS_FITNESS,
+}
+
+# Untargeted offers in these categories apply to every purchase
+UNIVERSAL_OFFER_CATEGORIES = (OfferCategory.CASHBACK.value,)
+
+
+def enum_value(value: Any) -> Optional[str]:
+    """Normalize an enum member or raw string to its string value"""
+    if value is None:
+        return None
+    return value.value if hasattr(value, "value") else str(value)
+
+
+def _timestamp(value: Any) -> Optional[float]:
+    """Convert an ISO string or datetime to epoch seconds (naive values are UTC)"""
+    if value is None or value == "":
+        return None
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class IndexedOffer:
+    """Offer fields needed for matching, pre-parsed once at index time"""
+    __slots__ = (
+        "offer", "id", "is_active", "min_amount", "start_ts", "expiry_ts",
+        "discount_percentage", "max_discount_amount", "reward_points", "max_usage_per_customer"
+    )
+
+    def __init__(self, offer: Dict[str, Any]):
+        self.offer = offer
+        self.id = offer.get("id")
+        self.is_active = offer.get("is_active", True) is not False
+        self.min_amount = float(offer.get("min_transaction_amount") or 0.0)
+        self.start_ts = _timestamp(offer.get("start_date"))
+        self.expiry_ts = _timestamp(offer.get("expiry_date"))
+        self.discount_percentage = float(offer.get("discount_percentage") or 0.0)
+        max_discount = offer.get("max_discount_amount")
+        self.max_discount_amount = float(max_discount) if max_discount is not None else None
+        self.reward_points = int(offer.get("reward_points") or 0)
+        self.max_usage_per_customer = offer.get("max_usage_per_customer")
+
+    def is_valid_at(self, now: float) -> bool:
+        """Whether now falls inside the offer's [start_date, expiry_date] window"""
+        if self.start_ts is not None and now < self.start_ts:
+            return False
+        if self.expiry_ts is not None and now > self.expiry_ts:
+            return False
+        return True
+
+    def discount_for(self, amount: float) -> float:
+        """Discount earned on amount, capped at max_discount_amount"""
+        discount = amount * self.discount_percentage / 100.0
+        if self.max_discount_amount is not None:
+            discount = min(discount, self.max_discount_amount)
+        return round(discount, 2)
+
+
+class _ThresholdBucket:
+    """Offers sorted by minimum transaction amount so a purchase amount selects a prefix"""
+    __slots__ = ("thresholds", "entries")
+
+    def __init__(self):
+        self.thresholds: List[float] = []
+        self.entries: List[IndexedOffer] = []
+
+    def add(self, entry: IndexedOffer):
+        position = bisect_right(self.thresholds, entry.min_amount)
+        self.thresholds.insert(position, entry.min_amount)
+        self.entries.insert(position, entry)
+
+    def remove(self, entry: IndexedOffer):
+        position = self.entries.index(entry)
+        del self.thresholds[position]
+        del self.entries[position]
+
+    def qualifying(self, amount: float) -> List[IndexedOffer]:
+        return self.entries[:bisect_right(self.thresholds, amount)]
+
+
+class _ValidityTimeline:
+    """Sorted start and expiry boundaries of every indexed offer
+
+    Between two consecutive boundaries (and at each boundary itself) the set of offers
+    inside their validity window cannot change, so valid_ids computes that set once
+    per interval and answers later lookups in the same interval from it.
+    """
+
+    def __init__(self):
+        self._boundaries: List[float] = []
+        self._valid: Optional[tuple] = None
+
+    def add(self, entry: IndexedOffer):
+        for boundary in (entry.start_ts, entry.expiry_ts):
+            if boundary is not None:
+                insort(self._boundaries, boundary)
+        self._valid = None
+
+    def remove(self, entry: IndexedOffer):
+        for boundary in (entry.start_ts, entry.expiry_ts):
+            if boundary is not None:
+                position = bisect_left(self._boundaries, boundary)
+                if position < len(self._boundaries) and self._boundaries[position] == boundary:
+                    del self._boundaries[position]
+        self._valid = None
+
+    def interval(self, now: float) -> tuple:
+        """Key of the interval holding now; equal keys mean equal sets of valid offers"""
+        return bisect_left(self._boundaries, now), bisect_right(self._boundaries, now)
+
+    def valid_ids(self, entries: Iterable[IndexedOffer], now: float) -> frozenset:
+        key = self.interval(now)
+        if self._valid is None or self._valid[0] != key:
+            self._valid = (key, frozenset(entry.id for entry in entries if entry.is_valid_at(now)))
+        return self._valid[1]
+
+    def next_change(self, now: float) -> Optional[float]:
+        position = bisect_right(self._boundaries, now)
+        return self._boundaries[position] if position < len(self._boundaries) else None
+
+
+class OfferIndex:
+    """In-process index of the offer catalog for local eligibility matching
+
+    Offers are bucketed by their most specific target (merchant ID, merchant name,
+    merchant category, or offer category) and, inside each bucket, sorted by minimum
+    transaction amount. Matching a purchase touches only the buckets it can hit, and
+    validity dates are checked against the set of offers valid in the current interval
+    of the validity timeline. Offers with unparseable fields are left out of the index
+    and kept in skipped with the reason.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_customers: Optional[int] = None):
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("OFFER_INDEX_TTL_SECONDS", "300"))
+        if max_customers is None:
+            max_customers = int(os.getenv("OFFER_INDEX_MAX_CUSTOMERS", "1024"))
+        self.ttl_seconds = ttl_seconds
+        self.max_customers = max_customers
+        self.built_at: Optional[float] = None
+        self._refresh_lock = asyncio.Lock()
+        self._customer_state: "OrderedDict[str, tuple]" = OrderedDict()
+        self._reset()
+
+    def _reset(self):
+        self._entries: Dict[Any, IndexedOffer] = {}
+        self._keys: Dict[Any, List[tuple]] = {}
+        self._buckets: Dict[tuple, _ThresholdBucket] = {}
+        self._timeline = _ValidityTimeline()
+        self.skipped: Dict[Any, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _bucket_keys(offer: Dict[str, Any]) -> List[tuple]:
+        """Buckets an offer belongs to, from its most specific targeting"""
+        keys = []
+        if offer.get("merchant_id") is not None:
+            keys.append(("merchant_id", int(offer["merchant_id"])))
+        if offer.get("merchant_name"):
+            keys.append(("merchant_name", str(offer["merchant_name"]).strip().lower()))
+        if not keys and offer.get("merchant_category"):
+            keys.append(("merchant_category", enum_value(offer["merchant_category"]).upper()))
+        if not keys:
+            keys.append(("category", enum_value(offer.get("category"))))
+        return keys
+
+    def upsert(self, offer: Dict[str, Any]) -> bool:
+        """Add an offer to the index, replacing any previous version with the same ID
+
+        Returns False and skips the offer when its amounts, dates or targeting cannot be parsed.
+        """
+        self.remove(offer.get("id"))
+        try:
+            entry = IndexedOffer(offer)
+            keys = self._bucket_keys(offer)
+        except (AttributeError, TypeError, ValueError) as e:
+            self.skipped[offer.get("id")] = str(e)
+            return False
+        for key in keys:
+            self._buckets.setdefault(key, _ThresholdBucket()).add(entry)
+        self._timeline.add(entry)
+        self._entries[entry.id] = entry
+        self._keys[entry.id] = keys
+        return True
+
+    def remove(self, offer_id: Any):
+        """Drop an offer from the index if present"""
+        self.skipped.pop(offer_id, None)
+        entry = self._entries.pop(offer_id, None)
+        if entry is None:
+            return
+        for key in self._keys.pop(offer_id):
+            bucket = self._buckets[key]
+            bucket.remove(entry)
+            if not bucket.entries:
+                del self._buckets[key]
+        self._timeline.remove(entry)
+
+    def build(self, offers: Iterable[Dict[str, Any]]):
+        """Replace the whole index with the given catalog"""
+        self._reset()
+        for offer in offers:
+            self.upsert(offer)
+        self.built_at = time.time()
+
+    def is_stale(self) -> bool:
+        return self.built_at is None or time.time() - self.built_at > self.ttl_seconds
+
+    async def ensure_fresh(self):
+        """Rebuild from /api/offers when the index is older than its TTL"""
+        if not self.is_stale():
+            return
+        async with self._refresh_lock:
+            if self.is_stale():
+                self.build(await fetch_all_pages("/api/offers", "offers"))
+                self._customer_state.clear()
+
+    async def customer_state(self, customer_id: str) -> Dict[Any, Dict[str, Any]]:
+        """Activation and usage data for a customer, cached for the index TTL
+
+        At most max_customers customers are kept, least recently used evicted first.
+        """
+        cached = self._customer_state.get(customer_id)
+        if cached and time.time() - cached[0] <= self.ttl_seconds:
+            self._customer_state.move_to_end(customer_id)
+            return cached[1]
+        offers = await fetch_all_pages("/api/offers", "offers", params={"customer_id": customer_id, "is_active": True})
+        state = {
+            offer.get("id"): {
+                "customer_activated": offer.get("customer_activated"),
+                "used_count": offer.get("used_count"),
+            }
+            for offer in offers
+        }
+        self._customer_state[customer_id] = (time.time(), state)
+        self._customer_state.move_to_end(customer_id)
+        while len(self._customer_state) > self.max_customers:
+            self._customer_state.popitem(last=False)
+        return state
+
+    def candidates(
+        self,
+        amount: float,
+        merchant_name: Optional[str] = None,
+        merchant_category: Optional[Any] = None,
+        merchant_id: Optional[int] = None
+    ) -> List[IndexedOffer]:
+        """Offers whose targeting and amount threshold fit the purchase"""
+        keys = []
+        if merchant_id is not None:
+            keys.append(("merchant_id", int(merchant_id)))
+        if merchant_name:
+            keys.append(("merchant_name", merchant_name.strip().lower()))
+        category_value = enum_value(merchant_category)
+        if category_value:
+            category_value = category_value.upper()
+            keys.append(("merchant_category", category_value))
+            offer_category = MERCHANT_TO_OFFER_CATEGORY.get(MerchantCategory.__members__.get(category_value))
+            if offer_category:
+                keys.append(("category", offer_category.value))
+        keys.extend(("category", value) for value in UNIVERSAL_OFFER_CATEGORIES)
+
+        seen = set()
+        found = []
+        for key in keys:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                continue
+            for entry in bucket.qualifying(amount):
+                if entry.id not in seen:
+                    seen.add(entry.id)
+                    found.append(entry)
+        return found
+
+    def match(
+        self,
+        amount: float,
+        merchant_name: Optional[str] = None,
+        merchant_category: Optional[Any] = None,
+        merchant_id: Optional[int] = None,
+        customer_state: Optional[Dict[Any, Dict[str, Any]]] = None,
+        now: Optional[float] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Rank eligible offers for a purchase by discount, then reward points"""
+        now = time.time() if now is None else now
+        valid = self._timeline.valid_ids(self._entries.values(), now)
+        matches = []
+        for entry in self.candidates(amount, merchant_name, merchant_category, merchant_id):
+            if not entry.is_active or entry.id not in valid:
+                continue
+            state = customer_state.get(entry.id, {}) if customer_state is not None else {}
+            used_count = state.get("used_count")
+            if used_count is not None and entry.max_usage_per_customer is not None \
+                    and used_count >= entry.max_usage_per_customer:
+                continue
+            discount = entry.discount_for(amount)
+            offer = entry.offer
+            match = {
+                "offer_id": entry.id,
+                "title": offer.get("title"),
+                "category": enum_value(offer.get("category")),
+                "merchant_id": offer.get("merchant_id"),
+                "merchant_name": offer.get("merchant_name"),
+                "discount_percentage": entry.discount_percentage,
+                "discount_amount": discount,
+                "final_amount": round(amount - discount, 2),
+                "reward_points": entry.reward_points,
+                "expiry_date": offer.get("expiry_date"),
+            }
+            if customer_state is not None:
+                match["customer_activated"] = bool(state.get("customer_activated"))
+                match["used_count"] = used_count or 0
+            matches.append(match)
+        matches.sort(key=lambda m: (-m["discount_amount"], -m["reward_points"], str(m["offer_id"])))
+        return matches[:limit] if limit else matches
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "offers": len(self._entries),
+            "buckets": len(self._buckets),
+            "age_seconds": round(now - self.built_at, 3) if self.built_at else None,
+            "ttl_seconds": self.ttl_seconds,
+            "cached_customers": len(self._customer_state),
+            "skipped_offers": len(self.skipped),
+            "next_validity_change": self._timeline.next_change(now),
+        }
+
+
+# Global offer index instance
+offer_index = OfferIndex()
@@ -0,0 +1,42 @@
+import asyncio
+import os
+from typing import Optional, List, Dict, Any
+from models import api_client
+
+# Page size used when a service needs every item behind a paginated endpoint
+BULK_PAGE_SIZE = 100
+DEFAULT_PAGE_CONCURRENCY = 8
+
+
+def page_concurrency() -> int:
+    """Upstream page requests one fetch_all_pages call keeps in flight (PAGINATION_CONCURRENCY)"""
+    return max(1, int(os.getenv("PAGINATION_CONCURRENCY", str(DEFAULT_PAGE_CONCURRENCY))))
+
+
+async def fetch_all_pages(
+    endpoint: str,
+    items_key: str,
+    params: Optional[Dict[str, Any]] = None,
+    per_page: int = BULK_PAGE_SIZE,
+    concurrency: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Collect items_key from every page of a paginated GET endpoint
+
+    The first page tells us how many pages exist; the rest are fetched concurrently,
+    at most concurrency (default page_concurrency()) at a time.
+    """
+    params = {**(params or {}), "page": 1, "per_page": per_page}
+    first = await api_client.get(endpoint, params=params)
+    items = list(first.get(items_key, []))
+    pages = first.get("pages") or 1
+    if pages > 1:
+        semaphore = asyncio.Semaphore(max(1, concurrency or page_concurrency()))
+
+        async def fetch(page: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await api_client.get(endpoint, params={**params, "page": page})
+
+        rest = await asyncio.gather(*(fetch(page) for page in range(2, pages + 1)))
+        for response in rest:
+            items.extend(response.get(items_key, []))
+    return items
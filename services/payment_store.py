@@ -0,0 +1,249 @@
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Optional, List, Dict, Any, Iterable, Union
+import numpy as np
+from pydantic import BaseModel
+from models import Payment, PaymentStatus
+from .offer_index import enum_value
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+NULL_TIMESTAMP = np.iinfo(np.int64).min
+NULL_CODE = -1
+# Stored for a missing payment or credit card ID; real IDs are positive
+NULL_ID = -1
+STATUS_MEMBERS = list(PaymentStatus)
+STATUS_CODES = {status.value: code for code, status in enumerate(STATUS_MEMBERS)}
+MODEL_SAMPLE_SIZE = 100
+
+
+def epoch_micros(value: Any) -> int:
+    """datetime or ISO timestamp to epoch microseconds; naive values are treated as UTC"""
+    if value is None or value == "":
+        return NULL_TIMESTAMP
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def from_epoch_micros(value: int) -> Optional[datetime]:
+    if value == NULL_TIMESTAMP:
+        return None
+    return EPOCH + timedelta(microseconds=value)
+
+
+class InternedColumn:
+    """Repeated strings stored once, with an int32 code per row (-1 for missing)"""
+
+    def __init__(self):
+        self.codes = np.empty(0, dtype=np.int32)
+        self.values: List[str] = []
+        self._lookup: Dict[str, int] = {}
+
+    def encode(self, value: Optional[str]) -> int:
+        if value is None:
+            return NULL_CODE
+        code = self._lookup.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self._lookup[value] = code
+        return code
+
+    def extend(self, values: List[Optional[str]]):
+        codes = np.fromiter((self.encode(v) for v in values), dtype=np.int32, count=len(values))
+        self.codes = np.concatenate([self.codes, codes])
+
+    def decode(self, code: int) -> Optional[str]:
+        return self.values[code] if code != NULL_CODE else None
+
+    def __getitem__(self, row: int) -> Optional[str]:
+        return self.decode(int(self.codes[row]))
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + sum(sys.getsizeof(v) for v in self.values)
+
+
+class PackedStringColumn:
+    """Mostly-unique strings packed into one UTF-8 buffer addressed by an offsets array"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._present = np.empty(0, dtype=bool)
+
+    def extend(self, values: List[Optional[str]]):
+        encoded = [v.encode("utf-8") if v is not None else b"" for v in values]
+        lengths = np.fromiter((len(e) for e in encoded), dtype=np.int64, count=len(encoded))
+        self._offsets = np.concatenate([self._offsets, self._offsets[-1] + np.cumsum(lengths)])
+        self._present = np.concatenate([self._present, np.fromiter((v is not None for v in values), dtype=bool, count=len(values))])
+        self._buffer.extend(b"".join(encoded))
+
+    def __getitem__(self, row: int) -> Optional[str]:
+        if not self._present[row]:
+            return None
+        return self._buffer[self._offsets[row]:self._offsets[row + 1]].decode("utf-8")
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._buffer) + self._offsets.nbytes + self._present.nbytes
+
+
+def _deep_sizeof(value: Any, seen: Optional[set] = None) -> int:
+    """Approximate retained size of a model instance and the objects it references"""
+    seen = seen if seen is not None else set()
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, BaseModel):
+        size += _deep_sizeof(value.__dict__, seen) + _deep_sizeof(value.__pydantic_fields_set__, seen)
+    elif isinstance(value, dict):
+        size += sum(_deep_sizeof(k, seen) + _deep_sizeof(v, seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_deep_sizeof(v, seen) for v in value)
+    return size
+
+
+class PaymentStore:
+    """Array-backed store of Payment records
+
+    Each Payment field is a column: int64 IDs, float64 amounts, epoch-microsecond
+    int64 timestamps, int8 PaymentStatus codes, interned customer IDs, merchant names
+    and categories, and packed description/reference strings. Rows convert back to
+    Payment models on demand. Missing values are stored as a sentinel (NULL_ID,
+    NULL_TIMESTAMP, NULL_CODE) and read back as None.
+    """
+
+    def __init__(self, payments: Optional[Iterable[Union[Dict[str, Any], Payment]]] = None):
+        self.ids = np.empty(0, dtype=np.int64)
+        self.credit_card_ids = np.empty(0, dtype=np.int64)
+        self.amounts = np.empty(0, dtype=np.float64)
+        self.transaction_dates = np.empty(0, dtype=np.int64)
+        self.created_ats = np.empty(0, dtype=np.int64)
+        self.status_codes = np.empty(0, dtype=np.int8)
+        self.customer_ids = InternedColumn()
+        self.merchant_names = InternedColumn()
+        self.merchant_categories = InternedColumn()
+        self.descriptions = PackedStringColumn()
+        self.reference_numbers = PackedStringColumn()
+        self._rows: Dict[int, int] = {}
+        if payments is not None:
+            self.extend(payments)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def knows(self, payment_id: Any) -> bool:
+        return payment_id in self._rows
+
+    @property
+    def last_seen_id(self) -> Optional[int]:
+        return int(self.ids.max()) if len(self.ids) else None
+
+    def extend(self, payments: Iterable[Union[Dict[str, Any], Payment]]) -> int:
+        """Append payments not already stored; returns the number added"""
+        rows = []
+        for payment in payments:
+            if isinstance(payment, BaseModel):
+                payment = payment.model_dump()
+            payment_id = payment.get("id")
+            if payment_id is not None and payment_id in self._rows:
+                continue
+            rows.append(payment)
+        if not rows:
+            return 0
+
+        count = len(rows)
+        start = len(self.ids)
+        ids = np.fromiter((p.get("id") if p.get("id") is not None else NULL_ID for p in rows), dtype=np.int64, count=count)
+        self.ids = np.concatenate([self.ids, ids])
+        self.credit_card_ids = np.concatenate([self.credit_card_ids, np.fromiter((p.get("credit_card_id") if p.get("credit_card_id") is not None else NULL_ID for p in rows), dtype=np.int64, count=count)])
+        self.amounts = np.concatenate([self.amounts, np.fromiter((float(p.get("amount") or 0.0) for p in rows), dtype=np.float64, count=count)])
+        self.transaction_dates = np.concatenate([self.transaction_dates, np.fromiter((epoch_micros(p.get("transaction_date")) for p in rows), dtype=np.int64, count=count)])
+        self.created_ats = np.concatenate([self.created_ats, np.fromiter((epoch_micros(p.get("created_at")) for p in rows), dtype=np.int64, count=count)])
+        self.status_codes = np.concatenate([self.status_codes, np.fromiter((STATUS_CODES.get(enum_value(p.get("status")), NULL_CODE) for p in rows), dtype=np.int8, count=count)])
+        self.customer_ids.extend([p.get("customer_id") for p in rows])
+        self.merchant_names.extend([p.get("merchant_name") for p in rows])
+        self.merchant_categories.extend([p.get("merchant_category") for p in rows])
+        self.descriptions.extend([p.get("description") for p in rows])
+        self.reference_numbers.extend([p.get("reference_number") for p in rows])
+        for offset, payment_id in enumerate(ids.tolist()):
+            if payment_id != NULL_ID:
+                self._rows[payment_id] = start + offset
+        return count
+
+    def newest_first(self, offset: int = 0, limit: Optional[int] = None) -> List[int]:
+        """Row indices ordered by payment ID, newest first, sliced by offset and limit
+
+        Rows are stored in arrival order, which is not newest first once a refresh has
+        appended newer pages; payments without an ID come last.
+        """
+        order = np.argsort(-self.ids, kind="stable")
+        offset = max(0, offset)
+        end = None if limit is None else offset + max(0, limit)
+        return order[offset:end].tolist()
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """One stored payment as a JSON-ready dict in the API's field layout"""
+        status_code = int(self.status_codes[index])
+        transaction_date = from_epoch_micros(int(self.transaction_dates[index]))
+        created_at = from_epoch_micros(int(self.created_ats[index]))
+        payment_id = int(self.ids[index])
+        credit_card_id = int(self.credit_card_ids[index])
+        return {
+            "id": payment_id if payment_id != NULL_ID else None,
+            "credit_card_id": credit_card_id if credit_card_id != NULL_ID else None,
+            "customer_id": self.customer_ids[index],
+            "amount": float(self.amounts[index]),
+            "merchant_name": self.merchant_names[index],
+            "merchant_category": self.merchant_categories[index],
+            "description": self.descriptions[index],
+            "transaction_date": transaction_date.isoformat() if transaction_date else None,
+            "status": STATUS_MEMBERS[status_code].value if status_code != NULL_CODE else None,
+            "reference_number": self.reference_numbers[index],
+            "created_at": created_at.isoformat() if created_at else None,
+        }
+
+    def to_payment(self, index: int) -> Payment:
+        """Materialize one stored row as a validated Payment model"""
+        return Payment.model_validate(self.row(index))
+
+    def get(self, payment_id: int) -> Optional[Payment]:
+        index = self._rows.get(payment_id)
+        return self.to_payment(index) if index is not None else None
+
+    def memory_usage(self, compare_models: bool = False) -> Dict[str, Any]:
+        """Bytes held by each column, optionally compared to the equivalent Payment models"""
+        columns = {
+            "ids": self.ids.nbytes,
+            "credit_card_ids": self.credit_card_ids.nbytes,
+            "amounts": self.amounts.nbytes,
+            "transaction_dates": self.transaction_dates.nbytes,
+            "created_ats": self.created_ats.nbytes,
+            "status_codes": self.status_codes.nbytes,
+            "customer_ids": self.customer_ids.nbytes,
+            "merchant_names": self.merchant_names.nbytes,
+            "merchant_categories": self.merchant_categories.nbytes,
+            "descriptions": self.descriptions.nbytes,
+            "reference_numbers": self.reference_numbers.nbytes,
+        }
+        total = sum(columns.values())
+        usage = {
+            "records": len(self),
+            "total_bytes": total,
+            "bytes_per_record": round(total / len(self), 1) if len(self) else 0.0,
+            "columns": columns,
+            "distinct_merchants": len(self.merchant_names.values),
+            "distinct_categories": len(self.merchant_categories.values),
+        }
+        if compare_models and len(self):
+            sample = min(len(self), MODEL_SAMPLE_SIZE)
+            sample_bytes = sum(_deep_sizeof(self.to_payment(index)) for index in range(sample))
+            model_bytes = int(sample_bytes / sample * len(self))
+            usage["estimated_model_bytes"] = model_bytes
+            usage["compression_ratio"] = round(model_bytes / total, 2) if total else None
+        return usage
@@ -0,0 +1,115 @@
+import asyncio
+from typing import Optional, List, Dict, Any, Callable, Awaitable, Sequence
+from models import RefundDecision, RefundStatus, RefundType, api_client
+from .pagination import fetch_all_pages
+
+# Upper edges of the refund amount bands; the last band is open ended
+DEFAULT_AMOUNT_BANDS = (50.0, 250.0, 1000.0)
+DEFAULT_BATCH_SIZE = 10
+
+ProgressCallback = Callable[[float, Optional[float], Optional[str]], Awaitable[None]]
+
+
+def band_labels(edges: Sequence[float] = DEFAULT_AMOUNT_BANDS) -> List[str]:
+    """Human readable labels for the amount bands defined by edges"""
+    labels = []
+    lower = 0.0
+    for upper in edges:
+        labels.append(f"{lower:g}-{upper:g}")
+        lower = upper
+    labels.append(f"{lower:g}+")
+    return labels
+
+
+def amount_band(amount: float, edges: Sequence[float] = DEFAULT_AMOUNT_BANDS) -> str:
+    """Return the band label an amount falls into (lower edge inclusive)"""
+    labels = band_labels(edges)
+    for index, upper in enumerate(edges):
+        if amount < upper:
+            return labels[index]
+    return labels[-1]
+
+
+async def fetch_pending_refunds(
+    refund_type: Optional[RefundType] = None,
+    customer_id: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Pull every REQUESTED refund across all pages"""
+    params = {"status": RefundStatus.REQUESTED.value}
+    if refund_type:
+        params["refund_type"] = refund_type.value if hasattr(refund_type, 'value') else str(refund_type)
+    if customer_id:
+        params["customer_id"] = customer_id
+    return await fetch_all_pages("/api/refunds", "refunds", params=params)
+
+
+def group_refunds(
+    refunds: List[Dict[str, Any]],
+    edges: Sequence[float] = DEFAULT_AMOUNT_BANDS
+) -> List[Dict[str, Any]]:
+    """Group refunds by refund_type and amount band, largest exposure first"""
+    groups: Dict[tuple, Dict[str, Any]] = {}
+    for refund in refunds:
+        amount = float(refund.get("refund_amount") or 0.0)
+        key = (refund.get("refund_type"), amount_band(amount, edges))
+        group = groups.setdefault(key, {
+            "refund_type": key[0],
+            "amount_band": key[1],
+            "count": 0,
+            "total_amount": 0.0,
+            "refund_ids": [],
+        })
+        group["count"] += 1
+        group["total_amount"] = round(group["total_amount"] + amount, 2)
+        group["refund_ids"].append(refund.get("id"))
+    return sorted(groups.values(), key=lambda g: (-g["total_amount"], str(g["refund_type"]), g["amount_band"]))
+
+
+async def _apply_decision(decision: RefundDecision) -> Dict[str, Any]:
+    """Send one approve/deny call and turn the outcome into a ledger entry"""
+    entry = {"refund_id": decision.refund_id, "action": "approve" if decision.approved else "deny"}
+    try:
+        if decision.approved:
+            data = {"approved": True}
+            if decision.admin_notes:
+                data["admin_notes"] = decision.admin_notes
+            response = await api_client.post(f"/api/refunds/{decision.refund_id}/approve", data=data)
+        else:
+            data = {}
+            if decision.denial_reason:
+                data["denial_reason"] = decision.denial_reason
+            response = await api_client.post(f"/api/refunds/{decision.refund_id}/deny", data=data)
+        entry.update({"status": "succeeded", "response": response})
+    except Exception as e:
+        entry.update({"status": "failed", "error": str(e)})
+    return entry
+
+
+async def apply_decisions(
+    decisions: List[RefundDecision],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    progress: Optional[ProgressCallback] = None
+) -> Dict[str, Any]:
+    """Apply decisions in concurrent batches and return a per-item result ledger
+
+    Items within a batch run concurrently; batches run one after another so at most
+    batch_size approve/deny calls are in flight. Progress is reported once per item.
+    """
+    batch_size = max(1, batch_size)
+    total = len(decisions)
+    ledger: List[Dict[str, Any]] = []
+
+    for start in range(0, total, batch_size):
+        batch = decisions[start:start + batch_size]
+        for entry in await asyncio.gather(*(_apply_decision(d) for d in batch)):
+            ledger.append(entry)
+            if progress:
+                await progress(len(ledger), total, f"refund {entry['refund_id']}: {entry['action']} {entry['status']}")
+
+    succeeded = sum(1 for entry in ledger if entry["status"] == "succeeded")
+    return {
+        "processed": total,
+        "succeeded": succeeded,
+        "failed": total - succeeded,
+        "ledger": ledger,
+    }
@@ -0,0 +1,195 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Sequence
+import numpy as np
+from models import PaymentStatus, api_client
+from .offer_index import enum_value
+from .pagination import BULK_PAGE_SIZE
+from .payment_store import PaymentStore, STATUS_CODES, NULL_TIMESTAMP, epoch_micros
+
+SECONDS_PER_DAY = 86400
+STATUS_NAMES = [status.value for status in PaymentStatus]
+GROUP_BY_OPTIONS = ("day", "week", "month", "merchant_category", "merchant", "status", "none")
+DEFAULT_PERCENTILES = (50.0, 90.0, 99.0)
+UNCATEGORIZED = "UNCATEGORIZED"
+
+
+def _epoch_seconds(value: Any) -> int:
+    return epoch_micros(value) // 1_000_000
+
+
+class SpendingFrame(PaymentStore):
+    """Payment store with vectorized spending rollups
+
+    Rollups run on the store's NumPy columns: transaction timestamps (falling back to
+    created_at) in epoch seconds, float64 amounts and the interned category, merchant
+    and status codes.
+    """
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        timestamps = np.where(self.transaction_dates != NULL_TIMESTAMP, self.transaction_dates, self.created_ats)
+        return np.where(timestamps != NULL_TIMESTAMP, timestamps // 1_000_000, 0)
+
+    def mask(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        statuses: Optional[Sequence[Any]] = None
+    ) -> np.ndarray:
+        """Boolean row mask for a date range (inclusive) and a set of statuses"""
+        selected = np.ones(len(self.ids), dtype=bool)
+        timestamps = self.timestamps
+        if start_date:
+            selected &= timestamps >= _epoch_seconds(start_date)
+        if end_date:
+            end = _epoch_seconds(end_date)
+            # A bare date means the whole day
+            if len(str(end_date)) <= 10:
+                end += SECONDS_PER_DAY - 1
+            selected &= timestamps <= end
+        if statuses:
+            codes = [STATUS_CODES[enum_value(s)] for s in statuses]
+            selected &= np.isin(self.status_codes, codes)
+        return selected
+
+    def _group_keys(self, group_by: str, selected: np.ndarray):
+        """Integer group key per selected row and a function naming each key"""
+        if group_by == "none":
+            return np.zeros(int(selected.sum()), dtype=np.int64), lambda key: "all"
+        if group_by in ("day", "week", "month"):
+            seconds = self.timestamps[selected]
+            days = seconds // SECONDS_PER_DAY
+            if group_by == "day":
+                return days, lambda key: str(np.datetime64(int(key), "D"))
+            if group_by == "week":
+                # 1970-01-01 was a Thursday; shift so weeks start on Monday
+                return days - (days + 3) % 7, lambda key: str(np.datetime64(int(key), "D"))
+            months = seconds.astype("datetime64[s]").astype("datetime64[M]").astype(np.int64)
+            return months, lambda key: str(np.datetime64(int(key), "M"))
+        if group_by == "merchant_category":
+            return self.merchant_categories.codes[selected], lambda key: self.merchant_categories.decode(int(key)) or UNCATEGORIZED
+        if group_by == "merchant":
+            return self.merchant_names.codes[selected], lambda key: self.merchant_names.decode(int(key)) or ""
+        if group_by == "status":
+            return self.status_codes[selected], lambda key: STATUS_NAMES[int(key)] if key >= 0 else "UNKNOWN"
+        raise ValueError(f"group_by must be one of {', '.join(GROUP_BY_OPTIONS)}")
+
+    def rollup(
+        self,
+        group_by: str = "month",
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        statuses: Optional[Sequence[Any]] = None,
+        percentiles: Sequence[float] = DEFAULT_PERCENTILES
+    ) -> Dict[str, Any]:
+        """Totals, counts, averages and amount percentiles per group in one vectorized pass"""
+        selected = self.mask(start_date, end_date, statuses)
+        keys, name_of = self._group_keys(group_by, selected)
+        amounts = self.amounts[selected]
+        percentiles = [float(p) for p in percentiles]
+
+        summary = {
+            "transaction_count": int(len(amounts)),
+            "total_amount": round(float(amounts.sum()), 2),
+            "average_amount": round(float(amounts.mean()), 2) if len(amounts) else 0.0,
+            "percentiles": self._percentiles(amounts, percentiles),
+        }
+        if not len(amounts):
+            return {"group_by": group_by, "summary": summary, "groups": []}
+
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        counts = np.bincount(inverse)
+        totals = np.bincount(inverse, weights=amounts)
+        # Sort once by group so each group's amounts are a contiguous slice
+        order = np.argsort(inverse, kind="stable")
+        boundaries = np.cumsum(counts)[:-1]
+        per_group_amounts = np.split(amounts[order], boundaries)
+
+        groups = []
+        for position, key in enumerate(unique_keys):
+            groups.append({
+                "key": name_of(key),
+                "transaction_count": int(counts[position]),
+                "total_amount": round(float(totals[position]), 2),
+                "average_amount": round(float(totals[position] / counts[position]), 2),
+                "percentiles": self._percentiles(per_group_amounts[position], percentiles),
+            })
+        if group_by in ("merchant_category", "merchant", "status"):
+            groups.sort(key=lambda g: -g["total_amount"])
+        return {"group_by": group_by, "summary": summary, "groups": groups}
+
+    @staticmethod
+    def _percentiles(amounts: np.ndarray, percentiles: Sequence[float]) -> Dict[str, float]:
+        if not len(amounts) or not percentiles:
+            return {}
+        values = np.percentile(amounts, percentiles)
+        return {f"p{p:g}": round(float(v), 2) for p, v in zip(percentiles, values)}
+
+
+class SpendingFrameCache:
+    """Per-scope spending frames refreshed incrementally from /api/payments
+
+    /api/payments is ordered newest first, so a refresh reads pages until it reaches
+    a page containing the last-seen payment and appends only the unseen payments.
+    Frames are rebuilt from scratch after full_refresh_seconds to pick up status
+    changes on older payments.
+    """
+
+    def __init__(self, max_entries: int = 128, full_refresh_seconds: Optional[float] = None):
+        if full_refresh_seconds is None:
+            full_refresh_seconds = float(os.getenv("SPENDING_FRAME_FULL_REFRESH_SECONDS", "3600"))
+        self.max_entries = max_entries
+        self.full_refresh_seconds = full_refresh_seconds
+        self._frames: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._locks: Dict[tuple, asyncio.Lock] = {}
+
+    @staticmethod
+    def scope_key(customer_id: Optional[str] = None, merchant_name: Optional[str] = None) -> tuple:
+        if bool(customer_id) == bool(merchant_name):
+            raise ValueError("Provide exactly one of customer_id or merchant_name")
+        return ("customer", customer_id) if customer_id else ("merchant", merchant_name.strip().lower())
+
+    async def _fetch_new(self, frame: SpendingFrame, params: Dict[str, Any]) -> int:
+        """Read newest-first pages until reaching payments the frame already holds"""
+        added = 0
+        last_seen_id = frame.last_seen_id
+        page = 1
+        while True:
+            response = await api_client.get("/api/payments", params={**params, "page": page, "per_page": BULK_PAGE_SIZE})
+            payments = response.get("payments", [])
+            added += frame.extend(payments)
+            reached_known = last_seen_id is not None and any(frame.knows(p.get("id")) and p.get("id") <= last_seen_id for p in payments)
+            if reached_known or not payments or page >= (response.get("pages") or 1):
+                return added
+            page += 1
+
+    async def get(self, customer_id: Optional[str] = None, merchant_name: Optional[str] = None) -> Dict[str, Any]:
+        """Return the up-to-date frame for a customer or merchant and how it was refreshed"""
+        key = self.scope_key(customer_id, merchant_name)
+        params = {"customer_id": customer_id} if customer_id else {"merchant_name": merchant_name}
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            cached = self._frames.get(key)
+            if cached is None or time.time() - cached[1] > self.full_refresh_seconds:
+                frame, built_at, refresh = SpendingFrame(), time.time(), "full"
+            else:
+                frame, built_at = cached
+                refresh = "incremental"
+            added = await self._fetch_new(frame, params)
+            self._frames[key] = (frame, built_at)
+            self._frames.move_to_end(key)
+            while len(self._frames) > self.max_entries:
+                evicted, _ = self._frames.popitem(last=False)
+                self._locks.pop(evicted, None)
+        return {"frame": frame, "refresh": refresh, "new_payments": added, "last_seen_id": frame.last_seen_id}
+
+    def clear(self):
+        self._frames.clear()
+        self._locks.clear()
+
+
+# Global spending frame cache instance
+spending_frames = SpendingFrameCache()
@@ -0,0 +1,24 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../'))
+
+import contextlib
+import pytest
+from benchmarks import stub_backend as stub
+
+
+@pytest.fixture
+def stub_backend():
+    """stub_backend(app=None, **stub_options): route APIClient to app (default a zero-latency stub) until teardown"""
+    with contextlib.ExitStack() as stack:
+        def route(app=None, **stub_options):
+            return stack.enter_context(stub.stub_api_client(app if app is not None else stub.create_stub_app(**{"latency_ms": 0, **stub_options})))
+        yield route
+
+
+@pytest.fixture
+def stub_server():
+    """stub_server(groups, name=..., app=None, **stub_options): FastMCP server backed by the stub until teardown"""
+    with contextlib.ExitStack() as stack:
+        def build(groups, name="test-server", app=None, **stub_options):
+            return stack.enter_context(stub.stub_server(groups, name=name, app=app, **stub_options))
+        yield build
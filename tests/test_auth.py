@@ -0,0 +1,63 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../'))
+
+import pytest
+import main
+from server import auth as server_auth
+
+@pytest.fixture
+def fresh_auth(monkeypatch):
+    for name in ("AUTH_ENABLED", "AUTH_PUBLIC_KEY_PATH", "AUTH_PRIVATE_KEY_PATH", "AUTH_ISSUER", "AUTH_AUDIENCE"):
+        monkeypatch.delenv(name, raising=False)
+    saved = server_auth._key_pair
+    server_auth.reset()
+    yield monkeypatch
+    server_auth._key_pair = saved
+
+def test_import_does_not_generate_keys():
+    """Importing main with auth disabled leaves the server unauthenticated and generates no keys"""
+    assert main.mcp.auth is None
+    assert main.auth is None
+
+def test_build_auth_disabled_by_default(fresh_auth):
+    assert server_auth.build_auth() is None
+    assert server_auth._key_pair is None
+
+@pytest.mark.asyncio
+async def test_enabled_auth_verifies_minted_token(fresh_auth):
+    """With AUTH_ENABLED a verifier is built and accepts tokens minted for the audience"""
+    fresh_auth.setenv("AUTH_ENABLED", "true")
+    verifier = server_auth.build_auth()
+    token = server_auth.create_access_token()
+    access = await verifier.load_access_token(token)
+    assert access is not None
+    assert access.claims["aud"] == server_auth.DEFAULT_AUDIENCE
+
+@pytest.mark.asyncio
+async def test_keys_loaded_from_disk(fresh_auth, tmp_path):
+    """A private key on disk is used instead of generating one, and its public half is derived"""
+    generated = server_auth.get_key_pair()
+    server_auth.reset()
+    private_path = tmp_path / "private.pem"
+    private_path.write_text(generated.private_key.get_secret_value())
+    fresh_auth.setenv("AUTH_PRIVATE_KEY_PATH", str(private_path))
+    fresh_auth.setenv("AUTH_ENABLED", "true")
+
+    key_pair = server_auth.get_key_pair()
+    assert key_pair.public_key == generated.public_key
+    verifier = server_auth.build_auth()
+    assert await verifier.load_access_token(generated.create_token(audience=server_auth.DEFAULT_AUDIENCE)) is not None
+
+def test_public_key_alone_builds_verifier(fresh_auth, tmp_path):
+    """Verification-only deployments never touch a private key"""
+    public_path = tmp_path / "public.pem"
+    public_path.write_text(server_auth.get_key_pair().public_key)
+    server_auth.reset()
+    fresh_auth.setenv("AUTH_PUBLIC_KEY_PATH", str(public_path))
+    fresh_auth.setenv("AUTH_ENABLED", "true")
+    assert server_auth.build_auth() is not None
+    assert server_auth._key_pair is None
+
+def test_legacy_access_token_attribute(fresh_auth):
+    """main.access_token is still available, minted on first access"""
+    assert main.access_token.count(".") == 2
@@ -0,0 +1,35 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../'))
+
+import pytest
+from benchmarks.bench_load import MIXES, ProcessSampler, drive_mix, compare
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mix", sorted(MIXES))
+async def test_every_mix_runs_cleanly_against_the_stub(mix, stub_server):
+    mcp = stub_server(["offer", "payment", "reward", "integration"], name="load-check", swagger=True)
+    result = await drive_mix(mcp, clients=2, duration=0.5, mix=MIXES[mix])
+    assert result["requests"] > 0
+    assert result["overall"]["errors"] == 0
+    assert set(result["tools"]) <= {tool for tool, _, _ in MIXES[mix]}
+
+def test_process_sampler_reads_own_process():
+    sampler = ProcessSampler(os.getpid(), interval=0.01)
+    sampler.start()
+    sum(i * i for i in range(300_000))
+    sampler.stop()
+    summary = sampler.summary()
+    assert summary["peak_rss_mb"] > 10
+    assert summary["cpu_seconds"] >= 0
+
+def test_compare_flags_regressions_beyond_threshold():
+    def report(rps, p95, rss):
+        return {"results": [{"transport": "http", "throughput_rps": rps, "overall": {"p50_ms": 10.0, "p95_ms": p95, "p99_ms": None},
+                             "server": {"cpu_ms_per_request": 2.0, "peak_rss_mb": rss}}]}
+    rows = {row["metric"]: row for row in compare(report(80.0, 30.0, 105.0), report(100.0, 25.0, 100.0), threshold=10.0)}
+    assert rows["throughput_rps"]["change_pct"] == -20.0
+    assert rows["throughput_rps"]["regression"]
+    assert rows["overall.p95_ms"]["regression"]
+    assert not rows["overall.p50_ms"]["regression"]
+    assert not rows["server.peak_rss_mb"]["regression"]
+    assert "overall.p99_ms" not in rows
@@ -0,0 +1,31 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../'))
+
+import enum
+from benchmarks.bench_models import MODELS, PAYLOADS, PAYLOADS_JSON, HOT_WRITE_MODELS, unwrap_enums
+
+
+def test_every_model_is_benchmarked():
+    assert len(MODELS) > 50
+    for name in ("Payment", "PaymentListResponse", "OfferCreate", "HotelBookingRequest", "HealthResponse"):
+        assert name in MODELS
+
+
+def test_payloads_validate_and_round_trip():
+    for name, model in MODELS.items():
+        instance = model.model_validate(PAYLOADS[name])
+        assert model.model_validate_json(PAYLOADS_JSON[name]) == instance, name
+
+
+def test_list_payloads_carry_a_page_of_items():
+    payload = PAYLOADS["PaymentListResponse"]
+    assert len(payload["payments"]) == 10
+    assert payload["per_page"] == 10
+
+
+def test_write_path_unwraps_enums():
+    for name in HOT_WRITE_MODELS:
+        data = unwrap_enums(MODELS[name].model_validate(PAYLOADS[name]).model_dump(exclude_unset=True))
+        assert not any(isinstance(value, enum.Enum) for value in data.values())
+    offer = unwrap_enums(MODELS["OfferCreate"].model_validate(PAYLOADS["OfferCreate"]).model_dump(exclude_unset=True))
+    assert isinstance(offer["category"], str)
@@ -0,0 +1,67 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../'))
+
+import pytest
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+from tools.columnar import to_columns, from_columns, columnar, NULL_CODE
+from benchmarks.bench_projection import measure_columnar
+
+
+def test_to_columns_dictionary_encodes_repeated_categories():
+    rows = [
+        {"id": 1, "status": "COMPLETED", "merchant_category": "dining", "reference_number": "A"},
+        {"id": 2, "status": "PENDING", "merchant_category": None, "reference_number": "B"},
+        {"id": 3, "status": "COMPLETED", "reference_number": "C"},
+    ]
+    table = to_columns(rows, ("status", "merchant_category", "reference_number"))
+    assert table["count"] == 3
+    assert table["columns"]["id"] == [1, 2, 3]
+    assert table["columns"]["status"] == [0, 1, 0]
+    assert table["dictionaries"]["status"] == ["COMPLETED", "PENDING"]
+    # Missing values keep their place; a column with no repeats stays plain
+    assert table["columns"]["merchant_category"] == ["dining", None, None]
+    assert table["columns"]["reference_number"] == ["A", "B", "C"]
+    assert set(table["dictionaries"]) == {"status"}
+    assert from_columns(table) == [{"merchant_category": None, **row} for row in rows]
+
+
+def test_null_codes_and_pass_through():
+    table = to_columns([{"status": "EARNED"}, {"status": None}, {"status": "EARNED"}], ("status",))
+    assert table["columns"]["status"] == [0, NULL_CODE, 0]
+    page = {"rewards": [{"id": 1}], "total": 1}
+    assert columnar(page, "rewards", output_format="rows") is page
+    assert columnar(page, "rewards")["rewards"]["columns"] == {"id": [1]}
+
+
+@pytest.mark.asyncio
+async def test_columnar_tools_match_row_results(monkeypatch, stub_server):
+    mcp = stub_server(["payment", "reward"], swagger=True, items=25)
+    calls = {
+        "list_payments": ({"per_page": 50}, "payments"),
+        "get_customer_rewards": ({"customer_id": "CU00000001", "per_page": 25}, "rewards"),
+        "get_redemption_history": ({"customer_id": "CU00000001", "per_page": 25}, "redemptions"),
+    }
+    async with Client(mcp) as client:
+        for tool, (args, key) in calls.items():
+            rows = (await client.call_tool(tool, args)).data
+            table = (await client.call_tool(tool, {**args, "output_format": "columnar"})).data
+            assert table[key]["format"] == "columnar"
+            assert table["total"] == rows["total"]
+            assert from_columns(table[key]) == rows[key], tool
+            assert "status" in table[key]["dictionaries"], tool
+        projected = (await client.call_tool("list_payments", {"fields": ["id", "status"], "output_format": "columnar"})).data
+        monkeypatch.setenv("TYPED_LIST_RESPONSES", "true")
+        typed = (await client.call_tool("get_customer_rewards", {"customer_id": "CU00000001", "output_format": "columnar"})).data
+        with pytest.raises(ToolError, match=r"'csv' is not one of \['rows', 'columnar'\]"):
+            await client.call_tool("list_payments", {"output_format": "csv"})
+    assert list(projected["payments"]["columns"]) == ["id", "status"]
+    assert typed["rewards"]["count"] == 10
+    assert set(typed["rewards"]["dictionaries"]["status"]) <= {"EARNED", "REDEEMED", "EXPIRED"}
+
+
+@pytest.mark.asyncio
+async def test_columnar_results_are_smaller():
+    rows = await measure_columnar(per_page=50)
+    for row in rows:
+        assert row["columnar_bytes"] < row["rows_bytes"] * 0.7, row["tool"]
@@ -0,0 +1,60 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../'))
+
+import httpx
+import pytest
+from fastmcp import Client
+from server.metrics import metrics, path_template, Histogram
+
+@pytest.fixture
+def server(stub_server):
+    metrics.reset()
+    yield stub_server(["health", "payment"], name="metrics-check")
+    metrics.reset()
+
+def test_path_templates_follow_swagger():
+    assert path_template("/api/customers/CUST0001/credit-cards") == "/api/customers/{customer_id}/credit-cards"
+    assert path_template("/api/offers/categories") == "/api/offers/categories"
+    assert path_template("/api/offers/17") == "/api/offers/{offer_id}"
+    assert path_template("/api/unknown/42") == "/api/unknown/{id}"
+
+def test_histogram_quantiles():
+    histogram = Histogram(buckets=(0.01, 0.1, 1.0))
+    for seconds in [0.005] * 50 + [0.05] * 45 + [0.5] * 5:
+        histogram.observe(seconds)
+    assert histogram.count == 100
+    assert 0.0 < histogram.quantile(0.5) <= 0.01
+    assert 0.01 < histogram.quantile(0.95) <= 0.1
+    assert 0.1 < histogram.quantile(0.99) <= 1.0
+
+@pytest.mark.asyncio
+async def test_tool_and_upstream_metrics(server):
+    async with Client(server) as client:
+        for page in (1, 2):
+            await client.call_tool("list_payments", {"page": page, "per_page": 5})
+        # The stub has no /api/payments/{id} route, so this fails upstream with a 404
+        with pytest.raises(Exception):
+            await client.call_tool("get_payment_details", {"payment_id": 3})
+        result = await client.call_tool("get_server_metrics", {})
+
+    snapshot = result.data
+    assert snapshot["tools"]["list_payments"]["calls"] == 2
+    assert snapshot["tools"]["list_payments"]["latency"]["p50_ms"] is not None
+    assert snapshot["tools"]["get_payment_details"]["errors"] == 1
+    upstream = {(entry["method"], entry["path"]): entry for entry in snapshot["upstream"]}
+    assert upstream[("GET", "/api/payments")]["calls"] == 2
+    assert upstream[("GET", "/api/payments/{payment_id}")]["errors"] == 1
+    assert "response_cache" in snapshot
+
+@pytest.mark.asyncio
+async def test_prometheus_endpoint(server):
+    async with Client(server) as client:
+        await client.call_tool("list_payments", {})
+    app = server.http_app()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+        response = await http.get("/metrics")
+    assert response.status_code == 200
+    body = response.text
+    assert 'mcp_tool_calls_total{tool="list_payments"} 1' in body
+    assert 'mcp_upstream_request_duration_seconds_bucket{method="GET",path="/api/payments",le="+Inf"} 1' in body
+    assert "# TYPE mcp_tool_duration_seconds histogram" in body
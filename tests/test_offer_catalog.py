@@ -0,0 +1,136 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../'))
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+from main import mcp
+from services.offer_index import OfferIndex
+from services.offer_catalog import OfferCatalogReplica, offer_catalog, offer_fingerprint
+
+def _offer(offer_id, **fields):
+    offer = {"id": offer_id, "title": f"Offer {offer_id}", "category": "DINING", "is_active": True, "merchant_id": 1}
+    offer.update(fields)
+    return offer
+
+def _replica():
+    return OfferCatalogReplica(index=OfferIndex(ttl_seconds=60), enabled=True, sync_interval=0, max_lag=60)
+
+def test_fingerprint_ignores_key_order():
+    """Content hashes depend on values, not key order"""
+    assert offer_fingerprint({"id": 1, "title": "a"}) == offer_fingerprint({"title": "a", "id": 1})
+    assert offer_fingerprint({"id": 1, "title": "a"}) != offer_fingerprint({"id": 1, "title": "b"})
+
+def test_apply_scan_only_reindexes_changes():
+    """Unchanged offers are skipped; changed, added and removed offers update the index"""
+    replica = _replica()
+    assert replica.apply_scan([_offer(1), _offer(2)]) == {"added": 2, "updated": 0, "removed": 0, "unchanged": 0}
+
+    with patch.object(replica.index, 'upsert', wraps=replica.index.upsert) as upsert:
+        changes = replica.apply_scan([_offer(1), _offer(2, title="Changed"), _offer(3)])
+    assert changes == {"added": 1, "updated": 1, "removed": 0, "unchanged": 1}
+    assert [call.args[0]["id"] for call in upsert.call_args_list] == [2, 3]
+
+    changes = replica.apply_scan([_offer(3)])
+    assert changes["removed"] == 2
+    assert len(replica) == 1
+    assert len(replica.index) == 1
+
+@pytest.mark.asyncio
+async def test_list_offers_filters_and_paginates_locally():
+    """Replica pages follow the upstream response shape and filters"""
+    replica = _replica()
+    catalog = {"offers": [_offer(i, category="FUEL" if i % 2 else "DINING") for i in range(1, 8)], "pages": 1}
+    with patch('models.api_client.get', new=AsyncMock(return_value=catalog)) as mock_get:
+        await replica.ensure_started()
+        page = await replica.list_offers(page=2, per_page=2, category="FUEL")
+        await replica.list_offers(page=1, per_page=2)
+
+    assert mock_get.await_count == 1
+    assert [o["id"] for o in page["offers"]] == [5, 7]
+    assert page["total"] == 4
+    assert page["pages"] == 2
+    assert replica.query(merchant_id=2) == []
+
+@pytest.mark.asyncio
+async def test_stale_replica_falls_back_to_api():
+    """A replica older than max_lag is not used"""
+    replica = _replica()
+    replica.apply_scan([_offer(1)])
+    replica.last_sync_at = 1.0
+    assert await replica.list_offers() is None
+
+@pytest.mark.asyncio
+async def test_list_offers_falls_through_while_warming_up():
+    """The first list_offers call starts the first scan in the background instead of waiting for it"""
+    replica = _replica()
+    catalog = {"offers": [_offer(1)], "pages": 1}
+    with patch('models.api_client.get', new=AsyncMock(return_value=catalog)):
+        assert await replica.list_offers() is None
+        await replica._first_sync
+        page = await replica.list_offers()
+    assert [o["id"] for o in page["offers"]] == [1]
+
+@pytest.mark.asyncio
+async def test_failed_first_sync_keeps_falling_through():
+    """A failed warm-up scan is recorded and list_offers keeps returning None"""
+    replica = _replica()
+    with patch('models.api_client.get', new=AsyncMock(side_effect=Exception("API Error: timeout"))):
+        assert await replica.list_offers() is None
+        await asyncio.gather(replica._first_sync, return_exceptions=True)
+        assert await replica.list_offers() is None
+    assert replica.stats()["last_error"] == "API Error: timeout"
+    await replica.stop()
+
+@pytest.mark.asyncio
+async def test_match_offers_reports_failed_first_sync():
+    """match_offers turns a failed first replica scan into a tool error naming the replica"""
+    replica = _replica()
+    with patch('tools.offer_tools.offer_catalog', replica), \
+            patch('models.api_client.get', new=AsyncMock(side_effect=Exception("API Error: timeout"))):
+        async with Client(mcp) as client:
+            with pytest.raises(ToolError, match="Offer catalog replica"):
+                await client.call_tool("match_offers", {"amount": 10.0})
+
+@pytest.mark.asyncio
+async def test_match_offers_flags_a_stale_replica():
+    """A replica past max_lag is synced before matching; if that fails the result is flagged stale"""
+    replica = _replica()
+    replica.apply_scan([_offer(1, category="CASHBACK")])
+    replica.last_sync_at = 1.0
+    with patch('tools.offer_tools.offer_catalog', replica), \
+            patch('models.api_client.get', new=AsyncMock(side_effect=Exception("API Error: timeout"))):
+        async with Client(mcp) as client:
+            stale = (await client.call_tool("match_offers", {"amount": 10.0})).data
+    assert stale["stale"] is True
+    assert "Last sync error: API Error: timeout" in stale["warning"]
+
+    with patch('tools.offer_tools.offer_catalog', replica), \
+            patch('models.api_client.get', new=AsyncMock(return_value={"offers": [_offer(1, category="CASHBACK")], "pages": 1})):
+        async with Client(mcp) as client:
+            fresh = (await client.call_tool("match_offers", {"amount": 10.0})).data
+    assert fresh["stale"] is False and "warning" not in fresh
+    assert replica.is_fresh()
+
+@pytest.mark.asyncio
+async def test_sync_failure_is_recorded():
+    """Failed scans are counted and keep the previous replica"""
+    replica = _replica()
+    replica.apply_scan([_offer(1)])
+    with patch('models.api_client.get', new=AsyncMock(side_effect=Exception("API Error: timeout"))):
+        with pytest.raises(Exception):
+            await replica.sync()
+    stats = replica.stats()
+    assert stats["error_count"] == 1
+    assert stats["last_error"] == "API Error: timeout"
+    assert stats["offers"] == 1
+
+@pytest.mark.asyncio
+async def test_catalog_status_tool():
+    """Replica freshness metrics are exposed as an MCP tool"""
+    async with Client(mcp) as client:
+        result = await client.call_tool("get_offer_catalog_status", {})
+    assert result.data["replica"]["enabled"] == offer_catalog.enabled
+    assert "lag_seconds" in result.data["replica"]
@@ -0,0 +1,150 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../'))
+
+import pytest
+from unittest.mock import AsyncMock, patch
+from datetime import datetime, timedelta, timezone
+from fastmcp import Client
+from main import mcp
+from services.offer_index import OfferIndex, IndexedOffer, offer_index
+
+NOW = datetime(2025, 6, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+def _offer(offer_id, **fields):
+    offer = {
+        "id": offer_id,
+        "title": f"Offer {offer_id}",
+        "category": "CASHBACK",
+        "discount_percentage": 10.0,
+        "is_active": True,
+        "start_date": (NOW - timedelta(days=1)).isoformat(),
+        "expiry_date": (NOW + timedelta(days=30)).isoformat(),
+    }
+    offer.update(fields)
+    return offer
+
+def _index(*offers):
+    index = OfferIndex(ttl_seconds=60)
+    index.build(offers)
+    return index
+
+def _match(index, amount, **kwargs):
+    return index.match(amount, now=NOW.timestamp(), **kwargs)
+
+def test_match_ranks_by_discount_with_cap():
+    """Offers are ranked by computed discount and max_discount_amount is applied"""
+    index = _index(
+        _offer(1, discount_percentage=20.0, max_discount_amount=5.0),
+        _offer(2, discount_percentage=10.0),
+    )
+    matches = _match(index, 100.0)
+    assert [m["offer_id"] for m in matches] == [2, 1]
+    assert matches[0]["discount_amount"] == 10.0
+    assert matches[1]["discount_amount"] == 5.0
+    assert matches[0]["final_amount"] == 90.0
+
+def test_match_filters_amount_threshold_and_dates():
+    """Minimum amount, validity window and active flag all exclude offers"""
+    index = _index(
+        _offer(1, min_transaction_amount=200.0),
+        _offer(2, start_date=(NOW + timedelta(days=2)).isoformat()),
+        _offer(3, expiry_date=(NOW - timedelta(hours=1)).isoformat()),
+        _offer(4, is_active=False),
+        _offer(5),
+    )
+    assert [m["offer_id"] for m in _match(index, 100.0)] == [5]
+    assert {m["offer_id"] for m in _match(index, 250.0)} == {1, 5}
+
+def test_match_merchant_and_category_targeting():
+    """Merchant-targeted offers only match that merchant; category offers follow the merchant category"""
+    index = _index(
+        _offer(1, category="DINING", merchant_id=7, merchant_name="Pizza Place"),
+        _offer(2, category="DINING"),
+        _offer(3, category="FUEL"),
+        _offer(4, category="SHOPPING", merchant_category="RESTAURANT"),
+    )
+    dining = _match(index, 50.0, merchant_name="pizza place", merchant_category="RESTAURANT")
+    assert {m["offer_id"] for m in dining} == {1, 2, 4}
+    elsewhere = _match(index, 50.0, merchant_name="Burger Barn", merchant_category="RESTAURANT")
+    assert {m["offer_id"] for m in elsewhere} == {2, 4}
+    fuel = _match(index, 50.0, merchant_category="GAS_STATION")
+    assert [m["offer_id"] for m in fuel] == [3]
+
+def test_match_excludes_used_up_offers_for_customer():
+    """Offers the customer has exhausted are dropped and activation is reported"""
+    index = _index(_offer(1, max_usage_per_customer=1), _offer(2, max_usage_per_customer=3))
+    state = {1: {"customer_activated": True, "used_count": 1}, 2: {"customer_activated": True, "used_count": 1}}
+    matches = _match(index, 100.0, customer_state=state)
+    assert [m["offer_id"] for m in matches] == [2]
+    assert matches[0]["customer_activated"] is True
+
+def test_upsert_and_remove_keep_buckets_consistent():
+    """Re-indexing an offer moves it between buckets"""
+    index = _index(_offer(1, category="FUEL"))
+    assert _match(index, 10.0, merchant_category="GAS_STATION")
+    index.upsert(_offer(1, category="TRAVEL"))
+    assert not _match(index, 10.0, merchant_category="GAS_STATION")
+    assert _match(index, 10.0, merchant_category="AIRLINE")
+    index.remove(1)
+    assert len(index) == 0
+
+@pytest.mark.asyncio
+async def test_match_offers_tool_builds_index_from_catalog():
+    """match_offers refreshes the index from /api/offers and returns ranked matches"""
+    start = (datetime.now() - timedelta(days=1)).isoformat()
+    expiry = (datetime.now() + timedelta(days=1)).isoformat()
+    catalog = {"offers": [_offer(9, discount_percentage=15.0, start_date=start, expiry_date=expiry)], "pages": 1}
+    offer_index.built_at = None
+    with patch('models.api_client.get', new=AsyncMock(return_value=catalog)) as mock_get:
+        async with Client(mcp) as client:
+            result = await client.call_tool("match_offers", {"amount": 40.0, "merchant_name": "Any Store"})
+    offer_index.built_at = None
+
+    assert mock_get.await_args.args[0] == "/api/offers"
+    assert result.data["matches"][0]["offer_id"] == 9
+    assert result.data["matches"][0]["discount_amount"] == 6.0
+    assert "match_time_us" in result.data
+
+def test_malformed_offer_is_skipped_not_fatal():
+    """An offer with an unparseable date is left out and reported; the rest are indexed"""
+    index = _index(
+        _offer(1, expiry_date="not-a-date"), _offer(2), _offer(3, min_transaction_amount="n/a"),
+        _offer(4, merchant_name=1234, merchant_id="n/a"),
+    )
+    assert len(index) == 1
+    assert [m["offer_id"] for m in _match(index, 100.0)] == [2]
+    assert set(index.skipped) == {1, 3, 4}
+    assert index.stats()["skipped_offers"] == 3
+    index.upsert(_offer(1))
+    index.upsert(_offer(4, merchant_name=1234))
+    assert set(index.skipped) == {3}
+    assert len(index) == 3
+
+def test_validity_is_looked_up_per_interval():
+    """Offers are valid in [start_date, expiry_date], and the valid set is reused inside an interval"""
+    start, expiry = NOW - timedelta(days=1), NOW + timedelta(days=30)
+    index = _index(_offer(1), _offer(2, start_date=(NOW + timedelta(days=2)).isoformat()))
+    at = lambda moment: {m["offer_id"] for m in index.match(10.0, now=moment.timestamp())}
+    assert at(NOW) == {1}
+    assert at(start) == {1} and at(expiry) == {1, 2}
+    assert at(start - timedelta(seconds=1)) == set()
+    assert at(expiry + timedelta(seconds=1)) == set()
+    assert at(NOW + timedelta(days=2)) == {1, 2}
+    assert at(NOW + timedelta(days=2, hours=1)) == {1, 2}
+    with patch.object(IndexedOffer, "is_valid_at", side_effect=AssertionError("recomputed")):
+        assert at(NOW + timedelta(days=3)) == {1, 2}
+    index.remove(2)
+    assert at(NOW + timedelta(days=2)) == {1}
+
+@pytest.mark.asyncio
+async def test_customer_state_cache_is_bounded():
+    """Least recently used customers are evicted past max_customers"""
+    index = OfferIndex(ttl_seconds=60, max_customers=2)
+    with patch('models.api_client.get', new=AsyncMock(return_value={"offers": [], "pages": 1})) as mock_get:
+        for customer_id in ("CU1", "CU2", "CU1", "CU3"):
+            await index.customer_state(customer_id)
+        assert mock_get.await_count == 3
+        assert list(index._customer_state) == ["CU1", "CU3"]
+        await index.customer_state("CU2")
+        assert mock_get.await_count == 4
+    assert index.stats()["cached_customers"] == 2
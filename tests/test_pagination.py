@@ -0,0 +1,32 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../'))
+
+import asyncio
+import pytest
+from unittest.mock import patch
+from services.pagination import fetch_all_pages, page_concurrency
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("limit", [1, 3])
+async def test_fetch_all_pages_bounds_concurrency(limit):
+    """Remaining pages are fetched with at most `concurrency` requests in flight, in page order"""
+    in_flight, peak = 0, 0
+
+    async def get(endpoint, params=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"items": [params["page"]], "pages": 10}
+
+    with patch('models.api_client.get', new=get):
+        items = await fetch_all_pages("/api/items", "items", concurrency=limit)
+    assert items == list(range(1, 11))
+    assert peak == limit
+
+def test_page_concurrency_from_environment(monkeypatch):
+    monkeypatch.delenv("PAGINATION_CONCURRENCY", raising=False)
+    assert page_concurrency() == 8
+    monkeypatch.setenv("PAGINATION_CONCURRENCY", "2")
+    assert page_concurrency() == 2
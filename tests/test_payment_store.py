@@ -0,0 +1,121 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../'))
+
+import pytest
+from unittest.mock import AsyncMock, patch
+from datetime import datetime, timezone
+from fastmcp import Client
+from main import mcp
+from models import Payment, PaymentStatus
+from services.payment_store import PaymentStore, epoch_micros, from_epoch_micros
+from services.spending_frame import spending_frames
+
+def _payment(payment_id, merchant="Amazon", category="E_COMMERCE", description=None, status="COMPLETED"):
+    return {
+        "id": payment_id,
+        "credit_card_id": 3,
+        "customer_id": "CU00000001",
+        "amount": 10.5 * payment_id,
+        "merchant_name": merchant,
+        "merchant_category": category,
+        "description": description,
+        "transaction_date": "2024-01-15T14:30:00.250000+00:00",
+        "status": status,
+        "reference_number": f"TXN-20240115-{payment_id:08d}",
+        "created_at": None,
+    }
+
+def test_epoch_micros_round_trip():
+    """Timestamps survive conversion to epoch microseconds, including sub-second precision"""
+    value = datetime(2024, 1, 15, 14, 30, 0, 250000, tzinfo=timezone.utc)
+    assert from_epoch_micros(epoch_micros(value)) == value
+    assert epoch_micros("2024-01-15T14:30:00.250000Z") == epoch_micros(value)
+    assert from_epoch_micros(epoch_micros(None)) is None
+
+def test_round_trip_to_payment():
+    """Stored rows convert back to equal Payment models"""
+    originals = [_payment(1, description="Café ☕"), _payment(2, category=None, status="REFUNDED")]
+    store = PaymentStore(originals)
+    for index, original in enumerate(originals):
+        assert store.to_payment(index) == Payment.model_validate(original)
+    assert store.get(2).status == PaymentStatus.REFUNDED
+    assert store.get(99) is None
+
+def test_accepts_payment_models_and_skips_duplicates():
+    store = PaymentStore([Payment.model_validate(_payment(1))])
+    assert store.extend([_payment(1), _payment(2)]) == 1
+    assert len(store) == 2
+    assert store.last_seen_id == 2
+
+def test_repeated_strings_are_interned():
+    """Merchant names and categories are stored once however many rows use them"""
+    store = PaymentStore([_payment(i, merchant="Amazon" if i % 2 else "Target") for i in range(1, 201)])
+    usage = store.memory_usage()
+    assert usage["records"] == 200
+    assert usage["distinct_merchants"] == 2
+    assert usage["distinct_categories"] == 1
+    assert usage["total_bytes"] == sum(usage["columns"].values())
+
+def test_memory_usage_compares_against_models():
+    """The columnar store is much smaller than the equivalent Payment objects"""
+    store = PaymentStore([_payment(i) for i in range(1, 501)])
+    usage = store.memory_usage(compare_models=True)
+    assert usage["estimated_model_bytes"] > usage["total_bytes"]
+    assert usage["compression_ratio"] > 2
+
+@pytest.mark.asyncio
+async def test_cached_payments_tool():
+    """Payments are served from the store and rebuilt as Payment records"""
+    spending_frames.clear()
+    with patch('models.api_client.get', new=AsyncMock(return_value={"payments": [_payment(2), _payment(1)], "pages": 1})):
+        async with Client(mcp) as client:
+            result = await client.call_tool("get_cached_payments", {"customer_id": "CU00000001", "limit": 1})
+    spending_frames.clear()
+    assert result.data["total"] == 2
+    assert result.data["payments"][0]["id"] == 2
+    assert result.data["payments"][0]["transaction_date"].startswith("2024-01-15T14:30:00.25")
+    assert result.data["memory"]["records"] == 2
+
+def test_missing_credit_card_id_is_not_card_zero():
+    """A payment without a credit card ID reads back as None, not as a real card"""
+    missing = _payment(1)
+    del missing["credit_card_id"]
+    store = PaymentStore([missing, {**_payment(2), "credit_card_id": 0}])
+    assert store.row(0)["credit_card_id"] is None
+    assert store.row(1)["credit_card_id"] == 0
+
+@pytest.mark.asyncio
+async def test_cached_payments_tool_keeps_rows_without_card():
+    """A payment missing its credit card ID is returned with credit_card_id None, not a failed page"""
+    missing = _payment(2)
+    del missing["credit_card_id"]
+    spending_frames.clear()
+    try:
+        with patch('models.api_client.get', new=AsyncMock(return_value={"payments": [missing, _payment(1)], "pages": 1})):
+            async with Client(mcp) as client:
+                result = await client.call_tool("get_cached_payments", {"customer_id": "CU00000001"})
+    finally:
+        spending_frames.clear()
+    assert [(p["id"], p["credit_card_id"]) for p in result.data["payments"]] == [(2, None), (1, 3)]
+
+def test_newest_first_orders_by_id():
+    """Rows appended out of order are read back newest first"""
+    store = PaymentStore([_payment(3), _payment(2), _payment(6), _payment(5), _payment(4)])
+    assert [store.row(index)["id"] for index in store.newest_first()] == [6, 5, 4, 3, 2]
+    assert [store.row(index)["id"] for index in store.newest_first(1, 2)] == [5, 4]
+
+@pytest.mark.asyncio
+async def test_cached_payments_newest_first_after_incremental_refresh():
+    """Payments fetched by a refresh are appended to the store but served first"""
+    spending_frames.clear()
+    try:
+        async with Client(mcp) as client:
+            with patch('models.api_client.get', new=AsyncMock(return_value={"payments": [_payment(2), _payment(1)], "pages": 1})):
+                await client.call_tool("get_cached_payments", {"customer_id": "CU00000001"})
+            # Newest first page that is only partly new: 4 and 3 are unseen, 2 is known
+            with patch('models.api_client.get', new=AsyncMock(return_value={"payments": [_payment(4), _payment(3), _payment(2)], "pages": 2})):
+                result = await client.call_tool("get_cached_payments", {"customer_id": "CU00000001", "offset": 0, "limit": 3})
+    finally:
+        spending_frames.clear()
+    assert result.data["total"] == 4
+    assert [payment["id"] for payment in result.data["payments"]] == [4, 3, 2]
@@ -0,0 +1,63 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../'))
+
+import pytest
+from fastmcp import FastMCP, Client
+from tools import register_all_tools
+from server import profiling
+from server.profiling import ToolProfiler, install_profiling
+
+@pytest.fixture
+def profiled(tmp_path, monkeypatch, stub_server):
+    monkeypatch.setenv("ADMIN_TOOLS_ENABLED", "true")
+    mcp = stub_server(["health", "payment"], name="profiling-check")
+    tool_profiler = install_profiling(mcp, ToolProfiler(str(tmp_path / "profiles"), tool_names=["list_payments"], sample_rate=0, max_files=2))
+    yield mcp, tool_profiler
+    profiling.profiler = None
+
+@pytest.mark.asyncio
+async def test_selected_tool_is_profiled_and_retrievable(profiled):
+    mcp, tool_profiler = profiled
+    async with Client(mcp) as client:
+        await client.call_tool("list_payments", {"per_page": 50})
+        await client.call_tool("get_server_metrics", {})
+        listed = (await client.call_tool("list_tool_profiles", {})).data
+        assert [p["tool"] for p in listed["profiles"]] == ["list_payments"]
+
+        profile_id = listed["profiles"][0]["profile_id"]
+        report = (await client.call_tool("get_tool_profile", {"profile_id": profile_id, "limit": 200})).data
+    functions = " ".join(f["function"] for f in report["top_functions"])
+    # Upstream request handling and JSON decoding are part of the capture
+    assert "_make_request" in functions
+    assert "decode" in functions
+    assert report["total_calls"] > 0
+    assert "cumulative" in report["report"]
+
+@pytest.mark.asyncio
+async def test_profiles_rotate_and_sampling_is_configurable(profiled):
+    mcp, tool_profiler = profiled
+    async with Client(mcp) as client:
+        await client.call_tool("configure_tool_profiling", {"tool_names": [], "sample_rate": 1.0})
+        for _ in range(3):
+            await client.call_tool("list_payments", {})
+    assert tool_profiler.captured == 3
+    assert len(tool_profiler.list_profiles()) == 2
+
+@pytest.mark.asyncio
+async def test_invalid_profile_requests_rejected(profiled):
+    mcp, _ = profiled
+    async with Client(mcp) as client:
+        with pytest.raises(Exception):
+            await client.call_tool("get_tool_profile", {"profile_id": "../../etc/passwd"})
+        with pytest.raises(Exception):
+            await client.call_tool("get_tool_profile", {"profile_id": "1_list_payments_3ms.prof", "sort_by": "name"})
+
+@pytest.mark.asyncio
+async def test_profiling_disabled_by_default(monkeypatch):
+    monkeypatch.setenv("ADMIN_TOOLS_ENABLED", "true")
+    monkeypatch.delenv("PROFILING_ENABLED", raising=False)
+    mcp = FastMCP(name="profiling-off")
+    register_all_tools(mcp, groups=["health"])
+    async with Client(mcp) as client:
+        with pytest.raises(Exception, match="PROFILING_ENABLED"):
+            await client.call_tool("list_tool_profiles", {})
@@ -0,0 +1,90 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../'))
+
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastmcp import FastMCP, Client
+from fastmcp.exceptions import ToolError
+from models import api_client, Offer, OfferListResponse
+from tools import register_all_tools
+from tools.projection import project, check_fields, push_fields
+from benchmarks.bench_projection import measure
+
+
+def test_project_list_and_detail():
+    page = {"offers": [{"id": 1, "title": "A", "terms_and_conditions": "long"}, {"id": 2, "title": "B"}], "total": 2, "pages": 1}
+    assert project(page, Offer, ["id", "title"], "offers") == {"offers": [{"id": 1, "title": "A"}, {"id": 2, "title": "B"}], "total": 2, "pages": 1}
+    assert project(page["offers"][0], Offer, ["title"]) == {"title": "A"}
+    assert project(page, Offer, None, "offers") is page
+    with pytest.raises(ValueError, match="Unknown Offer fields: nope"):
+        check_fields(Offer, ["id", "nope"])
+    assert check_fields(Offer, ["id", "id", "title"]) == ["id", "title"]
+
+
+def test_project_detail_without_top_level_fields_is_unprojected():
+    wrapped = {"offer": {"id": 1, "title": "A"}, "status": "ok"}
+    assert project(wrapped, Offer, ["id", "title"]) is wrapped
+    assert project({"id": 1, "offer": {}}, Offer, ["id", "title"]) == {"id": 1}
+
+
+def test_project_typed_list_response():
+    page = OfferListResponse.model_validate({
+        "offers": [{"id": 1, "title": "A", "category": "DINING", "discount_percentage": 10}],
+        "total": 1, "pages": 1, "current_page": 1, "per_page": 10
+    })
+    projected = project(page, Offer, ["id", "discount_percentage"], "offers")
+    assert projected == {"offers": [{"id": 1, "discount_percentage": 10.0}], "total": 1, "pages": 1, "current_page": 1, "per_page": 10}
+
+
+def test_push_fields_only_when_enabled(monkeypatch):
+    assert push_fields({}, ["id"]) == {}
+    monkeypatch.setenv("UPSTREAM_FIELD_PROJECTION", "true")
+    assert push_fields({}, ["id", "title"]) == {"fields": "id,title"}
+    assert push_fields({}, ["id"], typed=True) == {}
+
+
+@pytest.mark.asyncio
+async def test_tools_project_fields(monkeypatch, stub_server):
+    mcp = stub_server(["offer", "payment"], swagger=True, items=25)
+    records = []
+    api_client.request_hooks.append(records.append)
+    try:
+        async with Client(mcp) as client:
+            offers = (await client.call_tool("list_offers", {"fields": ["id", "title", "discount_percentage"]})).data
+            offer = (await client.call_tool("get_offer", {"offer_id": 3, "fields": ["id", "title"]})).data
+            with pytest.raises(ToolError, match="Unknown Payment fields"):
+                await client.call_tool("list_payments", {"fields": ["id", "card_number"]})
+            monkeypatch.setenv("TYPED_LIST_RESPONSES", "true")
+            typed = (await client.call_tool("list_offers", {"fields": ["id", "title"]})).data
+            monkeypatch.setenv("TYPED_LIST_RESPONSES", "false")
+            monkeypatch.setenv("UPSTREAM_FIELD_PROJECTION", "true")
+            await client.call_tool("list_payments", {"fields": ["id", "amount"]})
+    finally:
+        api_client.request_hooks.remove(records.append)
+    assert {tuple(item) for item in offers["offers"]} == {("id", "title", "discount_percentage")}
+    assert offers["total"] == 25
+    assert offer == {"id": 3, "title": offer["title"]}
+    assert [item["id"] for item in typed["offers"]] == [item["id"] for item in offers["offers"]]
+    assert {tuple(item) for item in typed["offers"]} == {("id", "title")}
+    assert records[-1]["params"]["fields"] == "id,amount"
+    # No upstream request was made for the rejected projection
+    assert [record["endpoint"] for record in records].count("/api/payments") == 1
+
+
+@pytest.mark.asyncio
+async def test_detail_tool_returns_wrapped_response_unprojected():
+    mcp = FastMCP("test-server")
+    register_all_tools(mcp, groups=["merchant"])
+    wrapped = {"merchant": {"id": 7, "name": "Cafe", "category": "RESTAURANT"}}
+    with patch("models.api_client.get", new=AsyncMock(return_value=wrapped)):
+        async with Client(mcp) as client:
+            result = await client.call_tool("get_merchant_details", {"merchant_id": 7, "fields": ["id", "name"]})
+    assert result.data == wrapped
+
+
+@pytest.mark.asyncio
+async def test_projection_benchmark_reports_reductions():
+    rows = await measure()
+    assert len(rows) == 10
+    for row in rows:
+        assert row["projected_bytes"] < row["full_bytes"] / 2, row["tool"]
@@ -0,0 +1,119 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../'))
+
+import json
+import pytest
+from fastmcp import Client
+from models import api_client
+from server.recording import TrafficRecorder, Pseudonymizer, install_recording
+from benchmarks.replay import load_recording, create_replay_app, replay, exchange_key
+
+def remove_recorder_hooks():
+    api_client.request_hooks[:] = [h for h in api_client.request_hooks if not isinstance(getattr(h, "__self__", None), TrafficRecorder)]
+
+@pytest.fixture
+def recording(tmp_path, stub_server):
+    """Record a small traffic mix against the stub backend"""
+    path = str(tmp_path / "traffic.ndjson")
+    mcp = stub_server(["health", "payment"], name="recording-check")
+    install_recording(mcp, traffic_recorder=TrafficRecorder(path, Pseudonymizer("test")))
+    return mcp, path
+
+@pytest.mark.asyncio
+async def test_recording_is_redacted_and_linked(recording):
+    mcp, path = recording
+    async with Client(mcp) as client:
+        await client.call_tool("list_payments", {"customer_id": "CUST0003", "per_page": 3})
+        await client.call_tool("health_check", {})
+    remove_recorder_hooks()
+
+    text = open(path).read()
+    # Customer IDs are pseudonymized in arguments, query parameters and response bodies
+    assert "CUST0003" not in text
+    calls, upstream = load_recording(path)
+    assert [c["tool"] for c in calls] == ["list_payments", "health_check"]
+    customer = calls[0]["arguments"]["customer_id"]
+    assert customer.startswith("CUST") and customer != "CUST0003"
+    payments = next(u for u in upstream if u["endpoint"] == "/api/payments")
+    assert payments["seq"] == calls[0]["seq"]
+    assert payments["params"]["customer_id"] == customer
+    assert {p["customer_id"] for p in payments["response"]["payments"]} == {customer}
+    assert payments["response"]["payments"][0]["status"] in ("COMPLETED", "PENDING", "FAILED", "REFUNDED")
+
+@pytest.mark.asyncio
+async def test_replay_against_stand_in_backend(recording, stub_server):
+    mcp, path = recording
+    async with Client(mcp) as client:
+        for customer in ("CUST0001", "CUST0002", "CUST0001"):
+            await client.call_tool("list_payments", {"customer_id": customer, "per_page": 2})
+        with pytest.raises(Exception):
+            await client.call_tool("get_payment_details", {"payment_id": 99999})
+    remove_recorder_hooks()
+
+    calls, upstream = load_recording(path)
+    stand_in = create_replay_app(upstream, latency_scale=0)
+    # Routes upstream requests to the stand-in from here on
+    server = stub_server(["payment"], name="replay-target", app=stand_in)
+    report = await replay(server, calls, speed=0, sessions=2)
+    assert stand_in.state.served == {"matched": 4, "unmatched": 0}
+    assert report["tools"]["list_payments"]["calls"] == 3
+    assert report["tools"]["list_payments"]["errors"] == 0
+    # The recorded 404 is replayed as a failure
+    assert report["tools"]["get_payment_details"]["errors"] == 1
+
+    timed = await replay(server, calls[:2], speed=10.0, sessions=1)
+    assert timed["overall"]["calls"] == 2
+
+def test_pseudonyms_keep_shape():
+    pseudonymizer = Pseudonymizer("test")
+    redacted = pseudonymizer.redact({
+        "card_number": "4111111111111111", "customer_email": "jane@example.org", "credit_card_id": 7,
+        "amount": 19.99, "status": "PENDING"
+    })
+    assert len(redacted["card_number"]) == 16 and redacted["card_number"].isdigit()
+    assert redacted["card_number"] != "4111111111111111"
+    assert redacted["customer_email"].endswith("@example.com")
+    assert isinstance(redacted["credit_card_id"], int) and redacted["credit_card_id"] != 7
+    assert (redacted["amount"], redacted["status"]) == (19.99, "PENDING")
+    # Path parameters map to the same pseudonyms as arguments
+    assert pseudonymizer.endpoint("/api/customers/CUST0001/credit-cards/7") == \
+        f"/api/customers/{pseudonymizer.pseudonym('CUST0001')}/credit-cards/{redacted['credit_card_id']}"
+    assert pseudonymizer.endpoint("/api/payments/7") == "/api/payments/7"
+
+def test_pseudonyms_depend_on_type_and_keep_no_values():
+    pseudonymizer = Pseudonymizer("test")
+    as_string, as_int = pseudonymizer.pseudonym("123"), pseudonymizer.pseudonym(123)
+    assert isinstance(as_string, str) and as_string.isdigit() and len(as_string) == 3
+    assert isinstance(as_int, int)
+    assert (pseudonymizer.pseudonym(123), pseudonymizer.pseudonym("123")) == (as_int, as_string)
+    assert Pseudonymizer("test").pseudonym("123") == as_string
+    assert not hasattr(pseudonymizer, "mapping")
+
+def test_identifiers_under_neutral_keys_are_pseudonymized():
+    pseudonymizer = Pseudonymizer("test", max_known=2)
+    customer = pseudonymizer.pseudonym("CUST0001")
+    # The path parameter makes CUST0001 known, so the detail body's "id" is replaced too
+    assert pseudonymizer.endpoint("/api/customers/CUST0001") == f"/api/customers/{customer}"
+    detail = pseudonymizer.redact({"id": "CUST0001", "status": "ACTIVE", "referrer": "CUST0001"})
+    assert detail == {"id": customer, "status": "ACTIVE", "referrer": customer}
+    # Record IDs in customer and card collections are identifying even when not seen before
+    listing = pseudonymizer.redact({"customers": [{"id": "CUST0042"}], "credit_cards": [{"id": 7}], "offers": [{"id": 7}]})
+    assert listing["customers"][0]["id"] == pseudonymizer.pseudonym("CUST0042")
+    assert listing["credit_cards"][0]["id"] != 7
+    assert listing["offers"][0]["id"] == 7
+    # Known identifiers are kept as a bounded set of digests
+    pseudonymizer.redact({"customer_id": "CUST0099"})
+    assert len(pseudonymizer._known) == 2
+    assert not pseudonymizer.is_known("CUST0001") and pseudonymizer.is_known("CUST0099")
+    assert "CUST0099" not in repr(pseudonymizer.__dict__)
+
+def test_upstream_requests_outside_tool_calls_are_not_recorded(tmp_path):
+    traffic_recorder = TrafficRecorder(str(tmp_path / "traffic.ndjson"), Pseudonymizer("test"))
+    traffic_recorder.record_request({"method": "GET", "endpoint": "/api/offers", "params": {"page": 1}, "duration": 0.01, "response": {}})
+    assert traffic_recorder.upstream == 0
+    assert not (tmp_path / "traffic.ndjson").exists()
+
+def test_exchange_key_matches_wire_format():
+    recorded = exchange_key("GET", "/api/offers", {"page": 1, "active_only": True, "ids": [1, 2]})
+    replayed = exchange_key("GET", "/api/offers", [("ids", "2"), ("active_only", "true"), ("page", "1"), ("ids", "1")])
+    assert recorded == replayed
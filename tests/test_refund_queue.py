@@ -0,0 +1,87 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../'))
+
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastmcp import Client
+from main import mcp
+from models import RefundDecision
+from services import refund_queue
+
+def _refund(refund_id, refund_type, amount):
+    return {"id": refund_id, "refund_type": refund_type, "refund_amount": amount, "status": "REQUESTED"}
+
+def test_amount_band_edges():
+    """Amounts are placed in lower-inclusive bands with an open-ended top band"""
+    assert refund_queue.band_labels() == ["0-50", "50-250", "250-1000", "1000+"]
+    assert refund_queue.amount_band(0) == "0-50"
+    assert refund_queue.amount_band(50) == "50-250"
+    assert refund_queue.amount_band(999.99) == "250-1000"
+    assert refund_queue.amount_band(5000) == "1000+"
+
+def test_group_refunds_by_type_and_band():
+    """Refunds are grouped by type and band, largest exposure first"""
+    refunds = [
+        _refund(1, "goodwill", 20.0),
+        _refund(2, "goodwill", 30.0),
+        _refund(3, "dispute_resolution", 400.0),
+    ]
+    groups = refund_queue.group_refunds(refunds)
+    assert [g["refund_type"] for g in groups] == ["dispute_resolution", "goodwill"]
+    assert groups[1]["amount_band"] == "0-50"
+    assert groups[1]["count"] == 2
+    assert groups[1]["total_amount"] == 50.0
+    assert groups[1]["refund_ids"] == [1, 2]
+
+@pytest.mark.asyncio
+async def test_fetch_pending_refunds_reads_all_pages():
+    """Every page of REQUESTED refunds is pulled"""
+    pages = {
+        1: {"refunds": [_refund(1, "goodwill", 10.0)], "pages": 3},
+        2: {"refunds": [_refund(2, "goodwill", 10.0)], "pages": 3},
+        3: {"refunds": [_refund(3, "goodwill", 10.0)], "pages": 3},
+    }
+    with patch('models.api_client.get', new=AsyncMock(side_effect=lambda endpoint, params=None: pages[params["page"]])) as mock_get:
+        refunds = await refund_queue.fetch_pending_refunds()
+
+    assert [r["id"] for r in refunds] == [1, 2, 3]
+    assert all(call.kwargs["params"]["status"] == "REQUESTED" for call in mock_get.call_args_list)
+
+@pytest.mark.asyncio
+async def test_apply_decisions_ledger_records_failures():
+    """Each decision gets a ledger entry and one failure does not stop the batch"""
+    async def post(endpoint, data=None, params=None):
+        if endpoint == "/api/refunds/2/deny":
+            raise Exception("API Error: refund already processed")
+        return {"endpoint": endpoint}
+
+    progress = AsyncMock()
+    decisions = [
+        RefundDecision(refund_id=1, approved=True, admin_notes="ok"),
+        RefundDecision(refund_id=2, approved=False, denial_reason="duplicate"),
+        RefundDecision(refund_id=3, approved=True),
+    ]
+    with patch('models.api_client.post', new=AsyncMock(side_effect=post)) as mock_post:
+        result = await refund_queue.apply_decisions(decisions, batch_size=2, progress=progress)
+
+    assert result["processed"] == 3
+    assert result["succeeded"] == 2
+    assert result["failed"] == 1
+    assert [entry["refund_id"] for entry in result["ledger"]] == [1, 2, 3]
+    assert result["ledger"][1]["error"] == "API Error: refund already processed"
+    mock_post.assert_any_call("/api/refunds/1/approve", data={"approved": True, "admin_notes": "ok"})
+    assert progress.await_count == 3
+
+@pytest.mark.asyncio
+async def test_refund_queue_tools_via_client():
+    """The review queue tools are registered and callable over MCP"""
+    listing = {"refunds": [_refund(7, "goodwill", 75.0)], "pages": 1}
+    with patch('models.api_client.get', new=AsyncMock(return_value=listing)), \
+         patch('models.api_client.post', new=AsyncMock(return_value={"status": "APPROVED"})):
+        async with Client(mcp) as client:
+            queue = await client.call_tool("get_refund_review_queue", {})
+            assert queue.data["total_pending"] == 1
+            assert queue.data["groups"][0]["amount_band"] == "50-250"
+
+            result = await client.call_tool("process_refund_queue", {"decisions": [{"refund_id": 7, "approved": True}]})
+            assert result.data["succeeded"] == 1
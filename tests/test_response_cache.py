@@ -0,0 +1,146 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../'))
+
+import asyncio
+import subprocess
+import threading
+import time
+import pytest
+from unittest.mock import patch, AsyncMock
+from models import APIClient, CacheBackend, MemoryCacheBackend, SQLiteCacheBackend, PersistentCacheBackend, create_cache_backend
+from models.cache import cache_key
+
+ROOT = os.path.abspath(os.path.dirname(__file__) + '/../')
+
+def test_cache_key_ignores_param_order_and_none():
+    assert cache_key("/api/offers", {"b": 2, "a": 1, "c": None}) == cache_key("/api/offers", {"a": 1, "b": 2})
+    assert cache_key("/api/offers/categories") == "/api/offers/categories"
+
+def test_memory_backend_expires_and_evicts():
+    cache = MemoryCacheBackend(max_entries=2)
+    cache.set("a", "1", ttl=60)
+    cache.set("b", "2", ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("b") is None
+    cache.set("c", "3", ttl=60)
+    cache.set("d", "4", ttl=60)
+    assert cache.get("a") is None
+    assert cache.get("d") == "4"
+    assert cache.stats()["hits"] == 1
+
+def test_sqlite_backend_is_shared_between_processes(tmp_path):
+    """An entry written by another process is a hit here and outlives the writer"""
+    path = str(tmp_path / "responses.sqlite3")
+    code = f"from models.cache import SQLiteCacheBackend; SQLiteCacheBackend({path!r}).set('/api/merchants/categories', '[1]', 60)"
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+
+    cache = SQLiteCacheBackend(path)
+    assert cache.get("/api/merchants/categories") == "[1]"
+    cache.set("expired", "x", ttl=-1)
+    assert cache.get("expired") is None
+    assert len(cache) == 1
+    cache.close()
+
+def test_unknown_backend_rejected():
+    assert create_cache_backend("none") is None
+    with pytest.raises(ValueError, match="RESPONSE_CACHE_BACKEND"):
+        create_cache_backend("redis")
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+async def test_reference_data_served_from_cache(backend, tmp_path, monkeypatch):
+    monkeypatch.setenv("RESPONSE_CACHE_PATH", str(tmp_path / "responses.sqlite3"))
+    client = APIClient(cache=create_cache_backend(backend))
+    mock_request = AsyncMock(return_value={"categories": ["DINING", "TRAVEL"]})
+    with patch.object(client, "_make_request", new=mock_request):
+        first = await client.get("/api/offers/categories")
+        second = await client.get("/api/offers/categories")
+        await client.get("/api/offers", params={"page": 1})
+        await client.get("/api/offers", params={"page": 1})
+    assert first == second == {"categories": ["DINING", "TRAVEL"]}
+    # One upstream call for the cached categories, two for the uncached offer list
+    assert mock_request.await_count == 3
+    assert client.cache_stats()["hits"] == 1
+    assert client.cache_stats()["backend"] == backend
+
+def test_persistent_backend_is_warm_after_restart(tmp_path):
+    """A new backend on the same file serves earlier entries from memory without touching disk"""
+    path = str(tmp_path / "responses.sqlite3")
+    before = PersistentCacheBackend(path, compact_interval=0)
+    before.set("/offers/travel/airports", '["JFK"]', ttl=60)
+    before.set("stale", "x", ttl=-1)
+    before.close()
+
+    after = PersistentCacheBackend(path, compact_interval=0)
+    assert after.loaded_entries == 1
+    after.close()
+    # The in-memory copy keeps serving with the file closed
+    assert after.get("/offers/travel/airports") == '["JFK"]'
+
+def test_compaction_removes_expired_rows(tmp_path):
+    cache = PersistentCacheBackend(str(tmp_path / "responses.sqlite3"), compact_interval=0)
+    cache.set("live", "1", ttl=60)
+    cache.set("expired", "2", ttl=-1)
+    assert cache.compact()["removed"] == 1
+    assert cache.stats()["disk_entries"] == 1
+
+@pytest.mark.asyncio
+async def test_background_compaction_runs(tmp_path):
+    cache = PersistentCacheBackend(str(tmp_path / "responses.sqlite3"), compact_interval=0.01)
+    cache.set("expired", "x", ttl=-1)
+    cache.ensure_started()
+    try:
+        await asyncio.sleep(0.1)
+        assert cache.last_compaction is not None
+        assert cache.stats()["disk_entries"] == 0
+    finally:
+        cache._task.cancel()
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_cached_catalog(tmp_path, monkeypatch):
+    monkeypatch.setenv("RESPONSE_CACHE_CATALOG_TTL_SECONDS", "300")
+    client = APIClient(cache=PersistentCacheBackend(str(tmp_path / "responses.sqlite3"), compact_interval=0))
+    mock_request = AsyncMock(return_value={"offers": []})
+    with patch.object(client, "_make_request", new=mock_request):
+        await client.get("/api/offers", params={"page": 1})
+        await client.get("/api/offers", params={"page": 1})
+        assert mock_request.await_count == 1
+        await client.post("/api/offers/7/activate", data={"customer_id": "C1"})
+        await client.get("/api/offers", params={"page": 1})
+    assert mock_request.await_count == 3
+
+def test_write_in_one_worker_invalidates_catalog_in_another(tmp_path):
+    """Two backends on one file: catalog entries invalidated by one are gone for the other"""
+    path = str(tmp_path / "responses.sqlite3")
+    first = PersistentCacheBackend(path, compact_interval=0)
+    second = PersistentCacheBackend(path, compact_interval=0)
+    key = cache_key("/api/offers", {"page": 1})
+    first.set(key, '{"offers": []}', ttl=300)
+    assert second.get(key) == '{"offers": []}'
+    assert second.get(key) == '{"offers": []}'
+
+    first.invalidate_prefix("/api/offers")
+    assert first.get(key) is None
+    assert second.get(key) is None
+    first.close()
+    second.close()
+
+def test_backend_must_implement_storage_methods():
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+@pytest.mark.asyncio
+async def test_sqlite_calls_run_off_the_event_loop(tmp_path):
+    """Blocking backends are called from a worker thread, not the thread running the loop"""
+    client = APIClient(cache=SQLiteCacheBackend(str(tmp_path / "responses.sqlite3")))
+    loop_thread = threading.get_ident()
+    threads = []
+    get = client.cache.get
+    def recording_get(key):
+        threads.append(threading.get_ident())
+        return get(key)
+    with patch.object(client.cache, "get", new=recording_get), \
+         patch.object(client, "_make_request", new=AsyncMock(return_value={"categories": []})):
+        await client.get("/api/offers/categories")
+    assert threads and loop_thread not in threads
+    client.cache.close()
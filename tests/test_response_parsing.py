@@ -0,0 +1,82 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../'))
+
+import pytest
+from pydantic import ValidationError
+from fastmcp import FastMCP, Client
+from models import Payment, PaymentListResponse, Offer, ResponseParser
+from models.parsing import list_field, trusted_constructor
+
+PAYMENT = {
+    "id": 1, "credit_card_id": 3, "customer_id": "CU00000001", "amount": 12.5,
+    "merchant_name": "Cafe", "status": "COMPLETED", "reference_number": "REF00000001",
+    "transaction_date": "2025-01-02T03:04:05Z"
+}
+
+
+def page(items):
+    return {"payments": items, "total": len(items), "pages": 1, "current_page": 1, "per_page": 10}
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        ResponseParser(mode="lenient")
+
+
+def test_full_mode_validates_and_raises_on_failure():
+    parser = ResponseParser(mode="full")
+    result = parser.parse_page(PaymentListResponse, page([PAYMENT, {**PAYMENT, "id": 2}]))
+    assert result.payments[0].status.value == "COMPLETED"
+    assert parser.stats()["models"]["Payment"] == {"validated": 2, "constructed": 0, "failures": 0}
+    with pytest.raises(ValidationError):
+        parser.parse(Payment, {**PAYMENT, "amount": "lots"})
+    assert parser.stats()["failures"] == 1
+    assert parser.stats()["last_failure"]["model"] == "Payment"
+
+
+def test_sampled_mode_validates_one_in_n_and_counts_failures():
+    parser = ResponseParser(mode="sampled", sample_rate=4)
+    items = [{**PAYMENT, "id": i, "amount": "bad" if i == 4 else 1.0} for i in range(10)]
+    result = parser.parse_list(Payment, items)
+    counts = parser.stats()["models"]["Payment"]
+    assert counts["validated"] == 2  # items 0 and 8
+    assert counts["failures"] == 1  # item 4, kept as sent
+    assert counts["constructed"] == 8
+    assert result[4].amount == "bad"
+    assert parser.stats()["sample_rate"] == 4
+
+
+def test_trusted_mode_matches_model_construct():
+    parser = ResponseParser(mode="trusted")
+    result = parser.parse_page(PaymentListResponse, page([{**PAYMENT, "unknown": True}]))
+    payment = result.payments[0]
+    assert payment == Payment.model_construct(**PAYMENT)
+    assert payment.model_fields_set == set(PAYMENT)
+    assert payment.created_at is None
+    assert list(payment.model_dump(warnings=False)) == list(Payment.model_fields)
+    assert result.total == 1
+    assert parser.stats()["models"] == {"Payment": {"validated": 0, "constructed": 1, "failures": 0}}
+
+
+def test_trusted_constructor_fills_defaults():
+    offer = trusted_constructor(Offer)({"id": 5, "title": "Deal"})
+    assert offer.title == "Deal"
+    assert offer.model_fields_set == {"id", "title"}
+    assert set(offer.model_dump()) == set(Offer.model_fields)
+
+
+def test_list_field():
+    assert list_field(PaymentListResponse) == "payments"
+    assert list_field(Payment) is None
+
+
+@pytest.mark.asyncio
+async def test_server_metrics_report_validation_counters():
+    from tools import register_all_tools
+
+    mcp = FastMCP("test-server")
+    register_all_tools(mcp, groups=["health"])
+    async with Client(mcp) as client:
+        result = (await client.call_tool("get_server_metrics", {})).data
+    assert result["response_validation"]["mode"] == "full"
+    assert "failures" in result["response_validation"]
@@ -0,0 +1,66 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../'))
+
+import signal
+import subprocess
+import time
+import pytest
+from fastmcp import Client
+from server.serving import worker_count, check_transport, create_app
+from benchmarks.processes import free_port, wait_for_port, stop
+
+ROOT = os.path.abspath(os.path.dirname(__file__) + '/../')
+
+def test_worker_count_from_environment(monkeypatch):
+    monkeypatch.delenv("WORKERS", raising=False)
+    assert worker_count() == 1
+    monkeypatch.setenv("WORKERS", "3")
+    assert worker_count() == 3
+    monkeypatch.setenv("WORKERS", "auto")
+    assert worker_count() == (os.cpu_count() or 1)
+    monkeypatch.setenv("WORKERS", "0")
+    with pytest.raises(ValueError):
+        worker_count()
+
+def test_multiple_workers_require_stateless_transport(monkeypatch):
+    monkeypatch.delenv("TOOL_GROUPS_ON_DEMAND", raising=False)
+    check_transport("sse", 1)
+    check_transport("http", 4)
+    with pytest.raises(ValueError, match="SSE sessions"):
+        check_transport("sse", 2)
+
+def test_multiple_workers_reject_on_demand_tool_groups(monkeypatch):
+    """Groups loaded on demand would exist in one worker only"""
+    monkeypatch.setenv("TOOL_GROUPS_ON_DEMAND", "true")
+    check_transport("http", 1)
+    with pytest.raises(ValueError, match="TOOL_GROUPS_ENABLED"):
+        check_transport("http", 2)
+
+def test_create_app_serves_mcp_path(monkeypatch):
+    monkeypatch.setenv("MCP_HTTP_PATH", "/rpc")
+    app = create_app()
+    assert any(getattr(route, "path", None) == "/rpc" for route in app.routes)
+
+async def _call_status(url):
+    async with Client(url) as client:
+        result = await client.call_tool("get_offer_catalog_status", {})
+        return result.data
+
+@pytest.mark.asyncio
+async def test_worker_pool_serves_and_reloads():
+    """WORKERS=2 serves stateless streamable HTTP on one port and keeps serving across a SIGHUP reload"""
+    port = free_port()
+    env = {**os.environ, "TRANSPORT": "http", "PORT": str(port), "WORKERS": "2", "LOG_LEVEL": "warning"}
+    server = subprocess.Popen([sys.executable, "main.py"], cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(port)
+        url = f"http://127.0.0.1:{port}/mcp"
+        for _ in range(4):
+            assert "replica" in await _call_status(url)
+
+        server.send_signal(signal.SIGHUP)
+        time.sleep(1.0)
+        assert server.poll() is None
+        assert "replica" in await _call_status(url)
+    finally:
+        stop(server)
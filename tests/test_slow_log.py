@@ -0,0 +1,77 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../'))
+
+import json
+import pytest
+from fastmcp import Client
+from models import api_client
+from server.slow_log import SlowCallLog, install_slow_log, redact, parse_thresholds
+
+@pytest.fixture
+def slow_logged(tmp_path, stub_server):
+    mcp = stub_server(["health", "payment"], name="slow-log-check")
+    log = SlowCallLog(str(tmp_path / "slow_calls.ndjson"), threshold_ms=10_000, tool_thresholds={"list_payments": 0}, fingerprint_key="test")
+    install_slow_log(mcp, log=log)
+    yield mcp, log
+    api_client.request_hooks[:] = [h for h in api_client.request_hooks if not isinstance(getattr(h, "__self__", None), SlowCallLog)]
+
+def read_entries(log):
+    with open(log.path) as f:
+        return [json.loads(line) for line in f]
+
+@pytest.mark.asyncio
+async def test_slow_calls_logged_with_upstream_requests(slow_logged):
+    mcp, log = slow_logged
+    async with Client(mcp) as client:
+        await client.call_tool("list_payments", {"customer_id": "CUST0001", "status": "COMPLETED", "per_page": 5})
+        await client.call_tool("list_payments", {"customer_id": "CUST0002", "status": "COMPLETED", "per_page": 5})
+        # Under its threshold: not logged
+        await client.call_tool("health_check", {})
+
+    first, second = read_entries(log)
+    assert first["tool"] == "list_payments"
+    assert first["arguments"]["customer_id"] == "<redacted>"
+    assert first["arguments"]["status"] == "COMPLETED"
+    assert first["arguments"]["per_page"] == 5
+    assert "CUST0001" not in json.dumps(first)
+    # Same kind of call, different values
+    assert first["shape"] == second["shape"]
+    assert first["fingerprint"] != second["fingerprint"]
+
+    (upstream,) = first["upstream"]
+    assert upstream["method"] == "GET"
+    assert upstream["path"] == "/api/payments"
+    assert upstream["status_code"] == 200
+    assert upstream["response_bytes"] > 0
+    assert first["result_bytes"] > 0
+    assert first["upstream_ms"] <= first["duration_ms"]
+
+@pytest.mark.asyncio
+async def test_failed_calls_logged_with_error(slow_logged):
+    mcp, log = slow_logged
+    log.tool_thresholds["get_payment_details"] = 0
+    async with Client(mcp) as client:
+        with pytest.raises(Exception):
+            await client.call_tool("get_payment_details", {"payment_id": 1})
+    (entry,) = read_entries(log)
+    assert entry["error"]
+    assert entry["upstream"][0]["status_code"] == 404
+    assert entry["upstream"][0]["error"] is True
+
+def test_redaction_and_thresholds():
+    arguments = {
+        "card_number": "4111111111111111", "query": "John Smith", "status": "PENDING",
+        "start_date": "2025-01-31", "amount": 12.5, "items": [{"name": "x"}], "payment": {"email": "a@b.c", "currency": "USD"}
+    }
+    assert redact(arguments) == {
+        "card_number": "<redacted>", "query": "<str:10>", "status": "PENDING", "start_date": "2025-01-31",
+        "amount": 12.5, "items": "<list:1>", "payment": {"email": "<redacted>", "currency": "USD"}
+    }
+    assert parse_thresholds("list_payments=500, search_travel_packages=3000") == {"list_payments": 500.0, "search_travel_packages": 3000.0}
+
+def test_log_rotates(tmp_path):
+    log = SlowCallLog(str(tmp_path / "slow_calls.ndjson"), max_bytes=600, fingerprint_key="test")
+    for _ in range(5):
+        log.write(log.entry("list_offers", {"page": 1}, 1.5, [], 100, None))
+    assert (tmp_path / "slow_calls.ndjson.1").exists()
+    assert os.path.getsize(log.path) <= 600
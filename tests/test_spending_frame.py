@@ -0,0 +1,97 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../'))
+
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastmcp import Client
+from main import mcp
+from services.spending_frame import SpendingFrame, SpendingFrameCache, spending_frames
+
+def _payment(payment_id, amount, date, category="RESTAURANT", status="COMPLETED", merchant="Cafe"):
+    return {
+        "id": payment_id, "credit_card_id": 1, "customer_id": "CU00000001", "amount": amount,
+        "merchant_name": merchant, "merchant_category": category, "status": status,
+        "transaction_date": date, "reference_number": f"TXN-{payment_id}",
+    }
+
+PAYMENTS = [
+    _payment(5, 50.0, "2024-02-10T12:00:00Z", category="GROCERY_STORE", merchant="Market"),
+    _payment(4, 30.0, "2024-02-05T09:00:00Z"),
+    _payment(3, 20.0, "2024-01-31T23:00:00Z", status="REFUNDED"),
+    _payment(2, 10.0, "2024-01-15T08:00:00Z"),
+    _payment(1, 40.0, "2024-01-01T00:00:00Z", category=None, merchant="Market"),
+]
+
+def _frame():
+    frame = SpendingFrame()
+    frame.extend(PAYMENTS)
+    return frame
+
+def test_rollup_by_month():
+    """Monthly totals, counts and averages"""
+    result = _frame().rollup(group_by="month")
+    assert [g["key"] for g in result["groups"]] == ["2024-01", "2024-02"]
+    assert result["groups"][0]["total_amount"] == 70.0
+    assert result["groups"][1]["transaction_count"] == 2
+    assert result["summary"]["total_amount"] == 150.0
+    assert result["summary"]["percentiles"]["p50"] == 30.0
+
+def test_rollup_by_week_starts_on_monday():
+    """Weekly buckets are labelled with the Monday they start on"""
+    result = _frame().rollup(group_by="week")
+    assert [g["key"] for g in result["groups"]] == ["2024-01-01", "2024-01-15", "2024-01-29", "2024-02-05"]
+
+def test_rollup_by_category_with_filters():
+    """Status and date filters apply before grouping; missing categories are bucketed"""
+    result = _frame().rollup(group_by="merchant_category", statuses=["COMPLETED"], end_date="2024-01-31")
+    assert {g["key"]: g["total_amount"] for g in result["groups"]} == {"UNCATEGORIZED": 40.0, "RESTAURANT": 10.0}
+
+def test_rollup_by_status_and_percentiles():
+    """Per-group percentiles are computed on each group's amounts"""
+    result = _frame().rollup(group_by="status", percentiles=[50, 100])
+    completed = next(g for g in result["groups"] if g["key"] == "COMPLETED")
+    assert completed["percentiles"] == {"p50": 35.0, "p100": 50.0}
+
+def test_rollup_rejects_unknown_grouping():
+    with pytest.raises(ValueError):
+        _frame().rollup(group_by="hour")
+
+def test_extend_skips_known_payments():
+    frame = _frame()
+    assert frame.extend(PAYMENTS[:2]) == 0
+    assert frame.last_seen_id == 5
+    assert len(frame.merchant_names.values) == 2
+
+@pytest.mark.asyncio
+async def test_cache_fetches_only_new_payments():
+    """A repeat query stops at the page holding the last-seen payment"""
+    cache = SpendingFrameCache(full_refresh_seconds=3600)
+    with patch('models.api_client.get', new=AsyncMock(return_value={"payments": PAYMENTS[1:], "pages": 1})):
+        first = await cache.get(customer_id="CU00000001")
+    assert first["refresh"] == "full"
+    assert first["new_payments"] == 4
+
+    pages = {1: {"payments": PAYMENTS[:2], "pages": 3}, 2: {"payments": PAYMENTS[2:4], "pages": 3}}
+    with patch('models.api_client.get', new=AsyncMock(side_effect=lambda endpoint, params=None: pages[params["page"]])) as mock_get:
+        second = await cache.get(customer_id="CU00000001")
+    assert second["refresh"] == "incremental"
+    assert second["new_payments"] == 1
+    assert second["last_seen_id"] == 5
+    assert mock_get.await_count == 1
+
+def test_scope_requires_exactly_one_subject():
+    with pytest.raises(ValueError):
+        SpendingFrameCache.scope_key()
+    with pytest.raises(ValueError):
+        SpendingFrameCache.scope_key(customer_id="CU1", merchant_name="Cafe")
+
+@pytest.mark.asyncio
+async def test_local_spending_analytics_tool():
+    """The tool streams payments into the frame and returns the rollup"""
+    spending_frames.clear()
+    with patch('models.api_client.get', new=AsyncMock(return_value={"payments": PAYMENTS, "pages": 1})):
+        async with Client(mcp) as client:
+            result = await client.call_tool("get_local_spending_analytics", {"merchant_name": "Market", "group_by": "none"})
+    spending_frames.clear()
+    assert result.data["summary"]["transaction_count"] == 5
+    assert result.data["cache"]["payments_cached"] == 5
@@ -0,0 +1,36 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../'))
+
+import pytest
+from main import mcp
+from tools import TOOL_GROUPS, registration_timings
+from server.startup import parse_importtime, summarize_imports, profile_startup
+
+# Cold-start budget for the regression check; generous so slow CI machines still pass
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "10000"))
+
+IMPORTTIME_SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       243 |        243 |   _io
+import time:      1200 |       5000 | fastmcp.server
+import time:       800 |       6000 | fastmcp
+"""
+
+def test_parse_importtime():
+    modules = parse_importtime(IMPORTTIME_SAMPLE)
+    assert [m["module"] for m in modules] == ["_io", "fastmcp.server", "fastmcp"]
+    assert modules[0]["depth"] == 1
+    summary = summarize_imports(modules, top=2)
+    assert summary["slowest_modules"][0]["module"] == "fastmcp"
+    assert summary["packages_ms"]["fastmcp"] == 2.0
+
+def test_registration_timed_per_group():
+    """Importing main records the cost of every register_*_tools call"""
+    assert set(registration_timings) == {group for group, _ in TOOL_GROUPS}
+    assert all(seconds >= 0 for seconds in registration_timings.values())
+
+def test_cold_start_within_budget():
+    """A fresh interpreter reaches a ready server within the startup budget"""
+    report = profile_startup()
+    assert report["tool_count"] > 0
+    assert set(report["registration_ms"]) == {group for group, _ in TOOL_GROUPS}
+    assert report["time_to_ready_ms"] <= STARTUP_BUDGET_MS
@@ -0,0 +1,82 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../'))
+
+import random
+import re
+import statistics
+import httpx
+import jsonschema
+import pytest
+from fastmcp import Client
+from models import OfferListResponse, MerchantListResponse, RewardListResponse, RefundListResponse, Payment
+from benchmarks.stub_backend import create_stub_app, sample_latency
+
+def stub_client(app):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://stub")
+
+def example_url(path):
+    path = path.replace("{customer_id}", "CU00000001").replace("{booking_reference}", "BK00000001")
+    return re.sub(r"\{[^}]+\}", "7", path)
+
+@pytest.mark.asyncio
+async def test_every_swagger_operation_returns_conformant_data():
+    app = create_stub_app(latency_ms=0, swagger=True, items=25)
+    stub = app.state.swagger_stub
+    assert len({path for _, path in stub.operations}) == 63
+    async with stub_client(app) as client:
+        for (method, path), (status, schema) in stub.operations.items():
+            response = await client.request(method, example_url(path), json={} if method in ("POST", "PUT") else None)
+            assert response.status_code in (status, 200), f"{method} {path}"
+            if path not in ("/api/health", "/api/payments"):
+                jsonschema.validate(response.json(), stub.inline(schema))
+
+@pytest.mark.asyncio
+async def test_list_responses_paginate_and_validate_as_models():
+    app = create_stub_app(latency_ms=0, swagger=True, items=25)
+    async with stub_client(app) as client:
+        offers = (await client.get("/api/offers", params={"page": 3, "per_page": 10})).json()
+        assert [offer["id"] for offer in offers["offers"]] == [21, 22, 23, 24, 25]
+        assert (offers["total"], offers["pages"], offers["current_page"]) == (25, 3, 3)
+        OfferListResponse.model_validate(offers)
+        MerchantListResponse.model_validate((await client.get("/api/merchants")).json())
+        RefundListResponse.model_validate((await client.get("/api/refunds", params={"status": "PENDING"})).json())
+        rewards = (await client.get("/api/rewards/customer/CU00000001", params={"status": "EARNED"})).json()
+        RewardListResponse.model_validate(rewards)
+        # Query filters are echoed into matching item fields
+        assert {reward["status"] for reward in rewards["rewards"]} == {"EARNED"}
+
+        first = (await client.get("/api/payments/7")).json()
+        assert first == (await client.get("/api/payments/7")).json()
+        assert Payment.model_validate(first).id == 7
+        created = (await client.post("/api/offers", json={"title": "Weekend dining", "discount_percentage": 15})).json()
+        # Create responses echo the request body
+        assert (created["title"], created["discount_percentage"]) == ("Weekend dining", 15)
+
+@pytest.mark.asyncio
+async def test_error_injection_and_overrides():
+    app = create_stub_app(latency_ms=0, swagger=True, error_rate=0.5, overrides={"/api/offers/categories": {"error_rate": 0}}, seed=1)
+    async with stub_client(app) as client:
+        statuses = [(await client.get("/api/merchants")).status_code for _ in range(100)]
+        assert 30 < statuses.count(200) < 70
+        assert set(statuses) <= {200, 500, 503}
+        assert [(await client.get("/api/offers/categories")).status_code for _ in range(20)] == [200] * 20
+    assert app.state.stats["errors_injected"] == statuses.count(500) + statuses.count(503)
+
+@pytest.mark.parametrize("distribution", ["fixed", "uniform", "exponential", "lognormal"])
+def test_latency_distributions_keep_the_mean(distribution):
+    rng = random.Random(0)
+    samples = [sample_latency(rng, 20.0, distribution) for _ in range(5000)]
+    assert statistics.mean(samples) == pytest.approx(0.020, rel=0.1)
+
+def test_unknown_distribution_rejected():
+    with pytest.raises(ValueError, match="latency_distribution"):
+        create_stub_app(latency_distribution="pareto")
+
+@pytest.mark.asyncio
+async def test_tools_run_against_full_stub(stub_server):
+    mcp = stub_server(["offer", "payment", "reward", "integration"], name="stub-check", swagger=True)
+    async with Client(mcp) as client:
+        assert (await client.call_tool("get_payment_details", {"payment_id": 3})).data["id"] == 3
+        assert len((await client.call_tool("list_offers", {"per_page": 5})).data["offers"]) == 5
+        assert "available_points" in (await client.call_tool("get_customer_reward_balance", {"customer_id": "CU00000012"})).data
+        assert (await client.call_tool("get_available_airports", {})).data["airports"]
@@ -0,0 +1,128 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../'))
+
+import asyncio
+import json
+import pytest
+from unittest.mock import patch, AsyncMock
+from fastmcp import FastMCP, Client
+from fastmcp.tools.tool import FunctionTool
+from server import tool_cache
+from tools import register_all_tools, schema_cache_stats
+
+def _build_server():
+    server = FastMCP(name="cache-check")
+    register_all_tools(server)
+    tools_by_name = asyncio.run(server.get_tools())
+    manifest = {
+        name: (tool.description, tool.parameters, tool.output_schema, tool.tags, tool.meta, tool.enabled)
+        for name, tool in tools_by_name.items()
+    }
+    return server, manifest
+
+@pytest.fixture
+def cache_path(tmp_path, monkeypatch):
+    path = tmp_path / "tool_manifest.json"
+    monkeypatch.setenv("TOOL_SCHEMA_CACHE_PATH", str(path))
+    monkeypatch.setenv("TOOL_SCHEMA_CACHE_ENABLED", "true")
+    monkeypatch.setenv("CUSTOMER_ADMIN_ENABLED", "true")
+    return path
+
+def test_cached_registration_matches_generated(cache_path):
+    """A warm manifest registers every tool with the same metadata and schemas as generation"""
+    _, generated = _build_server()
+    assert cache_path.exists()
+    assert schema_cache_stats["misses"] == len(generated)
+
+    _, cached = _build_server()
+    assert schema_cache_stats["loaded"] is True
+    assert schema_cache_stats["hits"] == len(generated)
+    assert schema_cache_stats["misses"] == 0
+    assert cached == generated
+
+def test_source_change_invalidates_manifest(cache_path):
+    """Entries written for another source hash are ignored and regenerated"""
+    _build_server()
+    data = json.loads(cache_path.read_text())
+    data["source_hash"] = "stale"
+    cache_path.write_text(json.dumps(data))
+
+    _build_server()
+    assert schema_cache_stats["loaded"] is False
+    assert schema_cache_stats["hits"] == 0
+    assert json.loads(cache_path.read_text())["source_hash"] == tool_cache.source_hash()
+
+def test_source_hash_tracks_tool_sources(tmp_path, monkeypatch):
+    (tmp_path / "tools").mkdir()
+    source = tmp_path / "tools" / "example_tools.py"
+    source.write_text("A = 1\n")
+    monkeypatch.setattr(tool_cache, "ROOT", str(tmp_path))
+    before = tool_cache.source_hash()
+    assert tool_cache.source_hash() == before
+    source.write_text("A = 2\n")
+    assert tool_cache.source_hash() != before
+
+def test_unwritable_cache_is_skipped(tmp_path, monkeypatch):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    monkeypatch.setenv("TOOL_SCHEMA_CACHE_PATH", str(blocker / "tool_manifest.json"))
+    _, generated = _build_server()
+    assert len(generated) >= 71
+    assert schema_cache_stats["loaded"] is False
+
+@pytest.mark.asyncio
+async def test_cached_tools_validate_arguments(cache_path):
+    """Tools built from the manifest still parse and validate their arguments"""
+    await asyncio.to_thread(_build_server)
+    server, _ = await asyncio.to_thread(_build_server)
+    assert schema_cache_stats["hits"] > 0
+
+    mock_post = AsyncMock(return_value={"id": "C1"})
+    with patch('models.api_client.post', new=mock_post):
+        async with Client(server) as client:
+            result = await client.call_tool("create_customer", {"customer": {"first_name": "Ada", "last_name": "Lovelace", "email": "ada@example.com"}})
+            assert result.data == {"id": "C1"}
+            with pytest.raises(Exception):
+                await client.call_tool("create_customer", {"customer": {"first_name": "Ada"}})
+    assert mock_post.await_args.kwargs["data"]["email"] == "ada@example.com"
+
+def _serializing_server(serializer):
+    server = FastMCP(name="cache-check", tool_serializer=serializer)
+    register_all_tools(server, groups=["offer"])
+    return server
+
+async def _categories_text(server):
+    with patch('models.api_client.get', new=AsyncMock(return_value={"categories": ["DINING", "FUEL"]})):
+        async with Client(server) as client:
+            result = await client.call_tool("get_offer_categories", {})
+    return result.content[0].text
+
+@pytest.mark.asyncio
+async def test_cached_tools_use_the_server_serializer(cache_path, monkeypatch):
+    """Tools built from the manifest serialize output with the server's tool_serializer, like generated tools"""
+    def serializer(data):
+        return "custom:" + json.dumps(data, sort_keys=True)
+
+    monkeypatch.setenv("TOOL_SCHEMA_CACHE_ENABLED", "false")
+    generated = await _categories_text(await asyncio.to_thread(_serializing_server, serializer))
+    monkeypatch.setenv("TOOL_SCHEMA_CACHE_ENABLED", "true")
+    await asyncio.to_thread(_serializing_server, serializer)
+    cached_server = await asyncio.to_thread(_serializing_server, serializer)
+    assert schema_cache_stats["hits"] > 0 and schema_cache_stats["fallbacks"] == 0
+    assert await _categories_text(cached_server) == generated == 'custom:{"categories": ["DINING", "FUEL"]}'
+
+def test_incompatible_function_tool_falls_back_to_fastmcp(cache_path):
+    """A FunctionTool constructor that rejects the cached arguments registers tools through FastMCP.tool"""
+    class IncompatibleFunctionTool(FunctionTool):
+        def __init__(self, **kwargs):
+            raise TypeError("unexpected keyword argument 'serializer'")
+
+        @classmethod
+        def from_function(cls, *args, **kwargs):
+            return FunctionTool.from_function(*args, **kwargs)
+
+    _, generated = _build_server()
+    with patch('fastmcp.tools.tool.FunctionTool', IncompatibleFunctionTool):
+        _, fallback = _build_server()
+    assert schema_cache_stats["fallbacks"] == schema_cache_stats["hits"] == len(generated)
+    assert fallback == generated
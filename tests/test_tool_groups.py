@@ -0,0 +1,70 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../'))
+
+import json
+import subprocess
+import pytest
+from fastmcp import FastMCP, Client
+from tools import register_all_tools, selected_tool_groups, TOOL_GROUPS
+from server.startup import READY_MARKER
+
+ROOT = os.path.abspath(os.path.dirname(__file__) + '/../')
+
+def test_selected_tool_groups_from_environment(monkeypatch):
+    monkeypatch.delenv("TOOL_GROUPS_ENABLED", raising=False)
+    assert selected_tool_groups() == [group for group, _ in TOOL_GROUPS]
+    monkeypatch.setenv("TOOL_GROUPS_ENABLED", " reward, payment ")
+    # Always in registration order, whatever order they are listed in
+    assert selected_tool_groups() == ["payment", "reward"]
+    assert selected_tool_groups("all,reward") == [group for group, _ in TOOL_GROUPS]
+    with pytest.raises(ValueError, match="Unknown tool groups: loyalty"):
+        selected_tool_groups("reward,loyalty")
+
+@pytest.mark.asyncio
+async def test_only_selected_groups_are_registered(monkeypatch):
+    monkeypatch.delenv("TOOL_GROUPS_ON_DEMAND", raising=False)
+    server = FastMCP(name="groups-check")
+    loader = register_all_tools(server, groups=["payment", "reward"])
+    names = set(await server.get_tools())
+    assert loader.loaded == ["payment", "reward"]
+    assert "list_payments" in names and "get_customer_rewards" in names
+    assert "list_offers" not in names and "health_check" not in names
+    assert "load_tool_groups" not in names
+    # Loading a group twice registers nothing new
+    assert loader.load(["reward"]) == []
+
+@pytest.mark.asyncio
+async def test_groups_load_on_demand(monkeypatch):
+    """With on-demand loading, load_tool_groups registers further groups for the session"""
+    monkeypatch.setenv("TOOL_GROUPS_ON_DEMAND", "true")
+    server = FastMCP(name="on-demand-check")
+    register_all_tools(server, groups=["health"])
+    async with Client(server) as client:
+        names = {tool.name for tool in await client.list_tools()}
+        assert names == {"health_check", "get_server_metrics", "list_tool_groups", "load_tool_groups"}
+
+        result = await client.call_tool("load_tool_groups", {"groups": ["reward"]})
+        assert result.data["loaded"] == ["reward"]
+        assert result.data["active_groups"] == ["health", "reward"]
+        assert "integration" in result.data["available_groups"]
+        names = {tool.name for tool in await client.list_tools()}
+        assert "get_customer_rewards" in names
+
+        result = await client.call_tool("load_tool_groups", {"groups": ["reward"]})
+        assert result.data["loaded"] == []
+        with pytest.raises(Exception):
+            await client.call_tool("load_tool_groups", {"groups": ["loyalty"]})
+
+def test_unselected_group_modules_are_not_imported():
+    """A worker serving only rewards never imports the other tool modules and reports its groups"""
+    code = (
+        "import sys, main; from server.startup import emit_ready_report; emit_ready_report(main.mcp); "
+        "print(sorted(m for m in sys.modules if m.startswith('tools.') and m.endswith('_tools')))"
+    )
+    env = {**os.environ, "TOOL_GROUPS_ENABLED": "reward"}
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    lines = result.stdout.strip().splitlines()
+    report = json.loads(next(line for line in lines if line.startswith(READY_MARKER))[len(READY_MARKER):])
+    assert report["tool_groups"] == ["reward"]
+    assert 0 < report["tool_count"] <= 8
+    assert lines[-1] == "['tools.reward_tools']"
@@ -0,0 +1,45 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../'))
+
+import asyncio
+import importlib
+import subprocess
+import pytest
+from unittest.mock import patch
+from fastmcp import FastMCP
+import tools
+from tools import params, TOOL_GROUPS, group_register
+
+def _build_schemas():
+    """Re-import every tool module against the current markers and collect tool schemas"""
+    server = FastMCP(name="schema-check")
+    for group, _ in TOOL_GROUPS:
+        register = group_register(group)
+        module = importlib.reload(sys.modules[register.__module__])
+        getattr(module, register.__name__)(server)
+    tools_by_name = asyncio.run(server.get_tools())
+    return {name: (tool.parameters, tool.output_schema) for name, tool in tools_by_name.items()}
+
+def test_schemas_match_fastapi_markers():
+    """pydantic Field markers produce the same input schema as fastapi Query/Path/Body for every tool"""
+    fastapi = pytest.importorskip("fastapi")
+    try:
+        with patch.multiple(params, Query=fastapi.Query, Path=fastapi.Path, Body=fastapi.Body):
+            with_fastapi = _build_schemas()
+        with_pydantic = _build_schemas()
+    finally:
+        for group, _ in TOOL_GROUPS:
+            importlib.reload(sys.modules[group_register(group).__module__])
+
+    assert len(with_pydantic) >= 71
+    assert with_pydantic.keys() == with_fastapi.keys()
+    for name in with_pydantic:
+        assert with_pydantic[name] == with_fastapi[name], name
+
+def test_server_import_does_not_load_fastapi():
+    """Importing the server no longer pulls in FastAPI"""
+    result = subprocess.run(
+        [sys.executable, "-c", "import sys, main; print('fastapi' in sys.modules)"],
+        cwd=os.path.abspath(os.path.dirname(__file__) + '/../'), capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
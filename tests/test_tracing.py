@@ -0,0 +1,114 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../'))
+
+import io
+import json
+import time
+import pytest
+from fastmcp import Client
+from models import api_client
+from server.tracing import install_tracing, InMemorySpanExporter, FileSpanExporter, ConsoleSpanExporter, Span, Tracer, STATUS_ERROR
+from benchmarks.stub_backend import create_stub_app
+
+@pytest.fixture
+def traced(stub_server):
+    seen_headers = []
+    app = create_stub_app(latency_ms=0)
+
+    async def capture(scope, receive, send):
+        seen_headers.append(dict((k.decode(), v.decode()) for k, v in scope.get("headers", [])))
+        await app(scope, receive, send)
+
+    mcp = stub_server(["payment", "offer"], name="tracing-check", app=capture)
+    exporter = InMemorySpanExporter()
+    install_tracing(mcp, exporter=exporter)
+    yield mcp, exporter, seen_headers
+    api_client.request_hooks[:] = [h for h in api_client.request_hooks if not isinstance(getattr(h, "__self__", None), Tracer)]
+    api_client.header_hooks.clear()
+
+@pytest.mark.asyncio
+async def test_tool_span_with_upstream_children(traced):
+    mcp, exporter, seen_headers = traced
+    async with Client(mcp) as client:
+        await client.call_tool("list_payments", {"per_page": 5})
+
+    tool_span = next(s for s in exporter.spans if s.name == "tools/call list_payments")
+    children = [s for s in exporter.spans if s.parent_span_id == tool_span.span_id]
+    assert [s.name for s in children] == ["HTTP GET /api/payments"]
+    child = children[0]
+    assert child.trace_id == tool_span.trace_id
+    assert child.attributes["http.response.status_code"] == 200
+    assert "http.request.resend_count" not in child.attributes
+    assert tool_span.start_ns <= child.start_ns <= child.end_ns <= tool_span.end_ns
+    assert tool_span.attributes["mcp.tool.local_ms"] >= 0
+    # The backend receives the W3C trace context of the upstream request's parent
+    assert seen_headers[-1]["traceparent"] == f"00-{tool_span.trace_id}-{tool_span.span_id}-01"
+
+@pytest.mark.asyncio
+async def test_cache_hits_and_errors_are_recorded(traced):
+    mcp, exporter, _ = traced
+    async with Client(mcp) as client:
+        # The stub has no /api/offers/categories route: the upstream request fails
+        with pytest.raises(Exception):
+            await client.call_tool("get_offer_categories", {})
+    tool_span = next(s for s in exporter.spans if s.name == "tools/call get_offer_categories")
+    child = next(s for s in exporter.spans if s.parent_span_id == tool_span.span_id)
+    assert tool_span.status == STATUS_ERROR
+    assert child.status == STATUS_ERROR
+    assert child.attributes["http.response.status_code"] == 404
+    assert child.attributes["cache.hit"] is False
+
+    tracer = Tracer(exporter=exporter)
+    with tracer.start_span("tools/call cached") as span:
+        tracer.record_request({"method": "GET", "endpoint": "/offers/travel/airports", "start_ns": span.start_ns, "duration": 0.0001, "cache": "hit"})
+    assert exporter.spans[-2].attributes["cache.hit"] is True
+
+def test_otlp_export_to_file_and_console(tmp_path):
+    root = Span("tools/call list_offers", attributes={"mcp.tool.name": "list_offers"})
+    child = Span("HTTP GET /api/offers", root, {"http.response.status_code": 200})
+    root.end_ns = child.end_ns = root.start_ns + 1000
+
+    path = tmp_path / "traces.ndjson"
+    exporter = FileSpanExporter(str(path), max_bytes=10_000)
+    exporter.export(child)
+    exporter.export(root)
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert lines[0]["parentSpanId"] == lines[1]["spanId"]
+    assert lines[0]["traceId"] == lines[1]["traceId"]
+    assert lines[0]["attributes"] == [{"key": "http.response.status_code", "value": {"intValue": "200"}}]
+
+    stream = io.StringIO()
+    ConsoleSpanExporter(stream).export(root)
+    assert json.loads(stream.getvalue())["name"] == "tools/call list_offers"
+
+def test_file_exporter_rotates(tmp_path):
+    path = tmp_path / "traces.ndjson"
+    exporter = FileSpanExporter(str(path), max_bytes=300)
+    for _ in range(5):
+        span = Span("tools/call health_check")
+        span.end_ns = span.start_ns
+        exporter.export(span)
+    assert (tmp_path / "traces.ndjson.1").exists()
+    assert path.stat().st_size <= 300
+
+def test_unsampled_calls_record_nothing():
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(exporter=exporter, sample_rate=0.0)
+    with tracer.start_span("tools/call list_offers") as span:
+        assert span is None
+        tracer.record_request({"method": "GET", "endpoint": "/api/offers", "start_ns": 0, "duration": 0.01})
+    assert exporter.spans == []
+
+def test_concurrent_upstream_requests_are_not_double_counted():
+    """Overlapping child spans count once towards upstream time, so local time never goes negative"""
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(exporter=exporter, sample_rate=1.0)
+    with tracer.start_span("tools/call list_offers") as span:
+        start = span.start_ns
+        for offset_ms, duration in ((0, 0.004), (1, 0.004), (10, 0.002)):
+            tracer.record_request({"method": "GET", "endpoint": "/api/offers", "start_ns": start + offset_ms * 1_000_000, "duration": duration})
+        time.sleep(0.015)
+    # Requests at 0-4ms and 1-5ms overlap (5ms), plus 10-12ms
+    assert span.child_ns() == 7_000_000
+    assert span.attributes["mcp.tool.upstream_ms"] <= (span.end_ns - span.start_ns) / 1e6
+    assert span.attributes["mcp.tool.local_ms"] >= 0
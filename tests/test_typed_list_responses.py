@@ -0,0 +1,78 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../'))
+
+import json
+import pytest
+from pydantic import ValidationError
+from fastmcp import Client
+from models import api_client, ResponseParser, PaymentListResponse, OfferListResponse, LIST_RESPONSE_ADAPTERS
+
+LIST_TOOLS = {
+    "list_payments": ({}, "payments"),
+    "list_offers": ({}, "offers"),
+    "list_merchants": ({}, "merchants"),
+    "get_customer_rewards": ({"customer_id": "CU00000001"}, "rewards"),
+    "list_refunds": ({}, "refunds"),
+}
+
+
+def test_adapters_cover_the_list_responses():
+    assert {model.__name__ for model in LIST_RESPONSE_ADAPTERS} == {
+        "OfferListResponse", "PaymentListResponse", "MerchantListResponse", "RewardListResponse", "RefundListResponse"
+    }
+
+
+def test_strict_validation_from_bytes():
+    parser = ResponseParser(mode="full")
+    body = {"payments": [{
+        "id": 1, "credit_card_id": 3, "customer_id": "CU00000001", "amount": 12.5, "merchant_name": "Cafe",
+        "status": "COMPLETED", "reference_number": "REF00000001", "transaction_date": "2025-01-02T03:04:05Z"
+    }], "total": 1, "pages": 1, "current_page": 1, "per_page": 10}
+    page = parser.parse_list_response(PaymentListResponse, json.dumps(body).encode())
+    assert page.payments[0].transaction_date.year == 2025
+    assert parser.stats()["models"]["Payment"]["validated"] == 1
+    # Strict: numbers sent as strings are rejected rather than coerced
+    body["payments"][0]["credit_card_id"] = "3"
+    with pytest.raises(ValidationError):
+        parser.parse_list_response(PaymentListResponse, json.dumps(body).encode())
+    assert parser.stats()["models"]["Payment"]["failures"] == 1
+
+
+def test_trusted_mode_decodes_once_without_validation():
+    parser = ResponseParser(mode="trusted")
+    raw = json.dumps({"offers": [{"id": 1, "title": "Deal"}], "total": 1, "pages": 1, "current_page": 1, "per_page": 10}).encode()
+    page = parser.parse_list_response(OfferListResponse, raw)
+    assert page.offers[0].title == "Deal"
+    assert parser.stats()["models"]["Offer"] == {"validated": 0, "constructed": 1, "failures": 0}
+
+
+@pytest.mark.asyncio
+async def test_list_tools_return_typed_responses_when_enabled(monkeypatch, stub_server):
+    mcp = stub_server(["payment", "offer", "merchant", "reward", "refund"], swagger=True, items=25)
+    async with Client(mcp) as client:
+        untyped = {name: (await client.call_tool(name, args)).data for name, (args, _) in LIST_TOOLS.items()}
+        monkeypatch.setenv("TYPED_LIST_RESPONSES", "true")
+        typed = {name: (await client.call_tool(name, args)).data for name, (args, _) in LIST_TOOLS.items()}
+    for name, (_, key) in LIST_TOOLS.items():
+        assert typed[name]["total"] == untyped[name]["total"] > 0, name
+        assert [item["id"] for item in typed[name][key]] == [item["id"] for item in untyped[name][key]], name
+        # Typed responses carry every model field, including ones upstream left out
+        model = next(model for model in LIST_RESPONSE_ADAPTERS if key in model.model_fields)
+        item_model = model.model_fields[key].annotation.__args__[0]
+        assert set(typed[name][key][0]) == set(item_model.model_fields), name
+
+
+@pytest.mark.asyncio
+async def test_get_raw_uses_the_response_cache(stub_backend):
+    stub_backend(swagger=True, items=25)
+    records = []
+    api_client.request_hooks.append(records.append)
+    try:
+        first = await api_client.get_raw("/api/offers/categories")
+        second = await api_client.get_raw("/api/offers/categories")
+        decoded = await api_client.get("/api/offers/categories")
+    finally:
+        api_client.request_hooks.remove(records.append)
+    assert isinstance(first, bytes) and json.loads(first) == json.loads(second) == decoded
+    assert [record["cache"] for record in records] == ["miss", "hit", "hit"]
+    assert records[0]["raw_response"] == first and records[0]["response"] is None
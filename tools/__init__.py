@@ -1,27 +1,48 @@
-from .health_tools import register_health_tools
-from .customer_tools import register_customer_tools
-from .credit_card_tools import register_credit_card_tools
-from .merchant_tools import register_merchant_tools
-from .payment_tools import register_payment_tools
-from .offer_tools import register_offer_tools
-from .reward_tools import register_reward_tools
-from .refund_tools import register_refund_tools
-from .booking_tools import register_booking_tools
-from .integration_tools import register_integration_tools
+from typing import Optional, List
+from server.metrics import install_metrics
+from server.tracing import install_tracing
+from server.profiling import install_profiling
+from server.slow_log import install_slow_log
+from server.recording import install_recording
+from .groups import (
+    TOOL_GROUPS, GROUP_NAMES, ToolGroupLoader, group_register, selected_tool_groups, on_demand_enabled,
+    registration_timings, schema_cache_stats
+)
 
-def register_all_tools(mcp):
-    """Register all MCP tools with the FastMCP instance - cleaned up to match swagger.json exactly"""
-    register_health_tools(mcp)           # 1 tool: /api/health
-    register_customer_tools(mcp)         # 5 tools: /api/customers/*
-    register_credit_card_tools(mcp)      # 4 tools: /api/customers/{id}/credit-cards/*
-    register_merchant_tools(mcp)         # 7 tools: /api/merchants/*
-    register_payment_tools(mcp)          # 5 tools: /api/payments/*
-    register_offer_tools(mcp)            # 9 tools: /api/offers/*
-    register_reward_tools(mcp)           # 8 tools: /api/rewards/*
-    register_refund_tools(mcp)           # 6 tools: /api/refunds/*
-    register_booking_tools(mcp)          # 2 tools: /api/bookings/* (minimal API)
-    register_integration_tools(mcp)      # 24 tools: /api/tokens/*, /offers/*, /simulator/*
-    # Total: 71 tools matching swagger.json exactly
+# Loader used by the last register_all_tools call; loads further groups on demand
+tool_group_loader: Optional[ToolGroupLoader] = None
+
+def register_all_tools(mcp, groups: Optional[List[str]] = None):
+    """Register all MCP tools with the FastMCP instance - cleaned up to match swagger.json exactly
+
+    Only the groups selected by TOOL_GROUPS_ENABLED (default: all) are registered. With
+    TOOL_GROUPS_ON_DEMAND=true the list_tool_groups/load_tool_groups tools are added so
+    clients can load the remaining groups when they first need them.
+    """
+    global tool_group_loader
+    # Per-tool and upstream latency histograms, served at /metrics and by get_server_metrics
+    install_metrics(mcp)
+    # Spans per tool call and upstream request when TRACING_ENABLED=true
+    install_tracing(mcp)
+    # cProfile captures of selected tool calls when PROFILING_ENABLED=true
+    install_profiling(mcp)
+    # NDJSON entries for tool calls over their latency threshold when SLOW_LOG_ENABLED=true
+    install_slow_log(mcp)
+    # Redacted traffic recording for benchmarks/replay.py when RECORDING_ENABLED=true
+    install_recording(mcp)
+    tool_group_loader = ToolGroupLoader(mcp)
+    if on_demand_enabled():
+        from .tool_group_tools import register_tool_group_tools
+        register_tool_group_tools(tool_group_loader)
+    tool_group_loader.load(selected_tool_groups() if groups is None else groups)
+    return tool_group_loader
+
+def __getattr__(name):
+    # register_<group>_tools are imported on first use so unselected groups are never imported
+    for group in GROUP_NAMES:
+        if name == f"register_{group}_tools":
+            return group_register(group)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     "register_health_tools",
@@ -34,5 +55,12 @@ __all__ = [
     "register_refund_tools",
     "register_booking_tools",
     "register_integration_tools",
-    "register_all_tools"
+    "register_all_tools",
+    "TOOL_GROUPS",
+    "ToolGroupLoader",
+    "group_register",
+    "selected_tool_groups",
+    "registration_timings",
+    "schema_cache_stats",
+    "tool_group_loader"
 ]
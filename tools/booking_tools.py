@@ -1,5 +1,5 @@
 from fastmcp import FastMCP
-from fastapi import Path, Body
+from .params import Path, Body
 from models import BookingModification, api_client
 
 def register_booking_tools(mcp: FastMCP):
@@ -0,0 +1,62 @@
+from typing import Any, Dict, List, Literal, Sequence
+from pydantic import BaseModel
+
+# Opt-in columnar output for large list results: output_format="columnar" replaces the item
+# list with each field name once and a column array of its values, and stores
+# categorical fields (status, merchant_category...) as a dictionary of distinct values
+# plus an integer code per row, so repeated keys and strings are not repeated on the
+# wire or in the model's context.
+
+# Type of the tools' output_format parameter; the schema lists the choices
+OutputFormat = Literal["rows", "columnar"]
+# Code of a missing value in a dictionary-encoded column, as in services.payment_store
+NULL_CODE = -1
+
+
+def to_columns(items: List[Dict[str, Any]], categorical: Sequence[str] = ()) -> Dict[str, Any]:
+    """Row dicts as {"format", "count", "columns", "dictionaries"}
+
+    Columns follow the order fields first appear in; a row without a field has None in
+    that column. A categorical field is dictionary-encoded only when some value repeats.
+    """
+    names: Dict[str, None] = {}
+    for item in items:
+        names.update(dict.fromkeys(item))
+    columns = {name: [item.get(name) for item in items] for name in names}
+    dictionaries = {}
+    for name in categorical:
+        values = columns.get(name)
+        if values is None or not all(value is None or type(value) in (str, int) for value in values):
+            continue
+        present = [value for value in values if value is not None]
+        distinct = list(dict.fromkeys(present))
+        if len(distinct) >= len(present):
+            continue
+        code_of = {value: code for code, value in enumerate(distinct)}
+        columns[name] = [NULL_CODE if value is None else code_of[value] for value in values]
+        dictionaries[name] = distinct
+    return {"format": "columnar", "count": len(items), "columns": columns, "dictionaries": dictionaries}
+
+
+def from_columns(table: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Row dicts back from to_columns output"""
+    dictionaries = table.get("dictionaries", {})
+    columns = {
+        name: [None if code == NULL_CODE else dictionaries[name][code] for code in values] if name in dictionaries else values
+        for name, values in table["columns"].items()
+    }
+    return [{name: values[row] for name, values in columns.items()} for row in range(table["count"])]
+
+
+def columnar(response: Any, items_key: str, categorical: Sequence[str] = (), output_format: OutputFormat = "columnar") -> Any:
+    """response with response[items_key] in columnar form when output_format is "columnar"
+
+    Typed list responses are dumped to JSON-ready dicts first.
+    """
+    if output_format != "columnar":
+        return response
+    if isinstance(response, BaseModel):
+        response = response.model_dump(mode="json", warnings=False)
+    if not isinstance(response, dict) or not isinstance(response.get(items_key), list):
+        return response
+    return {**response, items_key: to_columns(response[items_key], categorical)}
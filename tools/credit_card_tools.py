@@ -1,5 +1,5 @@
 from fastmcp import FastMCP
-from fastapi import Query, Path, Body
+from .params import Query, Path, Body
 from typing import Optional
 from models import (
     CreditCard, CreditCardCreate, CreditCardUpdate, CreditCardListResponse,
@@ -1,6 +1,7 @@
 from fastmcp import FastMCP
-from fastapi import Query, Path, Body
-from typing import Optional
+from .params import Query, Path, Body
+from .projection import check_fields, push_fields, project, fields_description
+from typing import Optional, List
 import os
 from models import (
     Customer, CustomerCreate, CustomerUpdate, CustomerListResponse, api_client
@@ -22,13 +23,15 @@ def register_customer_tools(mcp: FastMCP):
     async def list_customers(
         page: int = Query(1, description="Page number for pagination"),
         per_page: int = Query(10, description="Number of customers per page"),
-        email: Optional[str] = Query(None, description="Filter customers by email address")
+        email: Optional[str] = Query(None, description="Filter customers by email address"),
+        fields: Optional[List[str]] = Query(None, description=fields_description(Customer, ['customer_id', 'first_name', 'last_name']))
     ) -> dict:
         """List all customers with pagination and optional email filtering"""
+        fields = check_fields(Customer, fields)
         params = {"page": page, "per_page": per_page}
         if email:
             params["email"] = email
-        return await api_client.get("/api/customers", params=params)
+        return project(await api_client.get("/api/customers", params=push_fields(params, fields)), Customer, fields, "customers")
 
     @mcp.tool(
         name="create_customer",
@@ -48,9 +51,13 @@ def register_customer_tools(mcp: FastMCP):
         tags={"customers", "details", "profile", "support"},
         meta={"version": "1.0", "category": "customer_management"}
     )
-    async def get_customer_details(customer_id: str = Path(..., description="Customer alphanumeric ID to retrieve")) -> dict:
+    async def get_customer_details(
+        customer_id: str = Path(..., description="Customer alphanumeric ID to retrieve"),
+        fields: Optional[List[str]] = Query(None, description=fields_description(Customer, ['customer_id', 'first_name', 'last_name']))
+    ) -> dict:
         """Get detailed customer information"""
-        return await api_client.get(f"/api/customers/{customer_id}")
+        fields = check_fields(Customer, fields)
+        return project(await api_client.get(f"/api/customers/{customer_id}", params=push_fields({}, fields) or None), Customer, fields)
 
     @mcp.tool(
         name="update_customer",
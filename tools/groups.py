@@ -0,0 +1,98 @@
+import importlib
+import os
+import time
+from typing import Optional, List, Dict, Any, Iterable
+from server.tool_cache import ToolManifest, CachingToolRegistrar, schema_cache_enabled
+
+# Tool groups in registration order, with the tools module defining register_<group>_tools
+TOOL_GROUPS = [
+    ("health", "health_tools"),            # 5 tools: /api/health (incl. server metrics, profiling admin)
+    ("customer", "customer_tools"),        # 5 tools: /api/customers/*
+    ("credit_card", "credit_card_tools"),  # 4 tools: /api/customers/{id}/credit-cards/*
+    ("merchant", "merchant_tools"),        # 7 tools: /api/merchants/*
+    ("payment", "payment_tools"),          # 7 tools: /api/payments/* (incl. local analytics, payment store)
+    ("offer", "offer_tools"),              # 11 tools: /api/offers/* (incl. local match_offers, catalog status)
+    ("reward", "reward_tools"),            # 8 tools: /api/rewards/*
+    ("refund", "refund_tools"),            # 8 tools: /api/refunds/* (incl. review queue)
+    ("booking", "booking_tools"),          # 2 tools: /api/bookings/* (minimal API)
+    ("integration", "integration_tools"),  # 24 tools: /api/tokens/*, /offers/*, /simulator/*
+]
+# Total: 71 tools matching swagger.json exactly, plus the composite tools noted above
+GROUP_NAMES = [group for group, _ in TOOL_GROUPS]
+
+# Seconds spent in each register_*_tools call (including tool schema generation)
+registration_timings = {}
+
+# Hit/miss counts and location of the tool schema cache used by the last registration
+schema_cache_stats = {}
+
+
+def group_register(group: str):
+    """Import a group's tools module and return its register_<group>_tools function"""
+    module = dict(TOOL_GROUPS).get(group)
+    if module is None:
+        raise ValueError(f"Unknown tool group '{group}'. Available groups: {', '.join(GROUP_NAMES)}")
+    return getattr(importlib.import_module(f"tools.{module}"), f"register_{group}_tools")
+
+
+def selected_tool_groups(value: Optional[str] = None) -> List[str]:
+    """Groups named in TOOL_GROUPS_ENABLED (comma separated, default "all") in registration order"""
+    if value is None:
+        value = os.getenv("TOOL_GROUPS_ENABLED", "all")
+    names = {name.strip().lower() for name in value.split(",") if name.strip()}
+    if not names or "all" in names:
+        return list(GROUP_NAMES)
+    unknown = sorted(names - set(GROUP_NAMES))
+    if unknown:
+        raise ValueError(f"Unknown tool groups: {', '.join(unknown)}. Available groups: {', '.join(GROUP_NAMES)}")
+    return [group for group in GROUP_NAMES if group in names]
+
+
+def on_demand_enabled() -> bool:
+    return os.getenv("TOOL_GROUPS_ON_DEMAND", "false").lower() == "true"
+
+
+class ToolGroupLoader:
+    """Registers tool groups with a FastMCP server, each at most once
+
+    Group modules are only imported when their group is loaded, so groups a
+    deployment never uses cost neither import time, memory nor tools/list payload.
+    """
+
+    def __init__(self, mcp):
+        self.mcp = mcp
+        self.manifest = ToolManifest() if schema_cache_enabled() else None
+        self.registrar = CachingToolRegistrar(mcp, self.manifest) if self.manifest is not None else mcp
+        self.loaded: List[str] = []
+
+    @property
+    def available(self) -> List[str]:
+        return [group for group in GROUP_NAMES if group not in self.loaded]
+
+    def load(self, groups: Iterable[str]) -> List[str]:
+        """Register the given groups that are not loaded yet; returns the newly loaded ones"""
+        groups = list(groups)
+        requested = selected_tool_groups(",".join(groups)) if groups else []
+        loaded = []
+        for group in requested:
+            if group in self.loaded:
+                continue
+            register = group_register(group)
+            started = time.perf_counter()
+            register(self.registrar)
+            registration_timings[group] = time.perf_counter() - started
+            self.loaded.append(group)
+            loaded.append(group)
+        self.loaded.sort(key=GROUP_NAMES.index)
+        schema_cache_stats.clear()
+        if self.manifest is not None:
+            self.manifest.save()
+            schema_cache_stats.update(self.manifest.stats())
+        return loaded
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active_groups": list(self.loaded),
+            "available_groups": self.available,
+            "registration_ms": {group: round(registration_timings[group] * 1000, 2) for group in self.loaded if group in registration_timings},
+        }
@@ -1,8 +1,16 @@
 from fastmcp import FastMCP
-from models import api_client
+from typing import Optional, List
+import os
+from .params import Query, Body
+from models import api_client, response_parser
+from server.metrics import metrics
+from server import profiling
 
 def register_health_tools(mcp: FastMCP):
     """Register health-related MCP tools"""
+
+    # Read admin tools enabled setting from environment
+    admin_tools_enabled = os.getenv("ADMIN_TOOLS_ENABLED", "false").lower() == "true"
     
     @mcp.tool(
         name="health_check",
@@ -13,3 +21,69 @@ def register_health_tools(mcp: FastMCP):
     async def health_check() -> dict:
         """Health check endpoint to verify API status"""
         return await api_client.get("/api/health")
+
+    @mcp.tool(
+        name="get_server_metrics",
+        description="Report MCP server performance metrics collected since startup: call count, error count and latency percentiles (p50/p95/p99) for every tool, the same for upstream API requests grouped by method and path template, response cache hit rates and response validation counters (items validated, constructed without validation and failed validation per model). Used to find slow tools and slow backend endpoints.",
+        tags={"health", "monitoring", "diagnostics", "performance"},
+        meta={"version": "1.0", "category": "system_health"}
+    )
+    async def get_server_metrics(
+        tool_name: Optional[str] = Query(None, description="Only report metrics for this tool")
+    ) -> dict:
+        """Get per-tool and upstream latency metrics"""
+        return {
+            **metrics.snapshot(tool_name),
+            "response_cache": api_client.cache_stats(),
+            "response_validation": response_parser.stats()
+        }
+
+    def _profiler() -> profiling.ToolProfiler:
+        if profiling.profiler is None:
+            raise ValueError("Tool profiling is disabled; start the server with PROFILING_ENABLED=true")
+        return profiling.profiler
+
+    @mcp.tool(
+        name="configure_tool_profiling",
+        description="Choose which tool invocations are captured with cProfile: a list of tool names to profile on every call ('*' for all tools) and a sampling rate for the remaining calls. Profiles are written to a rotating directory on the server. Requires PROFILING_ENABLED=true.",
+        tags={"admin", "profiling", "performance", "diagnostics"},
+        meta={"version": "1.0", "category": "system_administration"},
+        enabled=admin_tools_enabled
+    )
+    async def configure_tool_profiling(
+        tool_names: Optional[List[str]] = Body(None, description="Tools to profile on every call; an empty list stops per-tool profiling"),
+        sample_rate: Optional[float] = Query(None, ge=0, le=1, description="Fraction of other tool calls to profile (0 to 1)")
+    ) -> dict:
+        """Set the tools and sampling rate for profiling"""
+        profiler = _profiler()
+        profiler.configure(tool_names=tool_names, sample_rate=sample_rate)
+        return profiler.stats()
+
+    @mcp.tool(
+        name="list_tool_profiles",
+        description="List the stored cProfile captures of tool invocations, newest first, with the tool name, capture time, call duration and file size of each profile.",
+        tags={"admin", "profiling", "performance", "diagnostics"},
+        meta={"version": "1.0", "category": "system_administration"},
+        enabled=admin_tools_enabled
+    )
+    async def list_tool_profiles(
+        tool_name: Optional[str] = Query(None, description="Only list profiles of this tool")
+    ) -> dict:
+        """List stored tool profiles"""
+        profiler = _profiler()
+        return {"profiles": profiler.list_profiles(tool_name), "profiler": profiler.stats()}
+
+    @mcp.tool(
+        name="get_tool_profile",
+        description="Retrieve one stored tool profile as a pstats report: total calls and time, the top functions by cumulative time, own time or call count, and the formatted pstats text, including time spent in upstream HTTP, JSON decoding and pydantic validation.",
+        tags={"admin", "profiling", "performance", "diagnostics"},
+        meta={"version": "1.0", "category": "system_administration"},
+        enabled=admin_tools_enabled
+    )
+    async def get_tool_profile(
+        profile_id: str = Query(..., description="Profile ID from list_tool_profiles"),
+        sort_by: str = Query("cumulative", description="Sort functions by cumulative, tottime or ncalls"),
+        limit: int = Query(30, ge=1, le=200, description="Number of functions to report")
+    ) -> dict:
+        """Get a stored tool profile report"""
+        return _profiler().report(profile_id, sort_by=sort_by, limit=limit)
@@ -1,10 +1,12 @@
 from fastmcp import FastMCP
-from fastapi import Query, Path, Body
-from typing import Optional
+from .params import Query, Path, Body
+from .projection import check_fields, push_fields, project, fields_description
+from typing import Optional, List
 import os
 from models import (
     Merchant, MerchantCreate, MerchantUpdate, MerchantListResponse,
-    MerchantAnalytics, MerchantCategoriesResponse, MerchantCategory, api_client
+    MerchantAnalytics, MerchantCategoriesResponse, MerchantCategory,
+    api_client, response_parser, typed_list_responses_enabled
 )
 
 def register_merchant_tools(mcp: FastMCP):
@@ -24,7 +26,8 @@ def register_merchant_tools(mcp: FastMCP):
         page: int = Query(1, description="Page number for pagination"),
         per_page: int = Query(10, description="Number of merchants per page"),
         category: Optional[MerchantCategory] = Query(None, description="Filter by merchant category"),
-        is_active: Optional[bool] = Query(None, description="Filter by merchant active status")
+        is_active: Optional[bool] = Query(None, description="Filter by merchant active status"),
+        fields: Optional[List[str]] = Query(None, description=fields_description(Merchant, ['id', 'name', 'category']))
     ) -> dict:
         """List all merchants with filtering options"""
         params = {"page": page, "per_page": per_page}
@@ -33,7 +36,14 @@ def register_merchant_tools(mcp: FastMCP):
             params["category"] = category.value if hasattr(category, 'value') else str(category)
         if is_active is not None:
             params["is_active"] = is_active
-        return await api_client.get("/api/merchants", params=params)
+        fields = check_fields(Merchant, fields)
+        typed = typed_list_responses_enabled()
+        push_fields(params, fields, typed)
+        if typed:
+            response = response_parser.parse_list_response(MerchantListResponse, await api_client.get_raw("/api/merchants", params=params))
+        else:
+            response = await api_client.get("/api/merchants", params=params)
+        return project(response, Merchant, fields, "merchants")
 
     @mcp.tool(
         name="create_merchant",
@@ -55,9 +65,13 @@ def register_merchant_tools(mcp: FastMCP):
         tags={"merchants", "profile", "details", "support"},
         meta={"version": "1.0", "category": "merchant_management"}
     )
-    async def get_merchant_details(merchant_id: int = Path(..., description="Merchant ID to retrieve")) -> dict:
+    async def get_merchant_details(
+        merchant_id: int = Path(..., description="Merchant ID to retrieve"),
+        fields: Optional[List[str]] = Query(None, description=fields_description(Merchant, ['id', 'name', 'category']))
+    ) -> dict:
         """Get detailed merchant information"""
-        return await api_client.get(f"/api/merchants/{merchant_id}")
+        fields = check_fields(Merchant, fields)
+        return project(await api_client.get(f"/api/merchants/{merchant_id}", params=push_fields({}, fields) or None), Merchant, fields)
 
     @mcp.tool(
         name="update_merchant",
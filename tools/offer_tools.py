@@ -1,11 +1,16 @@
 from fastmcp import FastMCP
-from fastapi import Query, Path, Body
-from typing import Optional
+from .params import Query, Path, Body
+from .projection import check_fields, push_fields, project, fields_description
+from typing import Optional, List
 import os
+import time
 from models import (
     Offer, OfferCreate, OfferUpdate, OfferListResponse, OfferActivationRequest,
-    OfferActivation, OfferCategory, api_client
+    OfferActivation, OfferCategory, MerchantCategory,
+    api_client, response_parser, typed_list_responses_enabled
 )
+from services.offer_index import offer_index
+from services.offer_catalog import offer_catalog
 
 def register_offer_tools(mcp: FastMCP):
     """Register offer-related MCP tools"""
@@ -25,9 +30,20 @@ def register_offer_tools(mcp: FastMCP):
         category: Optional[OfferCategory] = Query(None, description="Filter offers by category"),
         merchant_id: Optional[int] = Query(None, description="Filter offers by specific merchant ID"),
         is_active: Optional[bool] = Query(None, description="Filter by offer active status"),
-        customer_id: Optional[str] = Query(None, description="Include customer-specific offer data (alphanumeric customer ID)")
+        customer_id: Optional[str] = Query(None, description="Include customer-specific offer data (alphanumeric customer ID)"),
+        fields: Optional[List[str]] = Query(None, description=fields_description(Offer, ['id', 'title', 'discount_percentage']))
     ) -> dict:
         """List available offers with filtering options"""
+        fields = check_fields(Offer, fields)
+        typed = typed_list_responses_enabled()
+        if not customer_id:
+            # Customer-specific fields only exist upstream; everything else can come from the replica
+            replica_page = await offer_catalog.list_offers(
+                page=page, per_page=per_page, category=category, merchant_id=merchant_id, is_active=is_active
+            )
+            if replica_page is not None:
+                response = response_parser.parse_page(OfferListResponse, replica_page) if typed else replica_page
+                return project(response, Offer, fields, "offers")
         params = {"page": page, "per_page": per_page}
         if category:
             params["category"] = category.value if hasattr(category, 'value') else str(category)
@@ -37,7 +53,12 @@ def register_offer_tools(mcp: FastMCP):
             params["is_active"] = is_active
         if customer_id:
             params["customer_id"] = customer_id
-        return await api_client.get("/api/offers", params=params)
+        push_fields(params, fields, typed)
+        if typed:
+            response = response_parser.parse_list_response(OfferListResponse, await api_client.get_raw("/api/offers", params=params))
+        else:
+            response = await api_client.get("/api/offers", params=params)
+        return project(response, Offer, fields, "offers")
 
     @mcp.tool(
         name="create_offer",
@@ -59,9 +80,13 @@ def register_offer_tools(mcp: FastMCP):
         tags={"offers", "details", "analytics", "performance"},
         meta={"version": "1.0", "category": "offer_management"}
     )
-    async def get_offer(offer_id: int = Path(..., description="Offer ID to retrieve")) -> dict:
+    async def get_offer(
+        offer_id: int = Path(..., description="Offer ID to retrieve"),
+        fields: Optional[List[str]] = Query(None, description=fields_description(Offer, ['id', 'title', 'discount_percentage']))
+    ) -> dict:
         """Get detailed information about a specific offer"""
-        return await api_client.get(f"/api/offers/{offer_id}")
+        fields = check_fields(Offer, fields)
+        return project(await api_client.get(f"/api/offers/{offer_id}", params=push_fields({}, fields) or None), Offer, fields)
 
     @mcp.tool(
         name="update_offer",
@@ -145,3 +170,67 @@ def register_offer_tools(mcp: FastMCP):
     async def get_offer_categories() -> dict:
         """Get all available offer categories"""
         return await api_client.get("/api/offers/categories")
+
+    @mcp.tool(
+        name="match_offers",
+        description="Find the best offers for a purchase using the local offer index. Matches the purchase amount, merchant and merchant category against offer targeting, minimum transaction amount, validity dates and active status, and returns eligible offers ranked by computed discount and reward points without paging through the offer catalog. Results are flagged stale when the offer catalog replica cannot be brought up to date.",
+        tags={"offers", "matching", "discounts", "recommendations"},
+        meta={"version": "1.0", "category": "offer_management"}
+    )
+    async def match_offers(
+        amount: float = Query(..., gt=0, description="Purchase amount"),
+        merchant_name: Optional[str] = Query(None, description="Merchant name of the purchase (case-insensitive exact match)"),
+        merchant_category: Optional[MerchantCategory] = Query(None, description="Merchant category of the purchase"),
+        customer_id: Optional[str] = Query(None, description="Exclude offers the customer has used up and flag activated offers (alphanumeric customer ID)"),
+        merchant_id: Optional[int] = Query(None, description="Merchant ID of the purchase"),
+        limit: int = Query(5, description="Maximum number of offers to return")
+    ) -> dict:
+        """Rank eligible offers for a purchase from the local offer index"""
+        warning = None
+        if offer_catalog.enabled:
+            try:
+                await offer_catalog.ensure_started()
+            except Exception as e:
+                raise ValueError(f"Offer catalog replica could not complete its first sync: {e}") from e
+            if not offer_catalog.is_fresh():
+                # Background syncs are failing or behind; try once now, else match on the last good scan
+                try:
+                    await offer_catalog.sync()
+                except Exception as e:
+                    warning = (
+                        f"Offer catalog replica is {offer_catalog.lag_seconds():.0f}s old (max lag "
+                        f"{offer_catalog.max_lag:.0f}s); matches use the last good scan. Last sync error: {e}"
+                    )
+        else:
+            await offer_index.ensure_fresh()
+        customer_state = await offer_index.customer_state(customer_id) if customer_id else None
+        started = time.perf_counter_ns()
+        matches = offer_index.match(
+            amount,
+            merchant_name=merchant_name,
+            merchant_category=merchant_category,
+            merchant_id=merchant_id,
+            customer_state=customer_state,
+            limit=limit
+        )
+        elapsed_us = (time.perf_counter_ns() - started) / 1000
+        result = {
+            "amount": amount,
+            "matches": matches,
+            "match_time_us": round(elapsed_us, 1),
+            "stale": warning is not None,
+            "index": offer_index.stats()
+        }
+        if warning:
+            result["warning"] = warning
+        return result
+
+    @mcp.tool(
+        name="get_offer_catalog_status",
+        description="Report the state of the local offer catalog replica and offer index: number of replicated offers, time of the last catalog scan, replication lag, scan duration, offers added/updated/removed by the last scan, and sync error counts for freshness monitoring.",
+        tags={"offers", "monitoring", "catalog", "system_status"},
+        meta={"version": "1.0", "category": "offer_management"}
+    )
+    async def get_offer_catalog_status() -> dict:
+        """Get offer replica freshness and lag metrics"""
+        return {"replica": offer_catalog.stats(), "index": offer_index.stats()}
@@ -0,0 +1,21 @@
+from typing import Any
+from pydantic import Field
+
+# Parameter metadata for tool signatures. FastMCP only needs pydantic FieldInfo to
+# build input schemas, so these stand in for fastapi's Query/Path/Body markers without
+# importing FastAPI. The three names document where the upstream API expects the value.
+
+
+def Query(default: Any = ..., **kwargs: Any) -> Any:
+    """A value sent to the API as a query string parameter"""
+    return Field(default, **kwargs)
+
+
+def Path(default: Any = ..., **kwargs: Any) -> Any:
+    """A value substituted into the API endpoint path"""
+    return Field(default, **kwargs)
+
+
+def Body(default: Any = ..., **kwargs: Any) -> Any:
+    """A value sent to the API as the JSON request body"""
+    return Field(default, **kwargs)
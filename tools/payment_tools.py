@@ -1,10 +1,17 @@
 from fastmcp import FastMCP
-from fastapi import Query, Path, Body
-from typing import Optional
+from .params import Query, Path, Body
+from .projection import check_fields, push_fields, project, fields_description
+from .columnar import OutputFormat, columnar
+from typing import Optional, List
 from models import (
     Payment, PaymentCreate, PaymentRefund, PaymentListResponse,
-    PaymentStatus, SpendingAnalytics, api_client
+    PaymentStatus, SpendingAnalytics,
+    api_client, response_parser, typed_list_responses_enabled
 )
+from services.spending_frame import spending_frames, DEFAULT_PERCENTILES
+
+# Payment fields dictionary-encoded in output_format="columnar" results
+PAYMENT_CATEGORICAL_FIELDS = ("status", "merchant_category", "merchant_name", "customer_id")
 
 def register_payment_tools(mcp: FastMCP):
     """Register payment-related MCP tools"""
@@ -20,7 +27,9 @@ def register_payment_tools(mcp: FastMCP):
         per_page: int = Query(10, description="Number of payments per page"),
         customer_id: Optional[str] = Query(None, description="Filter payments by specific customer alphanumeric ID"),
         status: Optional[PaymentStatus] = Query(None, description="Filter by payment status (PENDING, COMPLETED, FAILED, REFUNDED)"),
-        merchant_name: Optional[str] = Query(None, description="Filter by merchant name (partial match, case-insensitive)")
+        merchant_name: Optional[str] = Query(None, description="Filter by merchant name (partial match, case-insensitive)"),
+        fields: Optional[List[str]] = Query(None, description=fields_description(Payment, ['id', 'amount', 'merchant_name', 'status'])),
+        output_format: OutputFormat = Query("rows", description="rows: a list of payment objects; columnar: each field name once with an array of values per field, and status, merchant category, merchant name and customer ID as codes into a per-field dictionary of distinct values (smaller for large pages)")
     ) -> dict:
         """List payments with various filtering options"""
         params = {"page": page, "per_page": per_page}
@@ -30,7 +39,14 @@ def register_payment_tools(mcp: FastMCP):
             params["status"] = status.value if hasattr(status, 'value') else str(status)
         if merchant_name:
             params["merchant_name"] = merchant_name
-        return await api_client.get("/api/payments", params=params)
+        fields = check_fields(Payment, fields)
+        typed = typed_list_responses_enabled()
+        push_fields(params, fields, typed)
+        if typed:
+            response = response_parser.parse_list_response(PaymentListResponse, await api_client.get_raw("/api/payments", params=params))
+        else:
+            response = await api_client.get("/api/payments", params=params)
+        return columnar(project(response, Payment, fields, "payments"), "payments", PAYMENT_CATEGORICAL_FIELDS, output_format)
 
     @mcp.tool(
         name="make_payment",
@@ -49,9 +65,13 @@ def register_payment_tools(mcp: FastMCP):
         tags={"payments", "transaction_details", "customer_service", "tracking"},
         meta={"version": "1.0", "category": "payment_processing"}
     )
-    async def get_payment_details(payment_id: int = Path(..., description="Payment ID to retrieve details for")) -> dict:
+    async def get_payment_details(
+        payment_id: int = Path(..., description="Payment ID to retrieve details for"),
+        fields: Optional[List[str]] = Query(None, description=fields_description(Payment, ['id', 'amount', 'status']))
+    ) -> dict:
         """Get detailed payment information"""
-        return await api_client.get(f"/api/payments/{payment_id}")
+        fields = check_fields(Payment, fields)
+        return project(await api_client.get(f"/api/payments/{payment_id}", params=push_fields({}, fields) or None), Payment, fields)
 
     @mcp.tool(
         name="refund_payment",
@@ -80,3 +100,60 @@ def register_payment_tools(mcp: FastMCP):
         """Get customer spending analytics"""
         params = {"period": period}
         return await api_client.get(f"/api/customers/{customer_id}/spending-analytics", params=params)
+
+    @mcp.tool(
+        name="get_local_spending_analytics",
+        description="Compute spending rollups for a customer or a merchant from their payment records in a local columnar frame. Supports arbitrary grouping by day, week, month, merchant category, merchant or status with date range and status filters, and returns totals, counts, averages and amount percentiles per group. Repeated queries only fetch payments newer than the last one seen.",
+        tags={"payments", "analytics", "spending_analysis", "reporting"},
+        meta={"version": "1.0", "category": "payment_processing"}
+    )
+    async def get_local_spending_analytics(
+        customer_id: Optional[str] = Query(None, description="Customer alphanumeric ID to analyze (provide this or merchant_name)"),
+        merchant_name: Optional[str] = Query(None, description="Merchant name to analyze (partial match, case-insensitive; provide this or customer_id)"),
+        group_by: str = Query("month", description="Grouping: day, week, month, merchant_category, merchant, status or none"),
+        start_date: Optional[str] = Query(None, description="Only include payments on or after this date (ISO format)"),
+        end_date: Optional[str] = Query(None, description="Only include payments on or before this date (ISO format)"),
+        status: Optional[List[PaymentStatus]] = Query(None, description="Only include payments with these statuses"),
+        percentiles: List[float] = Query(list(DEFAULT_PERCENTILES), description="Amount percentiles to compute (0-100)")
+    ) -> dict:
+        """Vectorized spending rollups over a customer's or merchant's payments"""
+        loaded = await spending_frames.get(customer_id=customer_id, merchant_name=merchant_name)
+        result = loaded["frame"].rollup(
+            group_by=group_by,
+            start_date=start_date,
+            end_date=end_date,
+            statuses=status,
+            percentiles=percentiles
+        )
+        result["cache"] = {
+            "refresh": loaded["refresh"],
+            "new_payments": loaded["new_payments"],
+            "payments_cached": len(loaded["frame"]),
+            "last_seen_id": loaded["last_seen_id"],
+            "memory_bytes": loaded["frame"].memory_usage()["total_bytes"]
+        }
+        return result
+
+    @mcp.tool(
+        name="get_cached_payments",
+        description="Read a customer's or merchant's payments from the compact in-memory payment store used for local analytics, refreshing it with any newer payments first. Returns a page of payment records rebuilt from the columnar store together with a memory usage report per column and an estimate of the memory the same payments would take as individual Payment objects.",
+        tags={"payments", "transactions", "analytics", "memory"},
+        meta={"version": "1.0", "category": "payment_processing"}
+    )
+    async def get_cached_payments(
+        customer_id: Optional[str] = Query(None, description="Customer alphanumeric ID (provide this or merchant_name)"),
+        merchant_name: Optional[str] = Query(None, description="Merchant name (partial match, case-insensitive; provide this or customer_id)"),
+        offset: int = Query(0, description="Index of the first payment to return (newest first)"),
+        limit: int = Query(10, description="Number of payments to return"),
+        compare_models: bool = Query(False, description="Estimate the memory the same payments would use as Payment objects")
+    ) -> dict:
+        """Payments and memory usage from the columnar payment store"""
+        loaded = await spending_frames.get(customer_id=customer_id, merchant_name=merchant_name)
+        store = loaded["frame"]
+        return {
+            # Rows as stored rather than validated Payment models, so a payment upstream sent
+            # without a required field (e.g. credit_card_id) does not fail the whole page
+            "payments": [store.row(index) for index in store.newest_first(offset, limit)],
+            "total": len(store),
+            "memory": store.memory_usage(compare_models=compare_models)
+        }
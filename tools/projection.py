@@ -0,0 +1,68 @@
+import os
+from typing import Any, Dict, List, Optional, Type
+from pydantic import BaseModel
+
+# Field projection for list and detail tools: fields=["id", "title"] keeps only those
+# fields of each item (list tools keep their pagination fields), which cuts the tool
+# result an agent has to read. Applied to the response after it is fetched; with
+# UPSTREAM_FIELD_PROJECTION=true the selection is also sent upstream as ?fields=a,b for
+# backends that can trim the response themselves (swagger.json does not declare it).
+
+
+def upstream_projection_enabled() -> bool:
+    return os.getenv("UPSTREAM_FIELD_PROJECTION", "false").lower() == "true"
+
+
+def fields_description(model: Type[BaseModel], example: List[str]) -> str:
+    """Description of a tool's fields parameter listing the fields of model"""
+    return (
+        f"Only return these {model.__name__} fields (e.g. {example}); all fields if omitted. "
+        f"Available: {', '.join(model.model_fields)}"
+    )
+
+
+def check_fields(model: Type[BaseModel], fields: Optional[List[str]]) -> Optional[List[str]]:
+    """fields with duplicates removed, or ValueError naming the fields model does not have"""
+    if not fields:
+        return None
+    unknown = [name for name in fields if name not in model.model_fields]
+    if unknown:
+        raise ValueError(f"Unknown {model.__name__} fields: {', '.join(unknown)}. Available fields: {', '.join(model.model_fields)}")
+    return list(dict.fromkeys(fields))
+
+
+def push_fields(params: Dict[str, Any], fields: Optional[List[str]], typed: bool = False) -> Dict[str, Any]:
+    """params with the projection added for the upstream API, when enabled
+
+    Never sent for typed list responses: a trimmed upstream item would fail validation.
+    """
+    if fields and upstream_projection_enabled() and not typed:
+        params["fields"] = ",".join(fields)
+    return params
+
+
+def project(response: Any, model: Type[BaseModel], fields: Optional[List[str]], items_key: Optional[str] = None) -> Any:
+    """Keep only fields of each item in response[items_key] (list tools) or of response itself (detail tools)
+
+    Typed list responses are dumped to JSON-ready dicts with the same selection. A detail
+    response holding none of the fields at its top level (e.g. one that wraps the entity)
+    is returned unprojected rather than as an empty dict.
+    """
+    fields = check_fields(model, fields)
+    if not fields:
+        return response
+    if isinstance(response, BaseModel):
+        include = {items_key: {"__all__": set(fields)}, **{name: True for name in type(response).model_fields if name != items_key}}
+        return response.model_dump(mode="json", include=include if items_key else set(fields), warnings=False)
+    if not isinstance(response, dict):
+        return response
+    if items_key is None:
+        projected = {name: response[name] for name in fields if name in response}
+        return projected if projected else response
+    items = response.get(items_key)
+    if not isinstance(items, list):
+        return response
+    return {
+        **response,
+        items_key: [{name: item[name] for name in fields if name in item} if isinstance(item, dict) else item for item in items],
+    }
@@ -1,10 +1,13 @@
-from fastmcp import FastMCP
-from fastapi import Query, Path, Body
-from typing import Optional
+from fastmcp import FastMCP, Context
+from .params import Query, Path, Body
+from .projection import check_fields, push_fields, project, fields_description
+from typing import Optional, List
 from models import (
     Refund, RefundRequest, PointsRefundRequest, RefundApproval, RefundDenial,
-    RefundListResponse, RefundStatus, RefundType, api_client
+    RefundDecision, RefundListResponse, RefundStatus, RefundType,
+    api_client, response_parser, typed_list_responses_enabled
 )
+from services import refund_queue
 
 def register_refund_tools(mcp: FastMCP):
     """Register refund-related MCP tools"""
@@ -20,7 +23,8 @@ def register_refund_tools(mcp: FastMCP):
         per_page: int = Query(10, description="Number of refunds per page"),
         customer_id: Optional[str] = Query(None, description="Filter refunds by specific customer alphanumeric ID"),
         status: Optional[RefundStatus] = Query(None, description="Filter by refund status"),
-        refund_type: Optional[RefundType] = Query(None, description="Filter by refund type")
+        refund_type: Optional[RefundType] = Query(None, description="Filter by refund type"),
+        fields: Optional[List[str]] = Query(None, description=fields_description(Refund, ['id', 'refund_amount', 'status']))
     ) -> dict:
         """List all refunds with filtering options"""
         params = {"page": page, "per_page": per_page}
@@ -30,7 +34,14 @@ def register_refund_tools(mcp: FastMCP):
             params["status"] = status.value if hasattr(status, 'value') else str(status)
         if refund_type:
             params["refund_type"] = refund_type.value if hasattr(refund_type, 'value') else str(refund_type)
-        return await api_client.get("/api/refunds", params=params)
+        fields = check_fields(Refund, fields)
+        typed = typed_list_responses_enabled()
+        push_fields(params, fields, typed)
+        if typed:
+            response = response_parser.parse_list_response(RefundListResponse, await api_client.get_raw("/api/refunds", params=params))
+        else:
+            response = await api_client.get("/api/refunds", params=params)
+        return project(response, Refund, fields, "refunds")
 
     @mcp.tool(
         name="submit_refund_request",
@@ -49,9 +60,13 @@ def register_refund_tools(mcp: FastMCP):
         tags={"refunds", "details", "tracking", "customer_service"},
         meta={"version": "1.0", "category": "refund_management"}
     )
-    async def get_refund_details(refund_id: int = Path(..., description="Refund ID to retrieve details for")) -> dict:
+    async def get_refund_details(
+        refund_id: int = Path(..., description="Refund ID to retrieve details for"),
+        fields: Optional[List[str]] = Query(None, description=fields_description(Refund, ['id', 'refund_amount', 'status']))
+    ) -> dict:
         """Get detailed refund information"""
-        return await api_client.get(f"/api/refunds/{refund_id}")
+        fields = check_fields(Refund, fields)
+        return project(await api_client.get(f"/api/refunds/{refund_id}", params=push_fields({}, fields) or None), Refund, fields)
 
     @mcp.tool(
         name="approve_refund",
@@ -91,3 +106,39 @@ def register_refund_tools(mcp: FastMCP):
         """Request a points redemption cancellation/refund"""
         refund_data = points_refund.model_dump(exclude_unset=True)
         return await api_client.post("/api/refunds/points/cancel", data=refund_data)
+
+    @mcp.tool(
+        name="get_refund_review_queue",
+        description="Pull every pending (REQUESTED) refund across all pages and group them by refund type and amount band for review. Returns per-group counts, total amounts and refund IDs so approval or denial decisions can be prepared for whole groups at once with process_refund_queue.",
+        tags={"refunds", "review_queue", "administration", "customer_service"},
+        meta={"version": "1.0", "category": "refund_management"}
+    )
+    async def get_refund_review_queue(
+        refund_type: Optional[RefundType] = Query(None, description="Only include pending refunds of this type"),
+        customer_id: Optional[str] = Query(None, description="Only include pending refunds for this customer alphanumeric ID"),
+        band_edges: Optional[List[float]] = Query(None, description="Ascending upper edges of the amount bands (default 50, 250, 1000)")
+    ) -> dict:
+        """Group pending refunds by type and amount band"""
+        edges = sorted(band_edges) if band_edges else refund_queue.DEFAULT_AMOUNT_BANDS
+        refunds = await refund_queue.fetch_pending_refunds(refund_type=refund_type, customer_id=customer_id)
+        return {
+            "total_pending": len(refunds),
+            "total_amount": round(sum(float(r.get("refund_amount") or 0.0) for r in refunds), 2),
+            "amount_bands": refund_queue.band_labels(edges),
+            "groups": refund_queue.group_refunds(refunds, edges)
+        }
+
+    @mcp.tool(
+        name="process_refund_queue",
+        description="Apply a list of approve/deny decisions to queued refund requests in concurrent batches. Streams progress for every processed refund and returns a per-item result ledger with the outcome or error of each approval or denial, so partial failures can be retried individually.",
+        tags={"refunds", "review_queue", "approval", "denial", "administration"},
+        meta={"version": "1.0", "category": "refund_management"}
+    )
+    async def process_refund_queue(
+        decisions: List[RefundDecision] = Body(..., description="Approve/deny decisions, one per refund ID"),
+        batch_size: int = Query(refund_queue.DEFAULT_BATCH_SIZE, description="Maximum number of approve/deny calls in flight at once"),
+        ctx: Context = None
+    ) -> dict:
+        """Approve or deny queued refunds in concurrent batches"""
+        progress = ctx.report_progress if ctx else None
+        return await refund_queue.apply_decisions(decisions, batch_size=batch_size, progress=progress)
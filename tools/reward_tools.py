@@ -1,11 +1,18 @@
 from fastmcp import FastMCP
-from fastapi import Query, Path, Body
-from typing import Optional
+from .params import Query, Path, Body
+from .projection import check_fields, push_fields, project, fields_description
+from .columnar import OutputFormat, columnar
+from typing import Optional, List
 from models import (
     Reward, RewardCreate, RewardListResponse, CustomerBalance, RedeemPointsRequest,
-    RewardRedemption, RedemptionHistory, RewardStatus, api_client
+    RewardRedemption, RedemptionHistory, RewardStatus,
+    api_client, response_parser, typed_list_responses_enabled
 )
 
+# Fields dictionary-encoded in output_format="columnar" results
+REWARD_CATEGORICAL_FIELDS = ("status", "customer_id", "offer_id")
+REDEMPTION_CATEGORICAL_FIELDS = ("status", "redemption_type", "reward_type", "customer_id")
+
 def register_reward_tools(mcp: FastMCP):
     """Register reward-related MCP tools"""
 
@@ -19,13 +26,22 @@ def register_reward_tools(mcp: FastMCP):
         customer_id: str = Path(..., description="Unique customer alphanumeric identifier to retrieve rewards for"),
         page: int = Query(1, description="Page number for pagination"),
         per_page: int = Query(10, description="Number of rewards per page"),
-        status: Optional[RewardStatus] = Query(None, description="Filter by reward status")
+        status: Optional[RewardStatus] = Query(None, description="Filter by reward status"),
+        fields: Optional[List[str]] = Query(None, description=fields_description(Reward, ['id', 'points_earned', 'status'])),
+        output_format: OutputFormat = Query("rows", description="rows: a list of reward objects; columnar: each field name once with an array of values per field, and status, customer ID and offer ID as codes into a per-field dictionary of distinct values (smaller for large pages)")
     ) -> dict:
         """Get all rewards for a specific customer - matches swagger GET /api/rewards/customer/{customer_id}"""
         params = {"page": page, "per_page": per_page}
         if status:
             params["status"] = status.value if hasattr(status, 'value') else str(status)
-        return await api_client.get(f"/api/rewards/customer/{customer_id}", params=params)
+        fields = check_fields(Reward, fields)
+        typed = typed_list_responses_enabled()
+        push_fields(params, fields, typed)
+        if typed:
+            response = response_parser.parse_list_response(RewardListResponse, await api_client.get_raw(f"/api/rewards/customer/{customer_id}", params=params))
+        else:
+            response = await api_client.get(f"/api/rewards/customer/{customer_id}", params=params)
+        return columnar(project(response, Reward, fields, "rewards"), "rewards", REWARD_CATEGORICAL_FIELDS, output_format)
 
     @mcp.tool(
         name="create_reward",
@@ -44,9 +60,13 @@ def register_reward_tools(mcp: FastMCP):
         tags={"rewards", "details", "tracking", "customer_service"},
         meta={"version": "1.0", "category": "rewards_management"}
     )
-    async def get_reward_details(reward_id: int = Path(..., description="Reward ID to retrieve details for")) -> dict:
+    async def get_reward_details(
+        reward_id: int = Path(..., description="Reward ID to retrieve details for"),
+        fields: Optional[List[str]] = Query(None, description=fields_description(Reward, ['id', 'points_earned', 'status']))
+    ) -> dict:
         """Get detailed reward information"""
-        return await api_client.get(f"/api/rewards/{reward_id}")
+        fields = check_fields(Reward, fields)
+        return project(await api_client.get(f"/api/rewards/{reward_id}", params=push_fields({}, fields) or None), Reward, fields)
 
     @mcp.tool(
         name="get_customer_reward_balance",
@@ -97,7 +117,8 @@ def register_reward_tools(mcp: FastMCP):
         page: int = Query(1, description="Page number for pagination"),
         per_page: int = Query(10, description="Number of redemptions per page"),
         start_date: Optional[str] = Query(None, description="Filter redemptions from this date (ISO format)"),
-        end_date: Optional[str] = Query(None, description="Filter redemptions until this date (ISO format)")
+        end_date: Optional[str] = Query(None, description="Filter redemptions until this date (ISO format)"),
+        output_format: OutputFormat = Query("rows", description="rows: a list of redemption objects; columnar: each field name once with an array of values per field, and status and type fields as codes into a per-field dictionary of distinct values (smaller for large pages)")
     ) -> dict:
         """Get redemption history for a customer"""
         params = {"page": page, "per_page": per_page}
@@ -105,4 +126,5 @@ def register_reward_tools(mcp: FastMCP):
             params["start_date"] = start_date
         if end_date:
             params["end_date"] = end_date
-        return await api_client.get(f"/api/rewards/customer/{customer_id}/history", params=params)
+        response = await api_client.get(f"/api/rewards/customer/{customer_id}/history", params=params)
+        return columnar(response, "redemptions", REDEMPTION_CATEGORICAL_FIELDS, output_format)
@@ -0,0 +1,30 @@
+from typing import List
+from .params import Body
+from .groups import ToolGroupLoader
+
+def register_tool_group_tools(loader: ToolGroupLoader):
+    """Register tools for listing and loading tool groups on demand"""
+    mcp = loader.registrar
+
+    @mcp.tool(
+        name="list_tool_groups",
+        description="List the tool groups served by this MCP server: the groups currently loaded (with their registration time) and the groups that are available to load on demand with load_tool_groups.",
+        tags={"tool_management", "discovery", "system_status"},
+        meta={"version": "1.0", "category": "tool_management"}
+    )
+    async def list_tool_groups() -> dict:
+        """List loaded and loadable tool groups"""
+        return loader.stats()
+
+    @mcp.tool(
+        name="load_tool_groups",
+        description="Load one or more tool groups (for example payment, reward, offer, integration) into this MCP server on demand. Newly registered tools are announced to connected clients with a tools/list_changed notification; groups that are already loaded are left unchanged.",
+        tags={"tool_management", "discovery"},
+        meta={"version": "1.0", "category": "tool_management"}
+    )
+    async def load_tool_groups(
+        groups: List[str] = Body(..., description="Names of the tool groups to load, or 'all'")
+    ) -> dict:
+        """Register the requested tool groups"""
+        loaded = loader.load(groups)
+        return {"loaded": loaded, **loader.stats()}